@@ -12,6 +12,8 @@ from app.core.config import settings
 from app.models.user import User
 from app.models.job import Job
 from app.models.plugin import Plugin
+from app.models.api_key import ApiKey
+from app.models.job_stats import JobStatsBucket
 
 # this is the Alembic Config object
 config = context.config
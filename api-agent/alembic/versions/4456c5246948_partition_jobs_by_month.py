@@ -0,0 +1,110 @@
+"""partition jobs by month
+
+Range-partitions jobs by created_at into one partition per month so retention
+can detach and drop whole months instead of deleting rows. Partitions beyond
+the ones created here are managed by app.job_maintenance. PostgreSQL only;
+other backends keep the plain table.
+
+Revision ID: 4456c5246948
+Revises: d6619063b39c
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4456c5246948"
+down_revision: Union[str, None] = "d6619063b39c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE jobs RENAME TO jobs_unpartitioned")
+    op.execute(
+        "ALTER TABLE jobs_unpartitioned RENAME CONSTRAINT jobs_pkey TO jobs_unpartitioned_pkey"
+    )
+    op.execute("DROP INDEX IF EXISTS ix_jobs_id")
+    op.execute("DROP INDEX IF EXISTS ix_jobs_plugin_name")
+    op.execute(
+        "UPDATE jobs_unpartitioned SET created_at = now() WHERE created_at IS NULL"
+    )
+
+    # The partition key must be part of the primary key
+    op.execute(
+        "CREATE TABLE jobs (LIKE jobs_unpartitioned INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (created_at)"
+    )
+    op.execute("ALTER TABLE jobs ALTER COLUMN created_at SET NOT NULL")
+    op.execute("ALTER TABLE jobs ADD PRIMARY KEY (id, created_at)")
+    op.execute(
+        "ALTER TABLE jobs ADD CONSTRAINT jobs_owner_id_fkey "
+        "FOREIGN KEY (owner_id) REFERENCES users (id)"
+    )
+    op.execute("CREATE INDEX ix_jobs_id ON jobs (id)")
+    op.execute("CREATE INDEX ix_jobs_plugin_name ON jobs (plugin_name)")
+    op.execute(
+        "CREATE INDEX ix_jobs_owner_id_created_at ON jobs (owner_id, created_at)"
+    )
+
+    oldest = bind.exec_driver_sql(
+        "SELECT date_trunc('month', min(created_at))::date FROM jobs_unpartitioned"
+    ).scalar()
+    current = bind.exec_driver_sql("SELECT date_trunc('month', now())::date").scalar()
+    month = oldest or current
+    last = _add_months(current, MONTHS_AHEAD)
+    while month <= last:
+        following = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE jobs_y{month.year:04d}m{month.month:02d} PARTITION OF jobs "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{following.isoformat()}')"
+        )
+        month = following
+    # Catches rows outside the managed months instead of failing the insert
+    op.execute("CREATE TABLE jobs_default PARTITION OF jobs DEFAULT")
+
+    op.execute("INSERT INTO jobs SELECT * FROM jobs_unpartitioned")
+    op.execute("ALTER SEQUENCE jobs_id_seq OWNED BY jobs.id")
+    op.execute("DROP TABLE jobs_unpartitioned")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE jobs RENAME TO jobs_partitioned")
+    op.execute("DROP INDEX IF EXISTS ix_jobs_id")
+    op.execute("DROP INDEX IF EXISTS ix_jobs_plugin_name")
+    op.execute("DROP INDEX IF EXISTS ix_jobs_owner_id_created_at")
+    op.execute("CREATE TABLE jobs (LIKE jobs_partitioned INCLUDING DEFAULTS)")
+    op.execute("ALTER TABLE jobs ALTER COLUMN created_at DROP NOT NULL")
+    op.execute("ALTER TABLE jobs ADD PRIMARY KEY (id)")
+    op.execute(
+        "ALTER TABLE jobs ADD CONSTRAINT jobs_owner_id_fkey_plain "
+        "FOREIGN KEY (owner_id) REFERENCES users (id)"
+    )
+    op.execute("INSERT INTO jobs SELECT * FROM jobs_partitioned")
+    op.execute("ALTER SEQUENCE jobs_id_seq OWNED BY jobs.id")
+    op.execute("DROP TABLE jobs_partitioned CASCADE")
+    op.execute(
+        "ALTER TABLE jobs RENAME CONSTRAINT jobs_owner_id_fkey_plain TO jobs_owner_id_fkey"
+    )
+    op.execute("CREATE INDEX ix_jobs_id ON jobs (id)")
+    op.execute("CREATE INDEX ix_jobs_plugin_name ON jobs (plugin_name)")
@@ -0,0 +1,55 @@
+"""job stats rollup
+
+Hourly aggregates of finished jobs behind GET /api/v1/jobs/stats, maintained
+by the status ingester. Jobs that finished before the upgrade are folded in
+by `python -m app.job_maintenance --rebuild-stats`.
+
+Revision ID: 46fa7e03939a
+Revises: 9043b258bc33
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "46fa7e03939a"
+down_revision: Union[str, None] = "9043b258bc33"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Shares the jobstatus type of jobs.status
+STATUSES = ("QUEUED", "PROCESSING", "COMPLETED", "FAILED")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_stats",
+        sa.Column("owner_id", sa.Integer(), nullable=False),
+        sa.Column("plugin_name", sa.String(), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum(*STATUSES, name="jobstatus").with_variant(
+                postgresql.ENUM(*STATUSES, name="jobstatus", create_type=False),
+                "postgresql",
+            ),
+            nullable=False,
+        ),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("run_seconds_sum", sa.Float(), nullable=False),
+        sa.Column("wait_seconds_sum", sa.Float(), nullable=False),
+        sa.Column("run_histogram", sa.JSON(), nullable=False),
+        sa.Column("wait_histogram", sa.JSON(), nullable=False),
+        sa.ForeignKeyConstraint(["owner_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("owner_id", "plugin_name", "status", "bucket_start"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("job_stats")
@@ -0,0 +1,33 @@
+"""pipeline jobs
+
+Adds jobs.pipeline, the steps of a pipeline job, and jobs.step_summaries,
+the per-step summaries stored with its result when requested.
+
+Revision ID: 7c1d5e2a9b40
+Revises: 46fa7e03939a
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7c1d5e2a9b40"
+down_revision: Union[str, None] = "46fa7e03939a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # On PostgreSQL, columns added to the partitioned table reach every partition
+    op.add_column("jobs", sa.Column("pipeline", sa.JSON(), nullable=True))
+    op.add_column("jobs", sa.Column("step_summaries", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("jobs", "step_summaries")
+    op.drop_column("jobs", "pipeline")
@@ -0,0 +1,61 @@
+"""jsonb job documents
+
+Stores jobs.input_data and jobs.result as JSONB with GIN indexes, so the
+filters on GET /api/v1/jobs can use them. Expression indexes on result fields
+declared by plugins are created by app.job_maintenance. PostgreSQL only.
+
+Revision ID: 9043b258bc33
+Revises: 4456c5246948
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9043b258bc33"
+down_revision: Union[str, None] = "4456c5246948"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ("input_data", "result")
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for column in COLUMNS:
+        op.execute(
+            f"ALTER TABLE jobs ALTER COLUMN {column} TYPE jsonb USING {column}::jsonb"
+        )
+        op.create_index(
+            f"ix_jobs_{column}_gin",
+            "jobs",
+            [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "jsonb_path_ops"},
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    # Declared result indexes are built on JSONB operators
+    declared = bind.exec_driver_sql(
+        "SELECT indexname FROM pg_indexes WHERE tablename = 'jobs' "
+        "AND indexname LIKE 'ix\\_jobs\\_result\\_%%' "
+        "AND indexname <> 'ix_jobs_result_gin'"
+    ).scalars()
+    for name in list(declared):
+        op.drop_index(name, table_name="jobs")
+    for column in COLUMNS:
+        op.drop_index(f"ix_jobs_{column}_gin", table_name="jobs")
+        op.execute(
+            f"ALTER TABLE jobs ALTER COLUMN {column} TYPE json USING {column}::json"
+        )
@@ -0,0 +1,88 @@
+"""
+API key management endpoints
+"""
+
+from datetime import timedelta
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import get_async_db, utcnow
+from app.core.dependencies import get_interactive_user
+from app.core.security import generate_api_key, hash_api_key
+from app.models.api_key import ApiKey as ApiKeyModel
+from app.models.user import User as UserModel
+from app.schemas.api_key import ApiKey, ApiKeyCreate, ApiKeyCreated
+
+router = APIRouter()
+
+
+@router.post("", response_model=ApiKeyCreated, status_code=status.HTTP_201_CREATED)
+async def create_api_key(
+    key_in: ApiKeyCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(get_interactive_user),
+):
+    """
+    Create an API key.
+
+    The key is returned only in this response; store it securely.
+    """
+    key, prefix = generate_api_key()
+    api_key = ApiKeyModel(
+        user_id=current_user.id,
+        name=key_in.name,
+        prefix=prefix,
+        key_hash=hash_api_key(key),
+        scopes=sorted({scope.value for scope in key_in.scopes}),
+        expires_at=(
+            utcnow() + timedelta(days=key_in.expires_in_days)
+            if key_in.expires_in_days
+            else None
+        ),
+    )
+    db.add(api_key)
+    await db.commit()
+    await db.refresh(api_key)
+
+    return ApiKeyCreated(**ApiKey.model_validate(api_key).model_dump(), key=key)
+
+
+@router.get("", response_model=List[ApiKey])
+async def list_api_keys(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(get_interactive_user),
+):
+    """
+    List the current user's API keys.
+    """
+    api_keys = await db.scalars(
+        select(ApiKeyModel)
+        .where(ApiKeyModel.user_id == current_user.id)
+        .order_by(ApiKeyModel.id)
+    )
+    return api_keys.all()
+
+
+@router.delete("/{key_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_api_key(
+    key_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(get_interactive_user),
+):
+    """
+    Revoke an API key. It stops working immediately.
+    """
+    api_key = await db.get(ApiKeyModel, key_id)
+    if api_key is None or api_key.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="API key not found",
+        )
+
+    if api_key.revoked_at is None:
+        api_key.revoked_at = utcnow()
+        await db.commit()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -6,22 +6,28 @@ from datetime import timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.db import get_db
-from app.core.dependencies import get_current_user
-from app.core.security import create_access_token, verify_password
+from app.core.db import get_async_db
+from app.core.dependencies import check_login_rate_limit, require_scope
+from app.core.security import create_access_token, verify_password_async
+from app.models.api_key import ApiKeyScope
 from app.models.user import User as UserModel
 from app.schemas.user import Token, User
 
 router = APIRouter()
 
 
-@router.post("/token", response_model=Token)
+@router.post(
+    "/token",
+    response_model=Token,
+    dependencies=[Depends(check_login_rate_limit)],
+)
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     OAuth2 compatible token login.
@@ -29,10 +35,14 @@ async def login(
     Get an access token for future requests using username and password.
     """
     # Find user by email (username field contains email)
-    user = db.query(UserModel).filter(UserModel.email == form_data.username).first()
+    user = await db.scalar(
+        select(UserModel).where(UserModel.email == form_data.username)
+    )
 
     # Verify user exists and password is correct
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password_async(
+        form_data.password, user.hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -61,7 +71,7 @@ async def login(
 
 @router.get("/me", response_model=User)
 async def read_users_me(
-    current_user: UserModel = Depends(get_current_user),
+    current_user: UserModel = Depends(require_scope(ApiKeyScope.READ)),
 ):
     """
     Get current user information.
@@ -2,27 +2,127 @@
 TDD GREEN Phase: Job management API endpoints
 """
 
-from typing import Optional
+import asyncio
+import json
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, List, Literal, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Path,
+    Query,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import defer
 
-from app.core.db import get_db
-from app.core.dependencies import get_current_user
+from app.core.config import settings
+from app.core.db import get_async_db
+from app.core.dependencies import get_read_db, record_write, require_scope
+from app.core.http_cache import etag_matches, make_etag, not_modified
+from app.core.responses import FastJSONResponse
+from app.models.api_key import ApiKeyScope
 from app.models.job import Job as JobModel, JobStatus
-from app.models.plugin import Plugin as PluginModel
+from app.models.job_stats import JobStatsBucket
 from app.models.user import User as UserModel
-from app.schemas.job import Job, JobCreate, JobList
-from app.services.mq_service import get_mq_service
+from app.schemas.job import Job, JobCreate, JobList, JobStats, PipelineCreate
+from app.services.job_archive import MONTH_PATTERN, JobArchive, get_job_archive
+from app.services.job_events import get_job_event_hub
+from app.services.job_export import EXPORT_MEDIA_TYPES, stream_export
+from app.services.job_filters import job_filter_clauses
+from app.services.job_stats import summarize
+from app.services.mq_service import get_mq_service, publish_executor
+from app.services.plugin_registry import PluginRegistryUnavailable, get_plugin
+from app.services.plugin_versions import pinned_image
+from app.services.schema_validation import validate_job_input
+from app.services.status_ingester import TERMINAL_STATUSES, job_event_payload
 
 router = APIRouter()
 
+# Job details are per-user and change while the job runs; always revalidate
+JOB_CACHE_CONTROL = "private, no-cache"
+# Fields of the Job response schema, each a jobs table column
+JOB_FIELDS = tuple(Job.model_fields)
+# Potentially large JSON documents a job detail can leave out
+DOCUMENT_FIELDS = (
+    "input_data",
+    "result",
+    "progress",
+    "pipeline",
+    "step_summaries",
+)
+
+
+async def _resolve_plugin(plugin_name: str, plugin_version: Optional[str]):
+    """
+    Look up the plugin version a job is pinned to.
+
+    Cache misses and revalidations are blocking registry requests, so the
+    lookup runs on a worker thread rather than the event loop.
+
+    Raises:
+        HTTPException: 503 if the registry is unavailable, 404 if the plugin
+            or version does not exist
+    """
+    # Aliases resolve to the version the job is pinned to
+    try:
+        plugin = await asyncio.to_thread(get_plugin, plugin_name, plugin_version)
+    except PluginRegistryUnavailable:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Plugin registry unavailable",
+        )
+    if not plugin:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Plugin not found",
+        )
+    return plugin
+
+
+def _send_job(job_data: dict) -> None:
+    try:
+        mq = get_mq_service()
+        mq.publish_job(job_data)
+    except Exception as e:
+        # Log error but don't fail the request
+        # Job is still created and can be retried
+        import logging
+
+        logging.error(f"Failed to publish job to queue: {e}")
+
+
+async def _publish_job(db_job: JobModel) -> None:
+    """Publish a created job to the job queue, off the event loop"""
+    job_data = {
+        "job_id": db_job.id,
+        "plugin_name": db_job.plugin_name,
+        "plugin_version": db_job.plugin_version,
+        "docker_image_url": db_job.docker_image,
+        "input_data": db_job.input_data,
+        "priority": db_job.priority,
+        "owner_id": db_job.owner_id,
+        "created_at": db_job.created_at.isoformat(),
+    }
+    if db_job.pipeline is not None:
+        job_data["pipeline"] = db_job.pipeline
+    await asyncio.get_running_loop().run_in_executor(
+        publish_executor, _send_job, job_data
+    )
+
 
 @router.post("", response_model=Job, status_code=status.HTTP_202_ACCEPTED)
 async def create_job(
     job_in: JobCreate,
-    db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user),
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(require_scope(ApiKeyScope.SUBMIT)),
 ):
     """
     Create new job.
@@ -30,107 +130,310 @@ async def create_job(
     Submit a new job for plugin execution. The job will be queued for processing.
     """
     # Verify plugin exists
-    plugin = (
-        db.query(PluginModel).filter(PluginModel.name == job_in.plugin_name).first()
-    )
-    if not plugin:
+    plugin = await _resolve_plugin(job_in.plugin_name, job_in.plugin_version)
+
+    # Reject input the plugin would fail on, before it costs a container launch
+    input_errors = validate_job_input(plugin, job_in.input_data)
+    if input_errors:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Plugin not found",
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=input_errors,
         )
 
     # Create job
     db_job = JobModel(
         plugin_name=job_in.plugin_name,
+        plugin_version=plugin.version,
+        docker_image=pinned_image(plugin.docker_image_url, plugin.image_digest),
         input_data=job_in.input_data,
+        priority=job_in.priority,
         status=JobStatus.QUEUED,
         owner_id=current_user.id,
     )
     db.add(db_job)
-    db.commit()
-    db.refresh(db_job)
+    await db.commit()
+    await db.refresh(db_job)
+    # Replicas may not have the job yet; read it back from the primary
+    record_write(response, current_user.id)
 
     # Publish job to RabbitMQ queue
-    try:
-        mq = get_mq_service()
-        mq.publish_job(
+    await _publish_job(db_job)
+
+    return db_job
+
+
+@router.post("/pipelines", response_model=Job, status_code=status.HTTP_202_ACCEPTED)
+async def create_pipeline_job(
+    pipeline_in: PipelineCreate,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(require_scope(ApiKeyScope.SUBMIT)),
+):
+    """
+    Create new pipeline job.
+
+    Submit plugin steps wired together by their inputs. The Ray worker runs
+    each step as soon as the steps it reads from are done and passes outputs
+    between steps itself; the job's result is the final step's output. Each
+    step's input is validated by the worker once its upstream outputs exist.
+    """
+    steps = []
+    for step in pipeline_in.steps:
+        plugin = await _resolve_plugin(step.plugin_name, step.plugin_version)
+        steps.append(
             {
-                "job_id": db_job.id,
-                "plugin_name": db_job.plugin_name,
-                "docker_image_url": plugin.docker_image_url,
-                "input_data": db_job.input_data,
-                "owner_id": db_job.owner_id,
-                "created_at": db_job.created_at.isoformat(),
+                "name": step.name,
+                "plugin_name": step.plugin_name,
+                "plugin_version": plugin.version,
+                "docker_image_url": pinned_image(
+                    plugin.docker_image_url, plugin.image_digest
+                ),
+                "input_data": step.input_data or {},
+                "inputs": step.inputs,
+                "depends_on": step.depends_on,
             }
         )
-    except Exception as e:
-        # Log error but don't fail the request
-        # Job is still created and can be retried
-        import logging
+    final = next(step for step in steps if step["name"] == pipeline_in.final().name)
 
-        logging.error(f"Failed to publish job to queue: {e}")
+    # The job is listed, filtered and counted under its final step's plugin
+    db_job = JobModel(
+        plugin_name=final["plugin_name"],
+        plugin_version=final["plugin_version"],
+        docker_image=final["docker_image_url"],
+        pipeline={"steps": steps, "step_summaries": pipeline_in.step_summaries},
+        priority=pipeline_in.priority,
+        status=JobStatus.QUEUED,
+        owner_id=current_user.id,
+    )
+    db.add(db_job)
+    await db.commit()
+    await db.refresh(db_job)
+    record_write(response, current_user.id)
+
+    await _publish_job(db_job)
 
     return db_job
 
 
-@router.get("", response_model=JobList)
-async def list_jobs(
-    skip: int = 0,
-    limit: int = 50,
-    status: Optional[str] = None,
+async def job_list_criteria(
+    job_status: Optional[str] = Query(None, alias="status"),
     plugin_name: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user),
-):
+    filters: List[str] = Query(
+        [],
+        alias="filter",
+        description="Filter on input_data or result fields, e.g. "
+        "result.prediction=class_A or result.confidence>=0.9; repeatable",
+    ),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(require_scope(ApiKeyScope.READ)),
+) -> List[Any]:
     """
-    List jobs for current user.
+    Build the WHERE clauses shared by the job list and export.
 
-    Retrieve paginated list of jobs submitted by the current user.
-    Can be filtered by status and plugin_name.
+    Selects the current user's jobs, filtered by status, plugin_name and
+    input_data/result fields.
     """
-    # Base query for current user's jobs
-    query = db.query(JobModel).filter(JobModel.owner_id == current_user.id)
+    # Base criterion: current user's jobs
+    criteria = [JobModel.owner_id == current_user.id]
 
     # Apply filters
-    if status:
+    if job_status:
         try:
-            status_enum = JobStatus(status)
-            query = query.filter(JobModel.status == status_enum)
+            criteria.append(JobModel.status == JobStatus(job_status))
         except ValueError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid status: {status}",
+                detail=f"Invalid status: {job_status}",
             )
 
     if plugin_name:
-        query = query.filter(JobModel.plugin_name == plugin_name)
+        criteria.append(JobModel.plugin_name == plugin_name)
+
+    if filters:
+        try:
+            criteria.append(job_filter_clauses(filters, db.get_bind().dialect.name))
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e),
+            )
+
+    return criteria
+
+
+def job_columns(fields: Optional[str]) -> List[Any]:
+    """
+    Columns to select for a job field projection.
+
+    Args:
+        fields: Comma-separated Job schema fields, or None for all of them
+
+    Returns:
+        Job table columns in the requested order
+    """
+    if fields is None:
+        return [JobModel.__table__.c[name] for name in JOB_FIELDS]
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",")))
+    unknown = [name for name in names if name not in JOB_FIELDS]
+    if unknown or not names:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown) or fields}",
+        )
+    return [JobModel.__table__.c[name] for name in names]
+
+
+@router.get("", response_model=JobList)
+async def list_jobs(
+    skip: int = 0,
+    limit: int = 50,
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated job fields to return, e.g. id,status; "
+        "all fields by default",
+    ),
+    criteria: List[Any] = Depends(job_list_criteria),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    List jobs for current user.
+
+    Retrieve paginated list of jobs submitted by the current user.
+    Can be filtered by status, plugin_name and input_data/result fields.
+    Only the requested fields are read and returned.
+    """
+    columns = job_columns(fields)
 
     # Get total count
-    total = query.count()
+    total = await db.scalar(
+        select(func.count()).select_from(JobModel.__table__).where(*criteria)
+    )
 
     # Get paginated jobs
-    jobs = query.order_by(JobModel.created_at.desc()).offset(skip).limit(limit).all()
+    rows = await db.execute(
+        select(*columns)
+        .where(*criteria)
+        .order_by(JobModel.created_at.desc())
+        .offset(skip)
+        .limit(limit)
+    )
 
-    return {
-        "total": total,
-        "items": jobs,
-    }
+    # Rows come straight from the jobs table, so they are serialized as-is
+    # rather than validated field by field through the Job schema
+    return FastJSONResponse(
+        {"total": total, "items": [dict(row) for row in rows.mappings()]}
+    )
 
 
-@router.get("/{job_id}", response_model=Job)
-async def get_job(
-    job_id: int,
-    db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user),
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": dict.fromkeys(EXPORT_MEDIA_TYPES.values(), {})}},
+)
+async def export_jobs(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    criteria: List[Any] = Depends(job_list_criteria),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
-    Get job by ID.
+    Export jobs for current user.
 
-    Retrieve detailed information about a specific job.
-    Users can only access their own jobs.
+    Streams every job matching the list filters, newest first, as NDJSON or
+    CSV straight from a database cursor; memory use does not depend on the
+    number of jobs exported.
+    """
+    query = (
+        select(JobModel.__table__)
+        .where(*criteria)
+        .order_by(JobModel.created_at.desc(), JobModel.id.desc())
+    )
+
+    return StreamingResponse(
+        stream_export(db.bind, query, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="jobs.{export_format}"'},
+    )
+
+
+@router.get("/stats", response_model=JobStats)
+async def job_stats(
+    interval: Literal["hour", "day", "total"] = "total",
+    plugin_name: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(require_scope(ApiKeyScope.READ)),
+):
+    """
+    Get statistics of the current user's finished jobs.
+
+    Groups jobs by plugin, final status and time bucket (by finish time),
+    with their count and run time and queue wait mean and p50/p95/p99.
+    Served from the hourly rollup the status ingester maintains, so the cost
+    does not grow with the number of jobs. The range is widened to whole
+    hours: since is rounded down and until up to an hour boundary.
+    """
+    query = select(JobStatsBucket).where(JobStatsBucket.owner_id == current_user.id)
+    if plugin_name:
+        query = query.where(JobStatsBucket.plugin_name == plugin_name)
+    if since is not None:
+        query = query.where(
+            JobStatsBucket.bucket_start
+            >= since.replace(minute=0, second=0, microsecond=0)
+        )
+    if until is not None:
+        end = until.replace(minute=0, second=0, microsecond=0)
+        if end < until:
+            end += timedelta(hours=1)
+        query = query.where(JobStatsBucket.bucket_start < end)
+
+    buckets = await db.scalars(query)
+    return {"interval": interval, "groups": summarize(buckets.all(), interval)}
+
+
+@router.get("/archives", response_model=List[str])
+async def list_job_archives(
+    archive: JobArchive = Depends(get_job_archive),
+    current_user: UserModel = Depends(require_scope(ApiKeyScope.READ)),
+):
     """
-    job = db.query(JobModel).filter(JobModel.id == job_id).first()
+    List archived months.
 
+    Jobs older than the retention period are moved out of the database into
+    monthly archives; returns their "YYYY-MM" labels, oldest first.
+    """
+    return archive.months()
+
+
+@router.get("/archives/{month}", response_model=JobList)
+async def list_archived_jobs(
+    month: str = Path(..., pattern=MONTH_PATTERN.pattern),
+    skip: int = 0,
+    limit: int = 50,
+    archive: JobArchive = Depends(get_job_archive),
+    current_user: UserModel = Depends(require_scope(ApiKeyScope.READ)),
+):
+    """
+    List archived jobs for current user.
+
+    Reads one month of the current user's archived jobs, decompressing only
+    as much of the archive as the requested page needs.
+    """
+    try:
+        total, items = await asyncio.to_thread(
+            archive.read, month, current_user.id, skip, limit
+        )
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No archived jobs for {month}",
+        )
+
+    return {"total": total, "items": items}
+
+
+def _check_job_access(job, current_user: UserModel) -> None:
+    """Raise 404/403 unless the job (or its version row) belongs to the user"""
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -144,4 +447,176 @@ async def get_job(
             detail="Not authorized to access this job",
         )
 
+
+async def _get_owned_job(
+    db: AsyncSession, job_id: int, current_user: UserModel, options=()
+) -> JobModel:
+    """Load a job, raising 404/403 unless it belongs to the current user"""
+    job = await db.get(JobModel, job_id, options=options)
+    _check_job_access(job, current_user)
+    return job
+
+
+def job_detail_fields(
+    include: Optional[str], exclude: Optional[str]
+) -> Tuple[str, ...]:
+    """
+    Fields of a job detail projection.
+
+    Args:
+        include: Comma-separated document fields (input_data, result,
+            progress) to return; the others are left out. None returns all
+        exclude: Comma-separated fields to leave out
+
+    Returns:
+        Job schema fields to return, in schema order
+    """
+    fields = set(JOB_FIELDS)
+    if include is not None:
+        included = {name.strip() for name in include.split(",") if name.strip()}
+        unknown = included - set(DOCUMENT_FIELDS)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Only {', '.join(DOCUMENT_FIELDS)} can be included, "
+                f"not {', '.join(sorted(unknown))}",
+            )
+        fields -= set(DOCUMENT_FIELDS) - included
+    if exclude is not None:
+        excluded = {name.strip() for name in exclude.split(",") if name.strip()}
+        unknown = excluded - set(JOB_FIELDS)
+        if unknown or "id" in excluded:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot exclude {', '.join(sorted(unknown or {'id'}))}",
+            )
+        fields -= excluded
+    return tuple(name for name in JOB_FIELDS if name in fields)
+
+
+@router.get("/{job_id}", response_model=Job)
+async def get_job(
+    job_id: int,
+    response: Response,
+    include: Optional[str] = Query(
+        None,
+        description="Comma-separated documents to return out of input_data, "
+        "result and progress, e.g. result; all by default",
+    ),
+    exclude: Optional[str] = Query(
+        None, description="Comma-separated fields to leave out, e.g. input_data"
+    ),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(require_scope(ApiKeyScope.READ)),
+):
+    """
+    Get job by ID.
+
+    Retrieve detailed information about a specific job.
+    Users can only access their own jobs.
+    Supports conditional requests via ETag / If-None-Match.
+    include/exclude leave fields out of the response, and columns that are
+    left out are not loaded from the database either.
+    """
+    fields = job_detail_fields(include, exclude)
+    projected = fields != JOB_FIELDS
+    # A projection is a different representation, so it needs its own ETag
+    etag_parts = (",".join(fields),) if projected else ()
+
+    if if_none_match:
+        # Check ownership and row version before loading the whole row
+        version = (
+            await db.execute(
+                select(JobModel.id, JobModel.owner_id, JobModel.updated_at).where(
+                    JobModel.id == job_id
+                )
+            )
+        ).first()
+        _check_job_access(version, current_user)
+        etag = make_etag("job", version.id, version.updated_at, *etag_parts)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, JOB_CACHE_CONTROL)
+
+    # id, owner_id and updated_at are always needed for access checks and ETags
+    deferred = [
+        defer(getattr(JobModel, name))
+        for name in JOB_FIELDS
+        if name not in fields and name not in ("id", "owner_id", "updated_at")
+    ]
+    job = await _get_owned_job(db, job_id, current_user, options=deferred)
+
+    headers = {
+        "ETag": make_etag("job", job.id, job.updated_at, *etag_parts),
+        "Cache-Control": JOB_CACHE_CONTROL,
+    }
+    if projected:
+        return FastJSONResponse(
+            {name: getattr(job, name) for name in fields}, headers=headers
+        )
+    response.headers.update(headers)
     return job
+
+
+def _format_sse(event_type: str, payload: dict) -> str:
+    return f"event: {event_type}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+async def _job_snapshot(bind: AsyncEngine, job_id: int) -> dict:
+    """Read a job's current event payload in a short-lived session"""
+    async with AsyncSession(bind) as db:
+        return job_event_payload(await db.get(JobModel, job_id))
+
+
+async def _job_event_stream(bind: AsyncEngine, job_id: int) -> AsyncIterator[str]:
+    """
+    Yield SSE frames for a job until it reaches a terminal status.
+
+    Snapshots use their own sessions, as a streaming response outlives the
+    request's dependencies; no connection is held between them.
+    """
+    hub = get_job_event_hub()
+    queue = hub.subscribe(job_id)
+    try:
+        # Snapshot after subscribing so no update falls in between
+        current = await _job_snapshot(bind, job_id)
+        yield _format_sse("status", current)
+
+        while JobStatus(current["status"]) not in TERMINAL_STATUSES:
+            try:
+                event_type, current = await asyncio.wait_for(
+                    queue.get(), timeout=settings.SSE_KEEPALIVE_SECONDS
+                )
+            except asyncio.TimeoutError:
+                # Updates ingested by another API process only show up in the DB
+                snapshot = await _job_snapshot(bind, job_id)
+                if snapshot != current:
+                    current = snapshot
+                    yield _format_sse("status", current)
+                else:
+                    yield ": keepalive\n\n"
+                continue
+            yield _format_sse(event_type, current)
+    finally:
+        hub.unsubscribe(job_id, queue)
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(require_scope(ApiKeyScope.READ)),
+):
+    """
+    Stream job events.
+
+    Server-Sent Events stream of status changes and plugin progress
+    (percent, message, partial output) until the job completes or fails.
+    """
+    await _get_owned_job(db, job_id, current_user)
+
+    return StreamingResponse(
+        _job_event_stream(db.bind, job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
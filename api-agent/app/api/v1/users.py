@@ -2,12 +2,14 @@
 TDD GREEN Phase: User management API endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-
-from app.core.db import get_db
-from app.core.dependencies import get_current_user
-from app.core.security import get_password_hash
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import get_async_db
+from app.core.dependencies import get_read_db, record_write, require_scope
+from app.core.security import get_password_hash_async
+from app.models.api_key import ApiKeyScope
 from app.models.user import User as UserModel
 from app.schemas.user import User, UserCreate
 
@@ -17,7 +19,8 @@ router = APIRouter()
 @router.post("", response_model=User, status_code=status.HTTP_201_CREATED)
 async def create_user(
     user_in: UserCreate,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Create new user.
@@ -25,7 +28,9 @@ async def create_user(
     Registers a new user in the system.
     """
     # Check if user with this email already exists
-    existing_user = db.query(UserModel).filter(UserModel.email == user_in.email).first()
+    existing_user = await db.scalar(
+        select(UserModel).where(UserModel.email == user_in.email)
+    )
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -35,13 +40,15 @@ async def create_user(
     # Create new user
     db_user = UserModel(
         email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=await get_password_hash_async(user_in.password),
         full_name=user_in.full_name,
         is_active=True,
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    # Replicas may not have the user yet; read it back from the primary
+    record_write(response, db_user.id)
 
     return db_user
 
@@ -50,8 +57,8 @@ async def create_user(
 async def list_users(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(require_scope(ApiKeyScope.READ)),
 ):
     """
     Get list of users.
@@ -59,10 +66,10 @@ async def list_users(
     Retrieve paginated list of all users. Requires authentication.
     """
     # Get total count
-    total = db.query(UserModel).count()
+    total = await db.scalar(select(func.count()).select_from(UserModel))
 
     # Get paginated users
-    users = db.query(UserModel).offset(skip).limit(limit).all()
+    users = (await db.scalars(select(UserModel).offset(skip).limit(limit))).all()
 
     return {
         "total": total,
@@ -73,15 +80,15 @@ async def list_users(
 @router.get("/{user_id}", response_model=User)
 async def get_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(require_scope(ApiKeyScope.READ)),
 ):
     """
     Get user by ID.
 
     Retrieve specific user information by user ID. Requires authentication.
     """
-    user = db.query(UserModel).filter(UserModel.id == user_id).first()
+    user = await db.get(UserModel, user_id)
 
     if not user:
         raise HTTPException(
@@ -0,0 +1,157 @@
+"""
+In-process caches for request authentication
+Decoded access tokens are cached until they expire, and the users and API
+keys they resolve to for a short TTL, so steady-state authenticated requests
+neither re-verify credentials nor query the users table
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from app.core.config import settings
+
+
+class TokenCache:
+    """Bounded LRU of verified token payloads keyed by a hash of the token"""
+
+    def __init__(self, max_size: int, clock: Callable[[], float] = time.time):
+        self.max_size = max_size
+        self.clock = clock
+        self._entries: OrderedDict[bytes, Tuple[dict, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        # Raw tokens are bearer credentials; never keep them in memory
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        """
+        Get the payload of a previously verified token.
+
+        Args:
+            token: Encoded JWT
+
+        Returns:
+            Decoded payload, or None if not cached or expired
+        """
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            payload, expires_at = entry
+            if expires_at <= self.clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return payload
+
+    def put(self, token: str, payload: dict) -> None:
+        """
+        Cache a verified token until its `exp` claim.
+
+        Tokens without a numeric `exp` are not cached.
+
+        Args:
+            token: Encoded JWT
+            payload: Its verified payload
+        """
+        expires_at = payload.get("exp")
+        if not isinstance(expires_at, (int, float)):
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (payload, float(expires_at))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached token"""
+        with self._lock:
+            self._entries.clear()
+
+
+class TTLCache:
+    """Bounded, short-TTL cache, e.g. of users keyed by user ID"""
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_size: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.clock = clock
+        self._entries: OrderedDict[Hashable, Tuple[Any, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key, e.g. a user ID
+
+        Returns:
+            Cached value, or None if missing or older than the TTL
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, cached_at = entry
+            if self.clock() - cached_at >= self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Cache a value, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key, e.g. a user ID
+            value: Snapshot to serve until the TTL passes
+        """
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, self.clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Drop a changed value so the next request reloads it.
+
+        Args:
+            key: Cache key, e.g. a user ID
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every cached value"""
+        with self._lock:
+            self._entries.clear()
+
+
+# Global instances
+token_cache = TokenCache(max_size=settings.AUTH_TOKEN_CACHE_SIZE)
+user_cache = TTLCache(
+    ttl_seconds=settings.AUTH_USER_CACHE_TTL_SECONDS,
+    max_size=settings.AUTH_USER_CACHE_SIZE,
+)
+# API keys by keyed hash; revocation in this process invalidates immediately
+api_key_cache = TTLCache(
+    ttl_seconds=settings.API_KEY_CACHE_TTL_SECONDS,
+    max_size=settings.AUTH_USER_CACHE_SIZE,
+)
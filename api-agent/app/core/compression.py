@@ -0,0 +1,200 @@
+"""
+Response compression middleware
+Compresses response bodies with zstd or gzip, whichever the client accepts
+(zstd preferred), once they reach a size threshold. Streaming responses are
+compressed chunk by chunk and flushed as they go, so exports keep streaming;
+Server-Sent Events are left alone. A compressed body is a different
+representation, so its ETag gets a per-coding suffix
+"""
+
+import zlib
+from typing import Dict, Optional
+
+import zstandard
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Preferred first
+ENCODINGS = ("zstd", "gzip")
+UNCOMPRESSED_TYPES = ("text/event-stream",)
+
+
+def accepted_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the content coding to use for a request.
+
+    Args:
+        accept_encoding: Accept-Encoding header value
+
+    Returns:
+        "zstd", "gzip", or None if the client accepts neither
+    """
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    for coding in ENCODINGS:
+        if accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+def coding_etag(etag: str, coding: str) -> str:
+    """
+    Entity tag of a representation compressed with a content coding.
+
+    Args:
+        etag: Entity tag of the uncompressed representation, strong or weak
+        coding: Content coding applied to it
+
+    Returns:
+        The tag with "-<coding>" added inside its quotes
+    """
+    return f'{etag[:-1]}-{coding}"' if etag.endswith('"') else etag
+
+
+class _Compressor:
+    """Incremental compressor producing one content coding"""
+
+    def __init__(self, coding: str, zstd_level: int, gzip_level: int):
+        if coding == "zstd":
+            self._obj = zstandard.ZstdCompressor(level=zstd_level).compressobj()
+            self._flush_mode = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        else:
+            # wbits 31: gzip container
+            self._obj = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+            self._flush_mode = zlib.Z_SYNC_FLUSH
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it so the client can decode it now"""
+        return self._obj.compress(data) + self._obj.flush(self._flush_mode)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        """Compress the last chunk and end the stream"""
+        return self._obj.compress(data) + self._obj.flush()
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses the client can decode"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        zstd_level: int = 3,
+        gzip_level: int = 6,
+    ):
+        """
+        Initialize CompressionMiddleware.
+
+        Args:
+            app: Wrapped ASGI app
+            minimum_size: Smallest complete body worth compressing, in bytes
+            zstd_level: zstd compression level
+            gzip_level: gzip compression level
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.zstd_level = zstd_level
+        self.gzip_level = gzip_level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        coding = accepted_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressedResponder(self, coding, send)(scope, receive, self.app)
+
+
+class _CompressedResponder:
+    """Rewrites one response's messages, deciding on its first body chunk"""
+
+    def __init__(self, middleware: CompressionMiddleware, coding: str, send: Send):
+        self.middleware = middleware
+        self.coding = coding
+        self.send = send
+        self.start: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+        self.scope: Scope = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, app: ASGIApp) -> None:
+        self.scope = scope
+        await app(scope, receive, self.send_wrapper)
+
+    async def send_wrapper(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            if message["status"] == 304 and "etag" in headers:
+                # Answer with the tag the client has cached, which names the
+                # coding it was sent with
+                etag = coding_etag(headers["etag"], self.coding)
+                if_none_match = Headers(scope=self.scope).get("if-none-match", "")
+                if etag in (tag.strip() for tag in if_none_match.split(",")):
+                    MutableHeaders(raw=message["headers"])["ETag"] = etag
+            media_type = headers.get("content-type", "").split(";")[0].strip()
+            # Held back until the first body chunk shows whether to compress
+            self.start = message
+            self.passthrough = (
+                "content-encoding" in headers or media_type in UNCOMPRESSED_TYPES
+            )
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start is not None:
+            start, self.start = self.start, None
+            if self.passthrough or (
+                not more_body and (not body or len(body) < self.middleware.minimum_size)
+            ):
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+
+            headers = MutableHeaders(raw=start["headers"])
+            headers["Content-Encoding"] = self.coding
+            headers.add_vary_header("Accept-Encoding")
+            if "etag" in headers:
+                headers["ETag"] = coding_etag(headers["etag"], self.coding)
+            del headers["Content-Length"]
+            self.compressor = _Compressor(
+                self.coding, self.middleware.zstd_level, self.middleware.gzip_level
+            )
+            if not more_body:
+                body = self.compressor.finish(body)
+                headers["Content-Length"] = str(len(body))
+                await self.send(start)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            await self.send(start)
+
+        if self.passthrough:
+            await self.send(message)
+        elif more_body:
+            await self.send(
+                {
+                    "type": "http.response.body",
+                    "body": self.compressor.compress(body),
+                    "more_body": True,
+                }
+            )
+        else:
+            await self.send(
+                {"type": "http.response.body", "body": self.compressor.finish(body)}
+            )
@@ -1,9 +1,29 @@
-from sqlalchemy import create_engine
+import asyncio
+import itertools
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 engine = create_engine(
     settings.DATABASE_URL,
     pool_size=20,
@@ -15,12 +35,232 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async drivers for the sync drivers DATABASE_URL may name
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def async_database_url(url: str) -> str:
+    """
+    Map a database URL to the same database through an async driver.
+
+    Args:
+        url: SQLAlchemy URL, e.g. postgresql://... or postgresql+psycopg2://...
+
+    Returns:
+        URL using asyncpg (PostgreSQL) or aiosqlite (SQLite)
+    """
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        return url
+    return parsed.set(
+        drivername=f"{parsed.get_backend_name()}+{driver}"
+    ).render_as_string(hide_password=False)
+
+
+def create_request_engine(url: str) -> AsyncEngine:
+    """
+    Create an async engine for request handlers.
+
+    Args:
+        url: Database URL, sync or async
+
+    Returns:
+        Pooled async engine
+    """
+    return create_async_engine(
+        async_database_url(url),
+        # Explicit so the pool options also apply to a file-backed SQLite database
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=20,
+        max_overflow=10,
+        pool_timeout=30,
+        pool_recycle=3600,
+        pool_pre_ping=True,
+    )
+
+
+def request_sessionmaker(bind: AsyncEngine) -> async_sessionmaker:
+    """Session factory for request handlers"""
+    return async_sessionmaker(
+        bind, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
+
+# Request handlers use the async engine so queries don't block the event loop;
+# the sync engine above serves background threads and migrations
+async_engine = create_request_engine(settings.DATABASE_URL)
+
+AsyncSessionLocal = request_sessionmaker(async_engine)
+
+# Replication delay of a PostgreSQL standby; 0 when it has replayed everything
+# it received (an idle primary would otherwise look like growing lag)
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+    "THEN 0 ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+@dataclass
+class Replica:
+    """A read replica and its last measured replication lag"""
+
+    name: str
+    engine: AsyncEngine
+    sessionmaker: async_sessionmaker
+    # Unknown until first measured; unmeasured replicas are not used
+    lag_seconds: float = math.inf
+
+    @classmethod
+    def from_url(cls, url: str) -> "Replica":
+        engine = create_request_engine(url)
+        return cls(
+            name=make_url(url).render_as_string(hide_password=True),
+            engine=engine,
+            sessionmaker=request_sessionmaker(engine),
+        )
+
+
+class ReplicaRouter:
+    """
+    Routes read-only sessions to replicas that are keeping up.
+
+    A read goes to the primary (None) when no replica is within the lag
+    budget, or when the reader wrote within the read-your-writes window, so
+    users always see their own submissions. Writes are remembered per user in
+    this process, and the client carries a write marker so the window also
+    holds on other API processes.
+    """
+
+    def __init__(
+        self,
+        replicas: List[Replica],
+        max_lag_seconds: float,
+        read_your_writes_seconds: float,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize ReplicaRouter.
+
+        Args:
+            replicas: Read replicas
+            max_lag_seconds: Replicas lagging further behind are skipped
+            read_your_writes_seconds: How long a user's reads go to the primary
+                after they write
+            clock: Wall clock in seconds since the epoch, as write markers
+                are compared across processes
+        """
+        self.replicas = replicas
+        self.max_lag_seconds = max_lag_seconds
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self.clock = clock
+        self._last_writes: Dict[int, float] = {}
+        self._lock = threading.Lock()
+        self._next = itertools.count()
+
+    def record_write(self, user_id: int) -> float:
+        """
+        Pin a user's reads to the primary for the read-your-writes window.
+
+        Args:
+            user_id: User who just committed a write
+
+        Returns:
+            Time of the write, to hand the client as its write marker
+        """
+        now = self.clock()
+        with self._lock:
+            self._last_writes[user_id] = now
+            # Keep the map bounded by dropping writes that no longer matter
+            if len(self._last_writes) > 10000:
+                cutoff = now - self.read_your_writes_seconds
+                self._last_writes = {
+                    uid: at for uid, at in self._last_writes.items() if at > cutoff
+                }
+        return now
+
+    def choose(
+        self, user_id: Optional[int] = None, written_at: Optional[float] = None
+    ) -> Optional[Replica]:
+        """
+        Pick the replica to serve a read.
+
+        Args:
+            user_id: Reading user, if any
+            written_at: Write marker the client sent, if any
+
+        Returns:
+            A replica within the lag budget, or None to read from the primary
+        """
+        now = self.clock()
+        if user_id is not None:
+            with self._lock:
+                recorded = self._last_writes.get(user_id)
+            if recorded is not None and now - recorded < self.read_your_writes_seconds:
+                return None
+        # Allow for clock skew between processes, but not markers set far ahead
+        if (
+            written_at is not None
+            and abs(now - written_at) < self.read_your_writes_seconds
+        ):
+            return None
+
+        healthy = [r for r in self.replicas if r.lag_seconds <= self.max_lag_seconds]
+        if not healthy:
+            return None
+        return healthy[next(self._next) % len(healthy)]
+
+    async def check_lag(self) -> None:
+        """Measure every replica's replication lag"""
+        for replica in self.replicas:
+            try:
+                async with replica.engine.connect() as connection:
+                    if replica.engine.dialect.name == "postgresql":
+                        lag = await connection.scalar(REPLICA_LAG_QUERY)
+                    else:
+                        # No replication to measure, e.g. SQLite in development
+                        await connection.execute(text("SELECT 1"))
+                        lag = 0
+                replica.lag_seconds = float(lag or 0)
+            except Exception as e:
+                logger.warning(f"Replica {replica.name} unavailable: {e}")
+                replica.lag_seconds = math.inf
+
+    async def run_lag_monitor(self, interval_seconds: float) -> None:
+        """Re-measure replication lag forever"""
+        while True:
+            await self.check_lag()
+            await asyncio.sleep(interval_seconds)
+
+
 Base = declarative_base()
 
 
+def utcnow() -> datetime:
+    """Current UTC time, for column defaults that need sub-second precision"""
+    return datetime.now(timezone.utc)
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Global instance
+replica_router = ReplicaRouter(
+    replicas=[
+        Replica.from_url(url.strip())
+        for url in settings.DATABASE_REPLICA_URLS.split(",")
+        if url.strip()
+    ],
+    max_lag_seconds=settings.REPLICA_MAX_LAG_SECONDS,
+    read_your_writes_seconds=settings.READ_YOUR_WRITES_SECONDS,
+)
@@ -2,44 +2,60 @@
 FastAPI dependency injection functions
 """
 
-from typing import Generator, Optional
+import hmac
+import math
+from dataclasses import dataclass
+from datetime import timezone
+from typing import FrozenSet, Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import SessionLocal
-from app.core.security import decode_access_token
+from app.core.auth_cache import api_key_cache, user_cache
+from app.core.config import settings
+from app.core.db import get_async_db, replica_router, utcnow
+from app.core.rate_limit import login_rate_limiter, retry_after
+from app.core.security import api_key_prefix, decode_access_token, hash_api_key
+from app.models.api_key import ApiKey, ApiKeyScope
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
 
+# Time of the client's last write, so any API process keeps its reads on the
+# primary; clients without a cookie jar can echo the header instead
+WRITE_MARKER_COOKIE = "last_write"
+WRITE_MARKER_HEADER = "X-Last-Write"
 
-def get_db() -> Generator:
-    """
-    Dependency function to get database session.
 
-    Yields:
-        Database session
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+@dataclass(frozen=True)
+class Credentials:
+    """Who a request authenticated as and what it may do"""
 
+    user_id: int
+    # None for interactive logins, which may do anything the user can
+    scopes: Optional[FrozenSet[str]] = None
 
-async def get_current_user_id(token: str = Depends(oauth2_scheme)) -> int:
+    def allows(self, scope: str) -> bool:
+        return self.scopes is None or scope in self.scopes
+
+
+async def get_credentials(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> Credentials:
     """
-    Get current user ID from JWT token.
+    Authenticate a bearer token, either a JWT access token or an API key.
 
     Args:
-        token: JWT token from OAuth2 scheme
+        token: Bearer token from OAuth2 scheme
+        db: Database session, used only on API key cache misses
 
     Returns:
-        User ID from token
+        Authenticated credentials
 
     Raises:
-        HTTPException: If token is invalid or missing user ID
+        HTTPException: If the token is invalid, expired or revoked
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -47,6 +63,13 @@ async def get_current_user_id(token: str = Depends(oauth2_scheme)) -> int:
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    prefix = api_key_prefix(token)
+    if prefix is not None:
+        credentials = await _verify_api_key(db, token, prefix)
+        if credentials is None:
+            raise credentials_exception
+        return credentials
+
     payload = decode_access_token(token)
     if payload is None:
         raise credentials_exception
@@ -56,35 +79,216 @@ async def get_current_user_id(token: str = Depends(oauth2_scheme)) -> int:
         raise credentials_exception
 
     try:
-        return int(user_id)
+        return Credentials(user_id=int(user_id))
     except ValueError:
         raise credentials_exception
 
 
+async def _verify_api_key(
+    db: AsyncSession, key: str, prefix: str
+) -> Optional[Credentials]:
+    key_hash = hash_api_key(key)
+    cached = api_key_cache.get(key_hash)
+    if cached is None:
+        api_key = await db.scalar(select(ApiKey).where(ApiKey.prefix == prefix))
+        if (
+            api_key is None
+            or api_key.revoked_at is not None
+            or not hmac.compare_digest(api_key.key_hash, key_hash)
+        ):
+            return None
+        expires_at = api_key.expires_at
+        if expires_at is not None and expires_at.tzinfo is None:
+            # SQLite drops the timezone; stored times are UTC
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        credentials = Credentials(
+            user_id=api_key.user_id, scopes=frozenset(api_key.scopes)
+        )
+        cached = (credentials, expires_at)
+        api_key_cache.put(key_hash, cached)
+
+    credentials, expires_at = cached
+    if expires_at is not None and expires_at <= utcnow():
+        return None
+    return credentials
+
+
+def record_write(response: Response, user_id: int) -> None:
+    """
+    Keep a client's reads on the primary while replicas catch up on a write.
+
+    Args:
+        response: Response to carry the write marker
+        user_id: User the write was made by or for
+    """
+    marker = f"{replica_router.record_write(user_id):.3f}"
+    response.headers[WRITE_MARKER_HEADER] = marker
+    response.set_cookie(
+        WRITE_MARKER_COOKIE,
+        marker,
+        max_age=math.ceil(settings.READ_YOUR_WRITES_SECONDS),
+        httponly=True,
+        samesite="lax",
+    )
+
+
+def write_marker(request: Request) -> Optional[float]:
+    """Time of the client's last write, if it sent a valid marker"""
+    marker = request.headers.get(WRITE_MARKER_HEADER) or request.cookies.get(
+        WRITE_MARKER_COOKIE
+    )
+    try:
+        return float(marker) if marker else None
+    except ValueError:
+        return None
+
+
+async def get_read_db(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    credentials: Credentials = Depends(get_credentials),
+):
+    """
+    Get a session for read-only endpoints.
+
+    Reads go to a read replica within the lag budget, except for clients that
+    wrote recently, whose reads stay on the primary so they see their writes.
+
+    Args:
+        request: Incoming request, carrying the client's write marker
+        db: Primary session, used when no replica is chosen
+        credentials: Authenticated credentials of the reader
+
+    Yields:
+        Replica or primary session
+    """
+    replica = replica_router.choose(credentials.user_id, write_marker(request))
+    if replica is None:
+        yield db
+        return
+    async with replica.sessionmaker() as replica_db:
+        yield replica_db
+
+
+async def get_current_user_id(
+    credentials: Credentials = Depends(get_credentials),
+) -> int:
+    """
+    Get current user ID from the request credentials.
+
+    Args:
+        credentials: Authenticated JWT or API key credentials
+
+    Returns:
+        User ID the credentials belong to
+    """
+    return credentials.user_id
+
+
 async def get_current_user(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: int = Depends(get_current_user_id),
 ):
     """
     Get current user from database.
 
+    Users are served from a short-TTL cache, which is invalidated whenever a
+    user row is updated or deleted in this process.
+
     Args:
         db: Database session
         user_id: Current user ID from token
 
     Returns:
-        User model instance
+        User model instance; a copy not attached to db
 
     Raises:
         HTTPException: If user not found or inactive
     """
     from app.models.user import User
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = user_cache.get(user_id)
     if user is None:
-        raise HTTPException(status_code=404, detail="User not found")
+        user = await db.scalar(select(User).where(User.id == user_id))
+        if user is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        user = _snapshot(user)
+        user_cache.put(user_id, user)
 
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
 
     return user
+
+
+def require_scope(scope: ApiKeyScope):
+    """
+    Build a dependency for endpoints API keys may only use with a scope.
+
+    Args:
+        scope: Required API key scope
+
+    Returns:
+        Dependency returning the current user
+    """
+
+    async def dependency(
+        credentials: Credentials = Depends(get_credentials),
+        current_user=Depends(get_current_user),
+    ):
+        if not credentials.allows(scope.value):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"API key lacks the '{scope.value}' scope",
+            )
+        return current_user
+
+    return dependency
+
+
+async def get_interactive_user(
+    credentials: Credentials = Depends(get_credentials),
+    current_user=Depends(get_current_user),
+):
+    """
+    Get the current user, refusing API keys.
+
+    Used for managing credentials, so a leaked key cannot mint new keys.
+
+    Raises:
+        HTTPException: If the request authenticated with an API key
+    """
+    if credentials.scopes is not None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="API keys cannot manage API keys",
+        )
+    return current_user
+
+
+def _snapshot(user):
+    """Copy a user's columns into a transient instance safe to share"""
+    mapper = inspect(type(user))
+    return mapper.class_(
+        **{attr.key: getattr(user, attr.key) for attr in mapper.column_attrs}
+    )
+
+
+async def check_login_rate_limit(request: Request) -> None:
+    """
+    Limit login attempts per client IP address.
+
+    Args:
+        request: Incoming login request
+
+    Raises:
+        HTTPException: 429 if the client has used up its attempts
+    """
+    client_ip = request.client.host if request.client else "unknown"
+    wait = login_rate_limiter.acquire(client_ip)
+    if wait:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts",
+            headers={"Retry-After": retry_after(wait)},
+        )
@@ -0,0 +1,68 @@
+"""
+HTTP conditional request helpers
+Strong ETags are derived from row versions, so an unchanged resource can be
+answered with 304 Not Modified before it is loaded or serialized. Tags of
+compressed representations carry a coding suffix (app.core.compression) and
+match the resource's tag as well
+"""
+
+import hashlib
+from typing import Optional
+
+from fastapi import Response, status
+
+from app.core.compression import ENCODINGS, coding_etag
+
+
+def make_etag(*parts) -> str:
+    """
+    Build a strong ETag from the values that version a representation.
+
+    Args:
+        *parts: Resource kind, identifiers and row versions
+
+    Returns:
+        Quoted entity tag
+    """
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8"))
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against the current ETag.
+
+    Args:
+        if_none_match: Raw If-None-Match header value
+        etag: Current entity tag
+
+    Returns:
+        True if the client's copy is still current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = {etag, *(coding_etag(etag, coding) for coding in ENCODINGS)}
+    # If-None-Match uses weak comparison (RFC 9110 13.1.2)
+    return any(
+        candidate.strip().removeprefix("W/") in current
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    """
+    Build a 304 response carrying the validators of the current representation.
+
+    Args:
+        etag: Current entity tag
+        cache_control: Cache-Control header value
+
+    Returns:
+        Empty 304 Not Modified response
+    """
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": cache_control},
+    )
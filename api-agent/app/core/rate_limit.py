@@ -0,0 +1,80 @@
+"""
+In-process rate limiting
+Token buckets keyed by client address, used to keep login storms from
+tying up the password hashing pool
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Tuple
+
+from app.core.config import settings
+
+
+class RateLimiter:
+    """Per-key token buckets, bounded to the most recently seen keys"""
+
+    def __init__(
+        self,
+        attempts: int,
+        window_seconds: float,
+        max_keys: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize RateLimiter.
+
+        Args:
+            attempts: Burst size; attempts allowed per key per window
+            window_seconds: Time for an empty bucket to refill completely
+            max_keys: Number of keys tracked before the least recent is dropped
+            clock: Monotonic clock in seconds
+        """
+        self.attempts = attempts
+        self.rate = attempts / window_seconds
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets: OrderedDict[str, Tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str) -> float:
+        """
+        Take one attempt from a key's bucket.
+
+        Args:
+            key: Client key, e.g. the client IP address
+
+        Returns:
+            0 if the attempt is allowed, otherwise seconds until it would be
+        """
+        now = self.clock()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (self.attempts, now))
+            tokens = min(self.attempts, tokens + (now - updated_at) * self.rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                return (1 - tokens) / self.rate
+            self._buckets[key] = (tokens - 1, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return 0.0
+
+    def clear(self) -> None:
+        """Forget every key"""
+        with self._lock:
+            self._buckets.clear()
+
+
+def retry_after(seconds: float) -> str:
+    """Format a wait as a Retry-After header value"""
+    return str(max(1, math.ceil(seconds)))
+
+
+# Global instance
+login_rate_limiter = RateLimiter(
+    attempts=settings.LOGIN_RATE_LIMIT_ATTEMPTS,
+    window_seconds=settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS,
+)
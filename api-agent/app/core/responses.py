@@ -0,0 +1,17 @@
+"""
+Fast JSON responses
+For endpoints returning trusted database rows, which are serialized with
+orjson directly instead of being validated and dumped through Pydantic models
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+
+class FastJSONResponse(ORJSONResponse):
+    """ORJSONResponse that formats UTC datetimes with "Z", as Pydantic does"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
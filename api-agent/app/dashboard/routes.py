@@ -2,23 +2,32 @@
 Dashboard routes for web UI
 """
 
-from fastapi import APIRouter, Depends, Request, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-
-from app.core.db import get_db
-from app.core.security import get_current_user, verify_password, create_access_token
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import get_async_db
+from app.core.dependencies import (
+    Credentials,
+    check_login_rate_limit,
+    get_credentials,
+    get_read_db,
+    require_scope,
+)
+from app.models.api_key import ApiKeyScope
+from app.core.security import verify_password_async, create_access_token
 from app.models.user import User as UserModel
 from app.models.job import Job as JobModel, JobStatus
-from app.models.plugin import Plugin as PluginModel
 
 router = APIRouter()
 templates = Jinja2Templates(directory="app/dashboard/templates")
 
 
-async def get_current_user_optional(request: Request, db: Session = Depends(get_db)):
+async def get_current_user_optional(
+    request: Request, db: AsyncSession = Depends(get_async_db)
+):
     """Get current user from cookie, return None if not authenticated"""
     token = request.cookies.get("access_token")
     if not token:
@@ -32,8 +41,7 @@ async def get_current_user_optional(request: Request, db: Session = Depends(get_
         user_id = payload.get("sub")
         if user_id is None:
             return None
-        user = db.query(UserModel).filter(UserModel.id == int(user_id)).first()
-        return user
+        return await db.get(UserModel, int(user_id))
     except Exception:
         return None
 
@@ -44,15 +52,17 @@ async def login_page(request: Request):
     return templates.TemplateResponse("login.html", {"request": request})
 
 
-@router.post("/login")
-async def login(request: Request, response: Response, db: Session = Depends(get_db)):
+@router.post("/login", dependencies=[Depends(check_login_rate_limit)])
+async def login(
+    request: Request, response: Response, db: AsyncSession = Depends(get_async_db)
+):
     """Handle login form submission"""
     form = await request.form()
     email = form.get("username")
     password = form.get("password")
 
-    user = db.query(UserModel).filter(UserModel.email == email).first()
-    if not user or not verify_password(password, user.hashed_password):
+    user = await db.scalar(select(UserModel).where(UserModel.email == email))
+    if not user or not await verify_password_async(password, user.hashed_password):
         return Response(
             content='{"detail":"Incorrect email or password"}',
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -79,7 +89,7 @@ async def logout():
 @router.get("/", response_class=HTMLResponse)
 async def dashboard_home(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_user_optional),
 ):
     """Render dashboard overview"""
@@ -94,7 +104,7 @@ async def dashboard_home(
 @router.get("/jobs", response_class=HTMLResponse)
 async def jobs_page(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_user_optional),
 ):
     """Render jobs list page"""
@@ -109,7 +119,7 @@ async def jobs_page(
 @router.get("/users", response_class=HTMLResponse)
 async def users_page(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_user_optional),
 ):
     """Render users list page"""
@@ -124,7 +134,7 @@ async def users_page(
 @router.get("/plugins", response_class=HTMLResponse)
 async def plugins_page(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_user_optional),
 ):
     """Render plugins list page"""
@@ -136,22 +146,53 @@ async def plugins_page(
     )
 
 
+async def get_dashboard_user(
+    credentials: Credentials = Depends(get_credentials),
+    current_user=Depends(require_scope(ApiKeyScope.READ)),
+):
+    """
+    Get the current user for dashboard data, refusing API keys.
+
+    Dashboard data covers every user's jobs, so it is only for people signed
+    in to the dashboard, not for automation.
+
+    Raises:
+        HTTPException: If the request authenticated with an API key
+    """
+    if credentials.scopes is not None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="API keys cannot read dashboard data",
+        )
+    return current_user
+
+
 # API endpoint for dashboard stats
 @router.get("/api/stats")
 async def get_dashboard_stats(
-    db: Session = Depends(get_db), current_user: UserModel = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_dashboard_user),
 ):
     """Get dashboard statistics"""
-    total_jobs = db.query(JobModel).count()
-    queued_jobs = db.query(JobModel).filter(JobModel.status == JobStatus.QUEUED).count()
-    processing_jobs = (
-        db.query(JobModel).filter(JobModel.status == JobStatus.PROCESSING).count()
+    # One pass over jobs instead of a count query per status
+    total_jobs, queued_jobs, processing_jobs = (
+        await db.execute(
+            select(
+                func.count(),
+                func.count().filter(JobModel.status == JobStatus.QUEUED),
+                func.count().filter(JobModel.status == JobStatus.PROCESSING),
+            ).select_from(JobModel)
+        )
+    ).one()
+    active_users = await db.scalar(
+        select(func.count()).select_from(UserModel).where(UserModel.is_active == True)
     )
-    active_users = db.query(UserModel).filter(UserModel.is_active == True).count()
 
     recent_jobs = (
-        db.query(JobModel).order_by(JobModel.created_at.desc()).limit(10).all()
-    )
+        await db.scalars(
+            select(JobModel).order_by(JobModel.created_at.desc()).limit(10)
+        )
+    ).all()
 
     return {
         "stats": {
@@ -0,0 +1,77 @@
+"""
+Maintain the monthly partitions of the jobs table
+
+Creates the partitions for the coming months, archives partitions older
+than JOB_RETENTION_MONTHS to JOB_ARCHIVE_DIR, and creates the result indexes
+plugins declare in their output schemas. Run it daily, e.g. from cron:
+
+    python -m app.job_maintenance
+
+After upgrading to the job stats rollup, fold in earlier jobs once with:
+
+    python -m app.job_maintenance --rebuild-stats
+"""
+
+import argparse
+import logging
+import sys
+
+from app.core.config import settings
+from app.core.db import SessionLocal, engine
+from app.services.job_archive import get_job_archive
+from app.services.job_filters import ensure_result_indexes
+from app.services.job_partitions import JobPartitionMaintainer
+from app.services.job_stats import rebuild_job_stats
+from app.services.plugin_registry import PluginRegistryUnavailable, plugin_registry
+
+
+def main(argv=None) -> int:
+    """Command line entry point; returns the process exit code"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--retention-months",
+        type=int,
+        default=settings.JOB_RETENTION_MONTHS,
+        help="months of jobs kept in the database (0 keeps everything)",
+    )
+    parser.add_argument(
+        "--months-ahead", type=int, default=settings.JOB_PARTITIONS_AHEAD
+    )
+    parser.add_argument(
+        "--rebuild-stats",
+        action="store_true",
+        help="recompute the job stats rollup from the jobs table",
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    if args.rebuild_stats:
+        db = SessionLocal()
+        try:
+            print(f"Rebuilt job stats from {rebuild_job_stats(db)} job(s)")
+        finally:
+            db.close()
+
+    maintainer = JobPartitionMaintainer(
+        engine,
+        get_job_archive(),
+        retention_months=args.retention_months,
+        months_ahead=args.months_ahead,
+    )
+    result = maintainer.run()
+    print(
+        f"Created {len(result.created)} partition(s), archived "
+        f"{len(result.archived)} partition(s) with {result.archived_rows} job(s)"
+    )
+
+    try:
+        indexes = ensure_result_indexes(engine, plugin_registry.list_plugins())
+    except PluginRegistryUnavailable as e:
+        print(f"Could not load plugins to index: {e}", file=sys.stderr)
+        return 1
+    print(f"Ensured {len(indexes)} declared result index(es)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
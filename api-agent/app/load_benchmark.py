@@ -0,0 +1,145 @@
+"""
+Load benchmark for authenticated API reads
+
+Runs a fixed number of concurrent clients against a running api-agent and
+reports throughput and latency per concurrency level. Run it against two
+builds (e.g. before and after a change) with the same database to compare:
+
+    python -m app.load_benchmark --email admin@example.com --password admin123
+    python -m app.load_benchmark --token <api key> --concurrency 100,500,1000
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from typing import List, Tuple
+
+import httpx
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> str:
+    """
+    Get an access token.
+
+    Args:
+        client: Client pointed at the api-agent
+        email: User email
+        password: User password
+
+    Returns:
+        Bearer token
+    """
+    response = await client.post(
+        "/api/v1/auth/token", data={"username": email, "password": password}
+    )
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def run_level(
+    base_url: str, path: str, token: str, concurrency: int, duration: float
+) -> Tuple[int, int, List[float]]:
+    """
+    Hammer one endpoint with a fixed number of concurrent clients.
+
+    Args:
+        base_url: api-agent base URL
+        path: Path to GET
+        token: Bearer token (access token or API key)
+        concurrency: Number of concurrent clients
+        duration: Seconds to run for
+
+    Returns:
+        Tuple of (successful requests, failed requests, latencies in seconds)
+    """
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        headers={"Authorization": f"Bearer {token}"},
+        limits=httpx.Limits(
+            max_connections=concurrency, max_keepalive_connections=concurrency
+        ),
+        timeout=30.0,
+    ) as client:
+
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    ok = response.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    return len(latencies), errors, latencies
+
+
+def percentile(latencies: List[float], fraction: float) -> float:
+    """Latency at a fraction (0-1) of the sorted samples, in milliseconds"""
+    if not latencies:
+        return 0.0
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000
+
+
+async def benchmark(args) -> None:
+    token = args.token
+    if token is None:
+        async with httpx.AsyncClient(base_url=args.url, timeout=30.0) as client:
+            token = await login(client, args.email, args.password)
+
+    print(
+        f"GET {args.path}, {args.duration:.0f}s per level\n"
+        f"{'clients':>8} {'requests':>9} {'errors':>7} {'req/s':>9} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    for concurrency in args.concurrency:
+        ok, errors, latencies = await run_level(
+            args.url, args.path, token, concurrency, args.duration
+        )
+        print(
+            f"{concurrency:>8} {ok:>9} {errors:>7} {ok / args.duration:>9.1f} "
+            f"{statistics.median(latencies) * 1000 if latencies else 0:>8.1f} "
+            f"{percentile(latencies, 0.95):>8.1f} {percentile(latencies, 0.99):>8.1f}"
+        )
+
+
+def main(argv=None) -> int:
+    """Command line entry point; returns the process exit code"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://localhost:5900")
+    parser.add_argument("--path", default="/api/v1/jobs?limit=20")
+    parser.add_argument("--token", help="access token or API key")
+    parser.add_argument("--email", default="admin@example.com")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument(
+        "--concurrency",
+        type=lambda value: [int(level) for level in value.split(",")],
+        default=[100, 250, 500, 1000],
+        help="comma-separated numbers of concurrent clients",
+    )
+    parser.add_argument("--duration", type=float, default=20.0)
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(benchmark(args))
+    except httpx.HTTPError as e:
+        print(f"Benchmark failed: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,11 +2,20 @@
 FastAPI application entry point
 """
 
+import asyncio
+import threading
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api.v1 import auth, jobs, users
+from app.api.v1 import api_keys, auth, jobs, users
+from app.core.compression import CompressionMiddleware
+from app.core.config import settings
+from app.core.db import replica_router
 from app.dashboard import routes as dashboard_routes
+from app.services.plugin_cache import plugin_event_listener
+from app.services.plugin_registry import plugin_registry
+from app.services.status_ingester import status_ingester
 
 app = FastAPI(
     title="Orc Ray Agent API",
@@ -23,15 +32,56 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in zstd/gzip compression of larger responses (e.g. job results)
+if settings.RESPONSE_COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.RESPONSE_COMPRESSION_MIN_BYTES,
+        zstd_level=settings.RESPONSE_COMPRESSION_ZSTD_LEVEL,
+    )
+
 # Include API routers
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["authentication"])
 app.include_router(users.router, prefix="/api/v1/users", tags=["users"])
 app.include_router(jobs.router, prefix="/api/v1/jobs", tags=["jobs"])
+app.include_router(api_keys.router, prefix="/api/v1/api-keys", tags=["api keys"])
 
 # Include dashboard routes
 app.include_router(dashboard_routes.router, prefix="/dashboard", tags=["dashboard"])
 
 
+@app.on_event("startup")
+async def start_status_ingester():
+    """Start consuming status updates from Ray workers"""
+    if settings.STATUS_INGESTER_ENABLED:
+        status_ingester.start()
+
+
+@app.on_event("startup")
+async def load_plugin_snapshot():
+    """Warm the plugin cache from the registry without delaying startup"""
+    if settings.PLUGIN_SNAPSHOT_ON_STARTUP:
+        threading.Thread(
+            target=plugin_registry.load_snapshot, name="plugin-snapshot", daemon=True
+        ).start()
+
+
+@app.on_event("startup")
+async def start_plugin_event_listener():
+    """Start invalidating cached plugins on registry change events"""
+    if settings.PLUGIN_EVENT_LISTENER_ENABLED:
+        plugin_event_listener.start()
+
+
+@app.on_event("startup")
+async def start_replica_lag_monitor():
+    """Start measuring read replica lag, if replicas are configured"""
+    if replica_router.replicas:
+        app.state.replica_lag_monitor = asyncio.create_task(
+            replica_router.run_lag_monitor(settings.REPLICA_LAG_CHECK_SECONDS)
+        )
+
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -0,0 +1,47 @@
+"""
+API key model
+Long-lived credentials for machine clients, stored as keyed hashes
+"""
+
+import enum
+
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, String, event
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from app.core.auth_cache import api_key_cache
+from app.core.db import Base
+
+
+class ApiKeyScope(str, enum.Enum):
+    # Read jobs, users and the caller's own profile
+    READ = "read"
+    # Submit jobs
+    SUBMIT = "submit"
+
+
+class ApiKey(Base):
+    __tablename__ = "api_keys"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    name = Column(String, nullable=False)
+    # Public part of the key, unique so verification is a single indexed lookup
+    prefix = Column(String(16), unique=True, index=True, nullable=False)
+    # HMAC-SHA256 of the whole key; the key itself is never stored
+    key_hash = Column(String(64), nullable=False)
+    scopes = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True))
+    revoked_at = Column(DateTime(timezone=True))
+
+    owner = relationship("User")
+
+
+@event.listens_for(ApiKey, "after_update")
+@event.listens_for(ApiKey, "after_delete")
+def _invalidate_cached_key(mapper, connection, target):
+    # Revocation must take effect on the next request in this process
+    api_key_cache.invalidate(target.key_hash)
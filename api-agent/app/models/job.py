@@ -5,11 +5,12 @@ Implementing minimum code to make tests pass
 
 import enum
 
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, Integer, JSON, String
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, Integer, JSON, String
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
-from app.core.db import Base
+from app.core.db import Base, utcnow
 
 
 class JobStatus(str, enum.Enum):
@@ -21,17 +22,54 @@ class JobStatus(str, enum.Enum):
 
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_owner_id_created_at", "owner_id", "created_at"),
+        # Serve containment filters on input and result documents
+        # (app.services.job_filters); other backends scan
+        Index(
+            "ix_jobs_input_data_gin",
+            "input_data",
+            postgresql_using="gin",
+            postgresql_ops={"input_data": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_jobs_result_gin",
+            "result",
+            postgresql_using="gin",
+            postgresql_ops={"result": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     plugin_name = Column(String, index=True, nullable=False)
+    # Pinned at submission so the job runs exactly what it was validated against
+    plugin_version = Column(String)
+    docker_image = Column(String)
     status = Column(Enum(JobStatus), nullable=False, default=JobStatus.QUEUED)
-    input_data = Column(JSON)
-    result = Column(JSON)
+    priority = Column(Integer, nullable=False, default=0)
+    input_data = Column(JSON().with_variant(JSONB(), "postgresql"))
+    result = Column(JSON().with_variant(JSONB(), "postgresql"))
     error_message = Column(String)
+    progress = Column(JSON)
+    # Steps of a pipeline job (app.services.job_pipelines); plugin_name,
+    # plugin_version and docker_image then describe its final step
+    pipeline = Column(JSON)
+    step_summaries = Column(JSON)
     owner_id = Column(Integer, ForeignKey("users.id"))
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Partition key on PostgreSQL, where the primary key is (id, created_at);
+    # see the partition_jobs_by_month migration
+    created_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
     started_at = Column(DateTime(timezone=True))
     completed_at = Column(DateTime(timezone=True))
+    # Row version for ETags; set in Python so it changes on every write
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=utcnow,
+        onupdate=utcnow,
+        server_default=func.now(),
+    )
 
     # Relationship with User
     owner = relationship("User", back_populates="jobs")
@@ -0,0 +1,29 @@
+"""
+Job statistics rollup model
+Hourly aggregates of finished jobs, maintained incrementally by the status
+ingester so statistics never scan the jobs table
+"""
+
+from sqlalchemy import JSON, Column, DateTime, Enum, Float, ForeignKey, Integer, String
+
+from app.core.db import Base
+from app.models.job import JobStatus
+
+
+class JobStatsBucket(Base):
+    __tablename__ = "job_stats"
+
+    owner_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    plugin_name = Column(String, primary_key=True)
+    # Terminal status the jobs finished with
+    status = Column(Enum(JobStatus), primary_key=True)
+    # Start of the hour the jobs finished in (UTC)
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    run_seconds_sum = Column(Float, nullable=False, default=0.0)
+    wait_seconds_sum = Column(Float, nullable=False, default=0.0)
+    # Sparse log-scale histograms, {bucket index: count}; see app.services.job_stats
+    run_histogram = Column(JSON, nullable=False, default=dict)
+    wait_histogram = Column(JSON, nullable=False, default=dict)
@@ -1,22 +1,95 @@
 """
-TDD GREEN Phase: Plugin model implementation
-Implementing minimum code to make tests pass
+Plugin models, mirroring plugin-registry's app.models.plugin
 """
 
-from sqlalchemy import Column, DateTime, Integer, JSON, String
+from sqlalchemy import (
+    DDL,
+    Column,
+    DateTime,
+    ForeignKeyConstraint,
+    Index,
+    Integer,
+    JSON,
+    String,
+    UniqueConstraint,
+    event,
+    literal_column,
+)
 from sqlalchemy.sql import func
 
-from app.core.db import Base
+from app.core.db import Base, utcnow
+
+# The plugin tables belong to plugin-registry, and api-agent reads plugins
+# through its HTTP API (app.services.plugin_registry). They are declared here
+# only so alembic manages the schema of the shared database;
+# test_models_plugin checks they match plugin-registry's declarations.
+
+# Full-text document over name and description; queries must use this exact
+# expression for Postgres to pick the expression index
+SEARCH_DOCUMENT = literal_column(
+    "to_tsvector('simple', name || ' ' || coalesce(description, ''))"
+)
 
 
 class Plugin(Base):
     __tablename__ = "plugins"
+    __table_args__ = (
+        UniqueConstraint("name", "version", name="uq_plugins_name_version"),
+        # Postgres search indexes; other backends use the in-memory fallback
+        Index(
+            "ix_plugins_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_plugins_search_document",
+            SEARCH_DOCUMENT,
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, unique=True, index=True, nullable=False)
+    name = Column(String, index=True, nullable=False)
     version = Column(String, nullable=False)
     description = Column(String)
     docker_image_url = Column(String, nullable=False)
+    image_digest = Column(String)
     input_schema = Column(JSON)
     output_schema = Column(JSON)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Row version for ETags; set in Python so it changes on every write
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=utcnow,
+        onupdate=utcnow,
+        server_default=func.now(),
+    )
+
+
+event.listen(
+    Plugin.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
+class PluginAlias(Base):
+    __tablename__ = "plugin_aliases"
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["name", "version"],
+            ["plugins.name", "plugins.version"],
+            ondelete="CASCADE",
+        ),
+    )
+
+    name = Column(String, primary_key=True)
+    alias = Column(String, primary_key=True)
+    version = Column(String, nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=utcnow,
+        onupdate=utcnow,
+        server_default=func.now(),
+    )
@@ -3,10 +3,11 @@ TDD GREEN Phase: User model implementation
 Implementing minimum code to make tests pass
 """
 
-from sqlalchemy import Boolean, Column, DateTime, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, Integer, String, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
+from app.core.auth_cache import user_cache
 from app.core.db import Base
 
 
@@ -22,3 +23,11 @@ class User(Base):
 
     # Relationship with Job (will be defined when Job model is created)
     jobs = relationship("Job", back_populates="owner")
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target):
+    # Deactivation must take effect on the next request; bulk query.update()
+    # bypasses this and relies on the cache TTL
+    user_cache.invalidate(target.id)
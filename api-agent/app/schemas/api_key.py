@@ -0,0 +1,43 @@
+"""
+Pydantic schemas for API keys
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.models.api_key import ApiKeyScope
+
+
+class ApiKeyCreate(BaseModel):
+    """Schema for creating an API key"""
+
+    name: str = Field(..., min_length=1, max_length=100)
+    scopes: List[ApiKeyScope] = Field(
+        ..., min_length=1, description="e.g. ['submit'] for a submit-only key"
+    )
+    expires_in_days: Optional[int] = Field(
+        None, ge=1, le=3650, description="Never expires by default"
+    )
+
+
+class ApiKey(BaseModel):
+    """Schema for API key response; never includes the key itself"""
+
+    id: int
+    name: str
+    prefix: str
+    scopes: List[ApiKeyScope]
+    created_at: datetime
+    expires_at: Optional[datetime] = None
+    revoked_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ApiKeyCreated(ApiKey):
+    """Schema for a newly created API key, the only time the key is shown"""
+
+    key: str
@@ -3,18 +3,33 @@ Pydantic schemas for Job entity
 """
 
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 from app.models.job import JobStatus
+from app.services.job_pipelines import (
+    PIPELINE_MAX_STEPS,
+    final_step,
+    pipeline_order,
+    step_dependencies,
+)
 
 
 class JobBase(BaseModel):
     """Base job schema"""
 
     plugin_name: str = Field(..., min_length=1, max_length=100, pattern=r"^[a-z0-9-]+$")
+    plugin_version: Optional[str] = Field(
+        None,
+        max_length=50,
+        pattern=r"^[a-z0-9.-]+$",
+        description="Version or alias to run (latest by default)",
+    )
     input_data: Optional[Dict[str, Any]] = None
+    priority: int = Field(
+        0, ge=0, le=9, description="Higher priority jobs are dispatched first"
+    )
 
 
 class JobCreate(JobBase):
@@ -23,6 +38,63 @@ class JobCreate(JobBase):
     pass
 
 
+class PipelineStep(BaseModel):
+    """One plugin run in a pipeline job"""
+
+    name: str = Field(..., min_length=1, max_length=50, pattern=r"^[a-z0-9_-]+$")
+    plugin_name: str = Field(..., min_length=1, max_length=100, pattern=r"^[a-z0-9-]+$")
+    plugin_version: Optional[str] = Field(
+        None,
+        max_length=50,
+        pattern=r"^[a-z0-9.-]+$",
+        description="Version or alias to run (latest by default)",
+    )
+    input_data: Optional[Dict[str, Any]] = Field(
+        None, description="Input fields given directly"
+    )
+    inputs: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Input fields read from upstream outputs, as "
+        '"step" or "step.path.to.field"',
+    )
+    depends_on: List[str] = Field(
+        default_factory=list,
+        description="Steps to wait for without reading their output",
+    )
+
+    def dependencies(self) -> List[str]:
+        """Steps this step has to wait for"""
+        return step_dependencies(self.inputs, self.depends_on)
+
+
+class PipelineCreate(BaseModel):
+    """Schema for creating a pipeline job"""
+
+    steps: List[PipelineStep] = Field(..., min_length=1, max_length=PIPELINE_MAX_STEPS)
+    priority: int = Field(
+        0, ge=0, le=9, description="Higher priority jobs are dispatched first"
+    )
+    step_summaries: bool = Field(
+        False, description="Also store a summary of every step with the result"
+    )
+
+    @model_validator(mode="after")
+    def check_graph(self) -> "PipelineCreate":
+        dependencies = {}
+        for step in self.steps:
+            if step.name in dependencies:
+                raise ValueError(f"Duplicate step name {step.name!r}")
+            dependencies[step.name] = step.dependencies()
+        pipeline_order(dependencies)
+        final_step(dependencies)
+        return self
+
+    def final(self) -> PipelineStep:
+        """The step whose output is the job's result"""
+        name = final_step({step.name: step.dependencies() for step in self.steps})
+        return next(step for step in self.steps if step.name == name)
+
+
 class JobUpdate(BaseModel):
     """Schema for updating a job"""
 
@@ -40,10 +112,15 @@ class JobInDB(JobBase):
     status: JobStatus
     result: Optional[Dict[str, Any]] = None
     error_message: Optional[str] = None
+    progress: Optional[Dict[str, Any]] = None
+    pipeline: Optional[Dict[str, Any]] = None
+    step_summaries: Optional[List[Dict[str, Any]]] = None
+    docker_image: Optional[str] = None
     owner_id: int
     created_at: datetime
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -60,3 +137,30 @@ class JobList(BaseModel):
 
     total: int
     items: list[Job]
+
+
+class DurationStats(BaseModel):
+    """Duration statistics in seconds, estimated from histograms"""
+
+    mean: Optional[float] = None
+    p50: Optional[float] = None
+    p95: Optional[float] = None
+    p99: Optional[float] = None
+
+
+class JobStatsGroup(BaseModel):
+    """Statistics of the jobs that finished with one status in one bucket"""
+
+    bucket_start: Optional[datetime] = None
+    plugin_name: str
+    status: JobStatus
+    count: int
+    run_seconds: DurationStats
+    wait_seconds: DurationStats
+
+
+class JobStats(BaseModel):
+    """Schema for job statistics response"""
+
+    interval: Literal["hour", "day", "total"]
+    groups: list[JobStatsGroup]
@@ -15,6 +15,7 @@ class PluginBase(BaseModel):
     version: str = Field(..., pattern=r"^\d+\.\d+\.\d+$")
     description: Optional[str] = None
     docker_image_url: str
+    image_digest: Optional[str] = None
 
 
 class PluginCreate(PluginBase):
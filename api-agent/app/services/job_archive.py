@@ -0,0 +1,144 @@
+"""
+Compressed archive of jobs from expired monthly partitions
+Each month is one JSONL.zst file holding one zstd frame per owner, plus a
+JSON index of frame offsets, so reading one user's archived jobs decompresses
+only that user's frame and stops as soon as the requested page is filled
+"""
+
+import io
+import json
+import os
+import re
+from datetime import date
+from itertools import groupby, islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+import zstandard
+
+from app.core.config import settings
+
+MONTH_PATTERN = re.compile(r"^\d{4}-\d{2}$")
+
+
+def month_label(month: date) -> str:
+    """Format a month as "YYYY-MM" """
+    return f"{month.year:04d}-{month.month:02d}"
+
+
+class JobArchive:
+    """Directory of archived job months"""
+
+    def __init__(self, directory: str, level: int = 10):
+        """
+        Initialize JobArchive.
+
+        Args:
+            directory: Directory holding the archive files
+            level: zstd compression level
+        """
+        self.directory = Path(directory)
+        self.level = level
+
+    def _paths(self, label: str) -> Tuple[Path, Path]:
+        base = self.directory / f"jobs-{label}"
+        return base.with_suffix(".jsonl.zst"), base.with_suffix(".index.json")
+
+    def months(self) -> List[str]:
+        """
+        List archived months.
+
+        Returns:
+            "YYYY-MM" labels, oldest first
+        """
+        if not self.directory.is_dir():
+            return []
+        labels = (
+            path.name[len("jobs-") : -len(".index.json")]
+            for path in self.directory.glob("jobs-*.index.json")
+        )
+        return sorted(label for label in labels if MONTH_PATTERN.match(label))
+
+    def write(self, month: date, rows: Iterable[Dict[str, Any]]) -> int:
+        """
+        Archive one month of jobs.
+
+        The index is written last, so a month only shows up once complete.
+
+        Args:
+            month: First day of the month
+            rows: Job rows ordered by owner_id
+
+        Returns:
+            Number of archived jobs
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        data_path, index_path = self._paths(month_label(month))
+        owners: Dict[str, Dict[str, int]] = {}
+        total = 0
+
+        compressor = zstandard.ZstdCompressor(level=self.level)
+        with open(data_path, "wb") as f:
+            for owner_id, group in groupby(rows, key=lambda row: row["owner_id"]):
+                offset = f.tell()
+                count = 0
+                writer = compressor.stream_writer(f, closefd=False)
+                for row in group:
+                    writer.write(json.dumps(row, default=str).encode() + b"\n")
+                    count += 1
+                writer.flush(zstandard.FLUSH_FRAME)
+                owners[str(owner_id)] = {
+                    "offset": offset,
+                    "length": f.tell() - offset,
+                    "count": count,
+                }
+                total += count
+
+        tmp_path = index_path.with_suffix(".tmp")
+        tmp_path.write_text(
+            json.dumps({"month": month_label(month), "rows": total, "owners": owners})
+        )
+        os.replace(tmp_path, index_path)
+        return total
+
+    def read(
+        self, label: str, owner_id: int, skip: int = 0, limit: int = 50
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Read a page of one owner's archived jobs.
+
+        Args:
+            label: Month as "YYYY-MM"
+            owner_id: Owner whose jobs to read
+            skip: Number of jobs to skip
+            limit: Maximum number of jobs to return
+
+        Returns:
+            Tuple of (owner's total archived jobs that month, page of jobs)
+
+        Raises:
+            FileNotFoundError: If the month is not archived
+        """
+        data_path, index_path = self._paths(label)
+        index = json.loads(index_path.read_text())
+        frame = index["owners"].get(str(owner_id))
+        if frame is None:
+            return 0, []
+
+        with open(data_path, "rb") as f:
+            f.seek(frame["offset"])
+            # Only this owner's compressed frame; decompression stays lazy
+            compressed = io.BytesIO(f.read(frame["length"]))
+            reader = zstandard.ZstdDecompressor().stream_reader(compressed)
+            lines = io.TextIOWrapper(reader, encoding="utf-8")
+            page = [json.loads(line) for line in islice(lines, skip, skip + limit)]
+        return frame["count"], page
+
+
+# Global instance
+job_archive = JobArchive(settings.JOB_ARCHIVE_DIR)
+
+
+def get_job_archive() -> JobArchive:
+    """Get job archive instance"""
+    return job_archive
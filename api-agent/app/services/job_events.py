@@ -0,0 +1,92 @@
+"""
+In-process job event hub
+Fans status and progress events out to SSE subscribers
+"""
+
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class JobEventHub:
+    """Delivers job events from the status ingester thread to asyncio streams"""
+
+    def __init__(self, max_queue_size: int = 100):
+        self.max_queue_size = max_queue_size
+        self._lock = threading.Lock()
+        self._subscribers: Dict[
+            int, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]
+        ] = defaultdict(set)
+
+    def subscribe(self, job_id: int) -> asyncio.Queue:
+        """
+        Subscribe the running event loop to events for a job.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Queue receiving (event_type, payload) tuples
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue_size)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._subscribers[job_id].add((loop, queue))
+        return queue
+
+    def unsubscribe(self, job_id: int, queue: asyncio.Queue) -> None:
+        """
+        Remove a subscription created by `subscribe`.
+
+        Args:
+            job_id: Job ID
+            queue: Queue returned by `subscribe`
+        """
+        with self._lock:
+            subscribers = self._subscribers.get(job_id)
+            if not subscribers:
+                return
+            for loop_and_queue in list(subscribers):
+                if loop_and_queue[1] is queue:
+                    subscribers.discard(loop_and_queue)
+            if not subscribers:
+                del self._subscribers[job_id]
+
+    def publish(self, job_id: int, event_type: str, payload: dict) -> None:
+        """
+        Publish an event to every subscriber of a job. Safe to call from any thread.
+
+        Args:
+            job_id: Job ID
+            event_type: SSE event name (status, progress)
+            payload: JSON-serializable event data
+        """
+        with self._lock:
+            subscribers = list(self._subscribers.get(job_id, ()))
+
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(_put_latest, queue, (event_type, payload))
+            except RuntimeError:
+                # Subscriber's event loop already closed
+                self.unsubscribe(job_id, queue)
+
+
+def _put_latest(queue: asyncio.Queue, item) -> None:
+    """Enqueue an item, dropping the oldest one if a slow reader fell behind"""
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(item)
+
+
+# Global instance
+job_event_hub = JobEventHub()
+
+
+def get_job_event_hub() -> JobEventHub:
+    """Get job event hub instance"""
+    return job_event_hub
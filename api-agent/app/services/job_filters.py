@@ -0,0 +1,244 @@
+"""
+Filters on job input and result documents
+Filters such as `result.prediction=class_A` or `result.confidence>=0.9` are
+compiled to SQL the database can answer from an index: on PostgreSQL,
+equality is a JSONB containment test served by the GIN index on the column,
+and ranges compare a numeric expression that matches the expression indexes
+created for fields a plugin's output_schema marks with "x-index"
+"""
+
+import hashlib
+import json
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy import (
+    Float,
+    Index,
+    MetaData,
+    and_,
+    case,
+    cast,
+    false,
+    func,
+    literal,
+    literal_column,
+    or_,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.job import Job
+
+logger = logging.getLogger(__name__)
+
+FILTER_PATTERN = re.compile(
+    r"^(input_data|result)((?:\.[A-Za-z0-9_]+)+)(!=|>=|<=|=|>|<)(.*)$", re.DOTALL
+)
+RANGE_OPERATORS = {
+    ">": lambda left, right: left > right,
+    ">=": lambda left, right: left >= right,
+    "<": lambda left, right: left < right,
+    "<=": lambda left, right: left <= right,
+}
+NUMERIC_TYPES = ("number", "integer")
+# PostgreSQL truncates identifiers longer than this
+MAX_INDEX_NAME = 63
+
+
+@dataclass(frozen=True)
+class JobFilter:
+    """One predicate on a field of input_data or result"""
+
+    column: str
+    path: Tuple[str, ...]
+    operator: str
+    value: Any
+
+
+def parse_job_filter(expression: str) -> JobFilter:
+    """
+    Parse a filter expression.
+
+    The syntax is `<column>.<path><operator><value>`, where column is
+    input_data or result, path is dot-separated keys, operator is one of
+    = != > >= < <=, and value is a JSON literal or a bare string, e.g.
+    `result.prediction=class_A` or `result.metadata.score>0.5`.
+
+    Args:
+        expression: Filter expression
+
+    Returns:
+        Parsed filter
+
+    Raises:
+        ValueError: If the expression is malformed
+    """
+    match = FILTER_PATTERN.match(expression)
+    if match is None:
+        raise ValueError(f"Invalid filter: {expression}")
+    column, path, operator, raw = match.groups()
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        value = raw
+    if operator in RANGE_OPERATORS and (
+        isinstance(value, bool) or not isinstance(value, (int, float))
+    ):
+        raise ValueError(f"Filter {expression} compares with a non-number")
+    return JobFilter(column, tuple(path[1:].split(".")), operator, value)
+
+
+def _quoted(value: str) -> ColumnElement:
+    # Inlined rather than bound, so queries repeat the exact expression
+    # PostgreSQL indexed; keys are restricted to [A-Za-z0-9_] by the parser
+    return literal_column(f"'{value}'")
+
+
+def json_number(column: ColumnElement, path: Tuple[str, ...], dialect: str):
+    """
+    Numeric value at a path in a JSON column, NULL if it is not a number.
+
+    On PostgreSQL this is the expression the declared result indexes are
+    built on, so it must not change without recreating them.
+
+    Args:
+        column: JSON column
+        path: Keys leading to the value
+        dialect: Database dialect name
+
+    Returns:
+        SQL expression
+    """
+    if dialect != "postgresql":
+        return func.json_extract(column, "$." + ".".join(path))
+    if len(path) == 1:
+        value = column.op("->")(_quoted(path[0]))
+        text = column.op("->>")(_quoted(path[0]))
+    else:
+        keys = _quoted("{" + ",".join(path) + "}")
+        value = column.op("#>")(keys)
+        text = column.op("#>>")(keys)
+    return case(
+        (func.jsonb_typeof(value) == literal_column("'number'"), cast(text, Float))
+    )
+
+
+def job_filter_clause(job_filter: JobFilter, dialect: str) -> ColumnElement:
+    """
+    Compile a filter to a WHERE clause on jobs.
+
+    Args:
+        job_filter: Parsed filter
+        dialect: Database dialect name
+
+    Returns:
+        SQL expression
+    """
+    column = getattr(Job, job_filter.column)
+    if job_filter.operator in RANGE_OPERATORS:
+        return RANGE_OPERATORS[job_filter.operator](
+            json_number(column, job_filter.path, dialect), job_filter.value
+        )
+
+    if dialect == "postgresql":
+        document = job_filter.value
+        for key in reversed(job_filter.path):
+            document = {key: document}
+        matches = column.op("@>")(literal(document, JSONB))
+        if job_filter.operator == "=":
+            return matches
+        return ~func.coalesce(matches, false())
+
+    value = func.json_extract(column, "$." + ".".join(job_filter.path))
+    expected = job_filter.value
+    if isinstance(expected, (dict, list)):
+        expected = json.dumps(expected, separators=(",", ":"))
+    if expected is None:
+        return value.is_(None) if job_filter.operator == "=" else value.isnot(None)
+    if job_filter.operator == "=":
+        return value == expected
+    return or_(value.is_(None), value != expected)
+
+
+def job_filter_clauses(expressions: Iterable[str], dialect: str) -> ColumnElement:
+    """
+    Parse and compile filter expressions, all of which must match.
+
+    Raises:
+        ValueError: If an expression is malformed
+    """
+    return and_(*(job_filter_clause(parse_job_filter(e), dialect) for e in expressions))
+
+
+def declared_result_fields(output_schema: Dict[str, Any]) -> List[str]:
+    """
+    Numeric top-level result fields an output_schema asks to index.
+
+    Fields opt in with `"x-index": true` next to their type, e.g.
+    {"properties": {"confidence": {"type": "number", "x-index": true}}}.
+
+    Args:
+        output_schema: Plugin output JSON Schema
+
+    Returns:
+        Field names, sorted
+    """
+    properties = (output_schema or {}).get("properties") or {}
+    return sorted(
+        name
+        for name, spec in properties.items()
+        if isinstance(spec, dict)
+        and spec.get("x-index") is True
+        and spec.get("type") in NUMERIC_TYPES
+        and re.fullmatch(r"[A-Za-z0-9_]+", name)
+    )
+
+
+def result_index(field: str) -> Index:
+    """Expression index serving range filters on a result field"""
+    name = f"ix_jobs_result_{field.lower()}"
+    # PostgreSQL folds unquoted names to lower case, so fields differing only
+    # in case (Score, score) need the digest of the exact name to stay apart
+    if len(name) > MAX_INDEX_NAME or field != field.lower():
+        digest = hashlib.sha256(field.encode()).hexdigest()[:8]
+        name = f"{name[: MAX_INDEX_NAME - 9]}_{digest}"
+    # Shared by every plugin declaring the field, and not partial on
+    # plugin_name: prepared statements bind plugin_name, which would keep
+    # PostgreSQL from proving a partial index applies. Built on a copy of the
+    # table so the model's metadata (and create_all) never sees it
+    jobs = Job.__table__.to_metadata(MetaData())
+    return Index(name, json_number(jobs.c.result, (field,), "postgresql"), _table=jobs)
+
+
+def ensure_result_indexes(engine: Engine, plugins: Iterable[Any]) -> List[str]:
+    """
+    Create the result indexes declared by plugins' output schemas.
+
+    Args:
+        engine: Sync engine for the primary database
+        plugins: Registered plugins (anything with an output_schema)
+
+    Returns:
+        Names of the declared indexes
+    """
+    if engine.dialect.name != "postgresql":
+        return []
+    fields = sorted(
+        {
+            field
+            for plugin in plugins
+            for field in declared_result_fields(plugin.output_schema)
+        }
+    )
+    indexes = [result_index(field) for field in fields]
+    with engine.begin() as connection:
+        for index in indexes:
+            connection.execute(CreateIndex(index, if_not_exists=True))
+    for index in indexes:
+        logger.info(f"Ensured result index {index.name}")
+    return [index.name for index in indexes]
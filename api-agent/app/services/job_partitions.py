@@ -0,0 +1,216 @@
+"""
+Monthly partition maintenance for the jobs table
+On PostgreSQL, jobs is range-partitioned by created_at into one partition per
+month (see the partition_jobs_by_month migration). The maintainer keeps
+partitions created ahead of time and, past the retention period, detaches
+old partitions, archives their rows and drops them
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.core.db import utcnow
+from app.models.job import JobStatus
+from app.services.job_archive import JobArchive
+
+logger = logging.getLogger(__name__)
+
+PARTITION_NAME = re.compile(r"^jobs_y(\d{4})m(\d{2})$")
+
+
+def month_start(moment: datetime) -> date:
+    """First day of the month a moment falls in"""
+    return date(moment.year, moment.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    """Shift a first-of-month date by a number of months"""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Name of the partition holding a month, e.g. jobs_y2024m01"""
+    return f"jobs_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """Month a partition holds, or None if it is not a monthly partition"""
+    match = PARTITION_NAME.match(name)
+    if match is None:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def create_partition_sql(month: date) -> str:
+    """DDL creating the partition for a month if it does not exist"""
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF jobs "
+        f"FOR VALUES FROM ('{month.isoformat()}') "
+        f"TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+def archive_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a raw jobs row to the shape the API returns"""
+    row = dict(row)
+    # Enum columns store member names; the API exposes values
+    if row.get("status") in JobStatus.__members__:
+        row["status"] = JobStatus[row["status"]].value
+    return row
+
+
+def expired_months(
+    months: List[date], current: date, retention_months: int
+) -> List[date]:
+    """
+    Select the months past retention.
+
+    Args:
+        months: Months that have partitions
+        current: Current month
+        retention_months: Number of months kept, including the current one;
+            0 keeps everything
+
+    Returns:
+        Expired months, oldest first
+    """
+    if retention_months <= 0:
+        return []
+    cutoff = add_months(current, -(retention_months - 1))
+    return sorted(month for month in months if month < cutoff)
+
+
+@dataclass
+class MaintenanceResult:
+    """What one maintenance run changed"""
+
+    created: List[str] = field(default_factory=list)
+    archived: List[str] = field(default_factory=list)
+    archived_rows: int = 0
+
+
+class JobPartitionMaintainer:
+    """Creates upcoming monthly partitions and archives expired ones"""
+
+    def __init__(
+        self,
+        engine: Engine,
+        archive: JobArchive,
+        retention_months: int,
+        months_ahead: int,
+        clock: Callable[[], datetime] = utcnow,
+    ):
+        """
+        Initialize JobPartitionMaintainer.
+
+        Args:
+            engine: Sync engine for the primary database
+            archive: Where expired partitions are archived
+            retention_months: Months of jobs kept in the database; 0 keeps all
+            months_ahead: Months of partitions created ahead of time
+            clock: Current UTC time
+        """
+        self.engine = engine
+        self.archive = archive
+        self.retention_months = retention_months
+        self.months_ahead = months_ahead
+        self.clock = clock
+
+    def run(self) -> MaintenanceResult:
+        """
+        Run maintenance once.
+
+        Returns:
+            Partitions created and archived
+        """
+        result = MaintenanceResult()
+        if self.engine.dialect.name != "postgresql":
+            logger.info("jobs is only partitioned on PostgreSQL; nothing to do")
+            return result
+
+        current = month_start(self.clock())
+        result.created = self.ensure_partitions(current)
+        for month in expired_months(
+            self._partition_months(), current, self.retention_months
+        ):
+            result.archived_rows += self.archive_partition(month)
+            result.archived.append(partition_name(month))
+        return result
+
+    def ensure_partitions(self, current: date) -> List[str]:
+        """Create partitions from the current month to months_ahead ahead"""
+        existing = set(self._partition_months())
+        created = []
+        with self.engine.begin() as connection:
+            for offset in range(self.months_ahead + 1):
+                month = add_months(current, offset)
+                if month not in existing:
+                    connection.execute(text(create_partition_sql(month)))
+                    created.append(partition_name(month))
+        for name in created:
+            logger.info(f"Created partition {name}")
+        return created
+
+    def archive_partition(self, month: date) -> int:
+        """
+        Detach a month's partition, archive its rows and drop it.
+
+        Detaching first takes the month out of every query at once. The table
+        is dropped only after the archive is complete, so a failed run leaves
+        a detached table that the next run picks up again.
+
+        Args:
+            month: Month to archive
+
+        Returns:
+            Number of archived jobs
+        """
+        name = partition_name(month)
+        with self.engine.begin() as connection:
+            if name in self._attached_partitions(connection):
+                connection.execute(text(f"ALTER TABLE jobs DETACH PARTITION {name}"))
+
+        with self.engine.connect() as connection:
+            result = connection.execution_options(
+                stream_results=True, yield_per=1000
+            ).execute(text(f"SELECT * FROM {name} ORDER BY owner_id, id"))
+            rows = self.archive.write(
+                month, (archive_row(row._mapping) for row in result)
+            )
+
+        with self.engine.begin() as connection:
+            connection.execute(text(f"DROP TABLE {name}"))
+        logger.info(f"Archived {rows} jobs from {name}")
+        return rows
+
+    def _partition_months(self) -> List[date]:
+        """Months with a partition, attached or left detached by a failed run"""
+        with self.engine.connect() as connection:
+            names = connection.execute(
+                text(
+                    "SELECT relname FROM pg_class "
+                    "WHERE relkind IN ('r', 'p') AND relname LIKE 'jobs\\_y%'"
+                )
+            ).scalars()
+            months = [partition_month(name) for name in names]
+        return sorted(month for month in months if month is not None)
+
+    @staticmethod
+    def _attached_partitions(connection) -> List[str]:
+        return list(
+            connection.execute(
+                text(
+                    "SELECT child.relname FROM pg_inherits "
+                    "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                    "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+                    "WHERE parent.relname = 'jobs'"
+                )
+            ).scalars()
+        )
@@ -0,0 +1,115 @@
+"""
+Pipeline jobs
+Validates the step graph of a pipeline job: which upstream outputs each step
+reads, and that the steps form a DAG ending in a single final step. The Ray
+worker runs the steps and hands outputs from step to step in its object
+store; only the final step's result comes back through status_queue
+"""
+
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+# Upper bound on steps in one pipeline job
+PIPELINE_MAX_STEPS = 32
+
+
+class PipelineError(ValueError):
+    """Raised for a pipeline whose steps do not form a valid graph"""
+
+
+def parse_reference(reference: str) -> Tuple[str, List[str]]:
+    """
+    Split an upstream output reference.
+
+    Args:
+        reference: "step" for a step's whole output, or "step.path.to.field";
+            numeric path segments index into lists
+
+    Returns:
+        Tuple of (step name, path segments)
+    """
+    step, *path = reference.split(".")
+    if not step or any(not segment for segment in path):
+        raise PipelineError(f"Invalid output reference {reference!r}")
+    return step, path
+
+
+def step_dependencies(
+    inputs: Mapping[str, str], depends_on: Sequence[str]
+) -> List[str]:
+    """
+    Steps a step has to wait for.
+
+    Args:
+        inputs: Input field -> upstream output reference
+        depends_on: Steps to wait for without reading their output
+
+    Returns:
+        Upstream step names, those whose output is read first
+    """
+    read = [parse_reference(reference)[0] for reference in inputs.values()]
+    return list(dict.fromkeys([*read, *depends_on]))
+
+
+def pipeline_order(dependencies: Mapping[str, Sequence[str]]) -> List[str]:
+    """
+    Order pipeline steps so every step comes after the steps it depends on.
+
+    Args:
+        dependencies: Step name -> upstream step names, in declaration order
+
+    Returns:
+        Step names in execution order, declaration order among independent
+        steps
+
+    Raises:
+        PipelineError: If a step depends on an unknown step or on itself, or
+            the steps form a cycle
+    """
+    for name, upstream in dependencies.items():
+        for dependency in upstream:
+            if dependency == name:
+                raise PipelineError(f"Step {name!r} depends on itself")
+            if dependency not in dependencies:
+                raise PipelineError(
+                    f"Step {name!r} depends on unknown step {dependency!r}"
+                )
+
+    remaining: Dict[str, set] = {
+        name: set(upstream) for name, upstream in dependencies.items()
+    }
+    order: List[str] = []
+    while remaining:
+        ready = [name for name, upstream in remaining.items() if not upstream]
+        if not ready:
+            raise PipelineError(
+                f"Steps {', '.join(sorted(remaining))} form a dependency cycle"
+            )
+        for name in ready:
+            del remaining[name]
+            for upstream in remaining.values():
+                upstream.discard(name)
+        order.extend(ready)
+    return order
+
+
+def final_step(dependencies: Mapping[str, Sequence[str]]) -> str:
+    """
+    The step whose output is the pipeline's result.
+
+    Args:
+        dependencies: Step name -> upstream step names
+
+    Returns:
+        Name of the only step no other step depends on
+
+    Raises:
+        PipelineError: If there is no such step or more than one
+    """
+    upstream = {name for names in dependencies.values() for name in names}
+    sinks = [name for name in dependencies if name not in upstream]
+    if len(sinks) != 1:
+        raise PipelineError(
+            "A pipeline must end in exactly one step, not "
+            f"{', '.join(sinks) or 'none'}"
+        )
+    return sinks[0]
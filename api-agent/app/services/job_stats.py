@@ -0,0 +1,263 @@
+"""
+Job statistics rollup
+Finished jobs are folded into hourly job_stats rows as they finish: counts,
+duration sums and log-scale histograms of run time and queue wait. Statistics
+are then computed from the rollup alone, whose size depends on hours and
+plugins rather than on the number of jobs, and survives job archival
+"""
+
+import math
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.job import Job as JobModel, JobStatus
+from app.models.job_stats import JobStatsBucket
+
+FINISHED_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED)
+# Histogram buckets grow by 25% from 10ms, so estimated percentiles are
+# within about 12% of the true value; the last bucket, from about 30 days,
+# is open
+HISTOGRAM_SMALLEST = 0.01
+HISTOGRAM_GROWTH = 1.25
+HISTOGRAM_BUCKETS = 88
+
+
+def _utc(moment: Optional[datetime]) -> Optional[datetime]:
+    """Treat naive datetimes (as SQLite returns them) as UTC"""
+    if moment is not None and moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment
+
+
+def histogram_index(seconds: float) -> int:
+    """Histogram bucket holding a duration"""
+    if seconds <= HISTOGRAM_SMALLEST:
+        return 0
+    index = math.ceil(math.log(seconds / HISTOGRAM_SMALLEST, HISTOGRAM_GROWTH))
+    return min(index, HISTOGRAM_BUCKETS - 1)
+
+
+def histogram_value(index: int) -> float:
+    """Representative duration of a bucket: the geometric mean of its bounds"""
+    if index == 0:
+        return HISTOGRAM_SMALLEST
+    return HISTOGRAM_SMALLEST * HISTOGRAM_GROWTH ** (index - 0.5)
+
+
+def histogram_percentile(histogram: Dict[Any, int], fraction: float) -> Optional[float]:
+    """
+    Estimate a percentile from a histogram.
+
+    Args:
+        histogram: Counts by bucket index
+        fraction: Percentile as a fraction, e.g. 0.95
+
+    Returns:
+        Estimated duration in seconds, or None for an empty histogram
+    """
+    counts = sorted((int(index), count) for index, count in histogram.items())
+    total = sum(count for _, count in counts)
+    if total == 0:
+        return None
+    rank = max(1, math.ceil(fraction * total))
+    seen = 0
+    for index, count in counts:
+        seen += count
+        if seen >= rank:
+            return histogram_value(index)
+    return histogram_value(counts[-1][0])
+
+
+def merge_histograms(target: Dict[str, int], source: Dict[Any, int]) -> None:
+    """Add the counts of one histogram to another, in place"""
+    for index, count in source.items():
+        target[str(index)] = target.get(str(index), 0) + count
+
+
+def job_durations(job: JobModel) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Run time and queue wait of a finished job.
+
+    Returns:
+        Tuple of (seconds from start to finish, seconds from submission to
+        start); either is None if the timestamps it needs are missing
+    """
+    created_at = _utc(job.created_at)
+    started_at = _utc(job.started_at)
+    completed_at = _utc(job.completed_at)
+    run = wait = None
+    if started_at is not None and completed_at is not None:
+        run = max(0.0, (completed_at - started_at).total_seconds())
+    if created_at is not None and started_at is not None:
+        wait = max(0.0, (started_at - created_at).total_seconds())
+    return run, wait
+
+
+def _bucket_key(job: JobModel) -> Tuple[int, str, JobStatus, datetime]:
+    hour = _utc(job.completed_at).replace(minute=0, second=0, microsecond=0)
+    return job.owner_id, job.plugin_name, job.status, hour
+
+
+def _new_bucket(key: Tuple[int, str, JobStatus, datetime]) -> JobStatsBucket:
+    owner_id, plugin_name, status, bucket_start = key
+    return JobStatsBucket(
+        owner_id=owner_id,
+        plugin_name=plugin_name,
+        status=status,
+        bucket_start=bucket_start,
+        count=0,
+        run_seconds_sum=0.0,
+        wait_seconds_sum=0.0,
+        run_histogram={},
+        wait_histogram={},
+    )
+
+
+def _add_job(bucket: JobStatsBucket, job: JobModel) -> None:
+    run, wait = job_durations(job)
+    bucket.count += 1
+    # Reassigned rather than mutated so the JSON columns are flagged dirty
+    if run is not None:
+        bucket.run_seconds_sum += run
+        bucket.run_histogram = {**bucket.run_histogram}
+        merge_histograms(bucket.run_histogram, {histogram_index(run): 1})
+    if wait is not None:
+        bucket.wait_seconds_sum += wait
+        bucket.wait_histogram = {**bucket.wait_histogram}
+        merge_histograms(bucket.wait_histogram, {histogram_index(wait): 1})
+
+
+def record_finished_job(db: Session, job: JobModel) -> None:
+    """
+    Fold a job that just finished into its hourly rollup row.
+
+    Runs in the caller's transaction, so the rollup commits together with
+    the job's final status.
+
+    Args:
+        db: Database session
+        job: Job that reached a terminal status
+    """
+    if job.status not in FINISHED_STATUSES or job.completed_at is None:
+        return
+
+    key = _bucket_key(job)
+    bucket = db.get(JobStatsBucket, key, with_for_update=True)
+    if bucket is None:
+        try:
+            # Another ingester may create the same row concurrently
+            with db.begin_nested():
+                bucket = _new_bucket(key)
+                db.add(bucket)
+        except IntegrityError:
+            bucket = db.get(
+                JobStatsBucket, key, with_for_update=True, populate_existing=True
+            )
+    _add_job(bucket, job)
+
+
+def rebuild_job_stats(db: Session) -> int:
+    """
+    Recompute the rollup from the jobs table.
+
+    Jobs already archived out of the database are no longer counted.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Number of jobs folded into the rollup
+    """
+    buckets: Dict[Tuple, JobStatsBucket] = {}
+    jobs = db.execute(
+        select(JobModel)
+        .where(
+            JobModel.status.in_(FINISHED_STATUSES),
+            JobModel.completed_at.isnot(None),
+        )
+        .execution_options(yield_per=1000)
+    ).scalars()
+    total = 0
+    for job in jobs:
+        key = _bucket_key(job)
+        if key not in buckets:
+            buckets[key] = _new_bucket(key)
+        _add_job(buckets[key], job)
+        total += 1
+
+    db.execute(delete(JobStatsBucket))
+    db.add_all(buckets.values())
+    db.commit()
+    return total
+
+
+def _summary(histogram: Dict[str, int], seconds_sum: float) -> Dict[str, Any]:
+    samples = sum(histogram.values())
+    return {
+        "mean": seconds_sum / samples if samples else None,
+        "p50": histogram_percentile(histogram, 0.50),
+        "p95": histogram_percentile(histogram, 0.95),
+        "p99": histogram_percentile(histogram, 0.99),
+    }
+
+
+def summarize(
+    buckets: Iterable[JobStatsBucket], interval: str = "total"
+) -> List[Dict[str, Any]]:
+    """
+    Aggregate rollup rows by plugin, status and time bucket.
+
+    Args:
+        buckets: Rollup rows
+        interval: "hour", "day", or "total" for no time bucketing
+
+    Returns:
+        One entry per group with the job count and run time and queue wait
+        statistics, ordered by time bucket, plugin and status
+    """
+    groups: Dict[Tuple, Dict[str, Any]] = defaultdict(
+        lambda: {
+            "count": 0,
+            "run_seconds_sum": 0.0,
+            "wait_seconds_sum": 0.0,
+            "run_histogram": {},
+            "wait_histogram": {},
+        }
+    )
+    for bucket in buckets:
+        start = None
+        if interval == "hour":
+            start = _utc(bucket.bucket_start)
+        elif interval == "day":
+            start = _utc(bucket.bucket_start).replace(hour=0)
+        group = groups[(start, bucket.plugin_name, JobStatus(bucket.status))]
+        group["count"] += bucket.count
+        group["run_seconds_sum"] += bucket.run_seconds_sum
+        group["wait_seconds_sum"] += bucket.wait_seconds_sum
+        merge_histograms(group["run_histogram"], bucket.run_histogram)
+        merge_histograms(group["wait_histogram"], bucket.wait_histogram)
+
+    def order(key):
+        start, plugin_name, status = key
+        return (start is not None, start), plugin_name, status.value
+
+    return [
+        {
+            "bucket_start": start,
+            "plugin_name": plugin_name,
+            "status": status,
+            "count": group["count"],
+            "run_seconds": _summary(group["run_histogram"], group["run_seconds_sum"]),
+            "wait_seconds": _summary(
+                group["wait_histogram"], group["wait_seconds_sum"]
+            ),
+        }
+        for (start, plugin_name, status), group in sorted(
+            groups.items(), key=lambda item: order(item[0])
+        )
+    ]
@@ -5,15 +5,29 @@ Handles job queue and status queue communication
 
 import json
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional
 
 import pika
 from pika.adapters.blocking_connection import BlockingChannel, BlockingConnection
 
 from app.core.config import settings
+from app.services.status_codec import decode_status_message
 
 logger = logging.getLogger(__name__)
 
+# Jobs are published to JOB_EXCHANGE with routing key "jobs.<plugin_name>".
+# Workers dedicated to some plugins bind their own queues for those keys;
+# anything no queue is bound for falls through to the shared job_queue.
+JOB_EXCHANGE = "jobs_exchange"
+UNROUTED_JOB_EXCHANGE = "jobs_unrouted"
+
+
+def job_routing_key(plugin_name: str) -> str:
+    """Routing key for a plugin's jobs on JOB_EXCHANGE"""
+    return f"jobs.{plugin_name}"
+
 
 class RabbitMQService:
     """Service for RabbitMQ operations"""
@@ -39,7 +53,20 @@ class RabbitMQService:
 
     def _declare_queues(self):
         """Declare required queues with configurations"""
-        # Job queue - for sending jobs to Ray workers
+        # Job exchange - routes jobs by plugin, unrouted jobs go to job_queue
+        self.channel.exchange_declare(
+            exchange=UNROUTED_JOB_EXCHANGE,
+            exchange_type="fanout",
+            durable=True,
+        )
+        self.channel.exchange_declare(
+            exchange=JOB_EXCHANGE,
+            exchange_type="topic",
+            durable=True,
+            arguments={"alternate-exchange": UNROUTED_JOB_EXCHANGE},
+        )
+
+        # Job queue - shared queue for plugins without dedicated workers
         self.channel.queue_declare(
             queue="job_queue",
             durable=True,
@@ -47,8 +74,11 @@ class RabbitMQService:
                 "x-message-ttl": 3600000,  # 1 hour
                 "x-max-length": 10000,
                 "x-dead-letter-exchange": "dlx_exchange",
+                "x-dead-letter-routing-key": "job_queue",
+                "x-max-priority": settings.JOB_QUEUE_MAX_PRIORITY,
             },
         )
+        self.channel.queue_bind(queue="job_queue", exchange=UNROUTED_JOB_EXCHANGE)
 
         # Status queue - for receiving status updates from Ray workers
         self.channel.queue_declare(
@@ -79,10 +109,11 @@ class RabbitMQService:
 
     def publish_job(self, job_data: Dict):
         """
-        Publish job to job_queue
+        Publish job to its plugin's routing key on the job exchange
 
         Args:
-            job_data: Dictionary with job information
+            job_data: Dictionary with job information; its optional `priority`
+                becomes the message priority
         """
         if not self.channel:
             self.connect()
@@ -90,12 +121,15 @@ class RabbitMQService:
         try:
             message = json.dumps(job_data)
             self.channel.basic_publish(
-                exchange="",
-                routing_key="job_queue",
+                exchange=JOB_EXCHANGE,
+                routing_key=job_routing_key(job_data["plugin_name"]),
                 body=message,
                 properties=pika.BasicProperties(
                     delivery_mode=2,  # Make message persistent
                     content_type="application/json",
+                    priority=job_data.get("priority", 0),
+                    # Lets workers keep the queue TTL when they defer a job
+                    timestamp=int(time.time()),
                 ),
             )
             logger.info(f"Published job {job_data.get('job_id')} to queue")
@@ -115,7 +149,9 @@ class RabbitMQService:
 
         def on_message(ch, method, properties, body):
             try:
-                message = json.loads(body)
+                message = decode_status_message(
+                    body, properties.content_type, properties.content_encoding
+                )
                 callback(message)
                 ch.basic_ack(delivery_tag=method.delivery_tag)
             except Exception as e:
@@ -140,6 +176,9 @@ class RabbitMQService:
 
 # Global instance
 mq_service = RabbitMQService()
+# Request handlers publish on this thread: pika's blocking connection must not
+# run on the event loop, and must not be shared between threads
+publish_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mq-publish")
 
 
 def get_mq_service() -> RabbitMQService:
@@ -0,0 +1,230 @@
+"""
+In-process snapshot of plugin metadata fetched from the plugin-registry
+Plugin versions are immutable, so entries for an exact version stay valid
+until the version is deleted; alias entries ("latest", "stable") are marked
+stale by change events from the registry and then revalidated
+"""
+
+import json
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+import pika
+
+from app.core.config import settings
+from app.schemas.plugin import Plugin
+
+logger = logging.getLogger(__name__)
+
+# Must match the exchange plugin-registry publishes change events to
+PLUGIN_EVENTS_EXCHANGE = "plugin_events"
+
+
+@dataclass
+class CachedPlugin:
+    """A plugin version with the validators it was fetched with"""
+
+    plugin: Plugin
+    etag: Optional[str]
+    fetched_at: float
+
+
+class PluginCache:
+    """Bounded LRU of plugin versions keyed by (name, version or alias)"""
+
+    def __init__(self, max_size: int, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.clock = clock
+        self._entries: OrderedDict[Tuple[str, str], CachedPlugin] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, name: str, ref: str) -> Optional[CachedPlugin]:
+        """
+        Get a cached plugin, however old.
+
+        Args:
+            name: Plugin name
+            ref: Version or alias the plugin was cached under
+
+        Returns:
+            Cached entry, or None if missing
+        """
+        key = (name, ref)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(
+        self, plugin: Plugin, ref: Optional[str] = None, etag: Optional[str] = None
+    ) -> None:
+        """
+        Cache plugin metadata, evicting the least recently used entry if full.
+
+        Args:
+            plugin: Plugin metadata
+            ref: Alias the plugin was resolved from (None for its exact version)
+            etag: ETag the registry served it with
+        """
+        key = (plugin.name, ref or plugin.version)
+        with self._lock:
+            self._entries[key] = CachedPlugin(plugin, etag, self.clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def touch(self, name: str, ref: str) -> None:
+        """
+        Mark an entry as just revalidated.
+
+        Args:
+            name: Plugin name
+            ref: Version or alias
+        """
+        with self._lock:
+            entry = self._entries.get((name, ref))
+            if entry is not None:
+                entry.fetched_at = self.clock()
+
+    def discard(self, name: str, ref: str) -> None:
+        """
+        Drop one entry.
+
+        Args:
+            name: Plugin name
+            ref: Version or alias
+        """
+        with self._lock:
+            self._entries.pop((name, ref), None)
+
+    def invalidate(self, name: str, version: Optional[str] = None) -> None:
+        """
+        Drop the entries resolving to a removed plugin version.
+
+        Args:
+            name: Plugin name
+            version: Removed version (None drops every entry of the plugin)
+        """
+        with self._lock:
+            stale = [
+                key
+                for key, entry in self._entries.items()
+                if key[0] == name
+                and (version is None or entry.plugin.version == version)
+            ]
+            for key in stale:
+                del self._entries[key]
+
+    def expire_aliases(self, name: Optional[str] = None) -> None:
+        """
+        Mark alias entries stale so they are revalidated before use.
+
+        They are kept, not dropped, so they can still be served while the
+        registry is unreachable.
+
+        Args:
+            name: Plugin name (None for every plugin)
+        """
+        with self._lock:
+            for (entry_name, ref), entry in self._entries.items():
+                if (name is None or entry_name == name) and ref != entry.plugin.version:
+                    entry.fetched_at = -math.inf
+
+    def clear(self) -> None:
+        """Drop every cached plugin"""
+        with self._lock:
+            self._entries.clear()
+
+
+# Global instance
+plugin_cache = PluginCache(max_size=settings.PLUGIN_CACHE_MAX_SIZE)
+
+
+class PluginEventListener:
+    """Expires cached plugins on registry change events, on a background thread"""
+
+    def __init__(self, cache: PluginCache = plugin_cache):
+        self.cache = cache
+        self._thread: Optional[threading.Thread] = None
+
+    def handle(self, message: dict) -> None:
+        """
+        Apply one plugin change event.
+
+        New versions and alias moves only make alias entries stale; a deleted
+        version is dropped along with the aliases resolving to it.
+
+        Args:
+            message: Event with `event`, `name` and (usually) `version`
+        """
+        if message.get("event") == "prepull":
+            # Addressed to workers; metadata did not change
+            return
+        if message.get("event") == "deleted":
+            self.cache.invalidate(message["name"], message.get("version"))
+        else:
+            self.cache.expire_aliases(message["name"])
+        logger.info(
+            f"Plugin {message['name']} {message.get('event')}, cache invalidated"
+        )
+
+    def run(self) -> None:
+        """Listen for change events forever, reconnecting on failure"""
+        while True:
+            connection = None
+            try:
+                connection = pika.BlockingConnection(
+                    pika.URLParameters(settings.RABBITMQ_URL)
+                )
+                channel = connection.channel()
+                channel.exchange_declare(
+                    exchange=PLUGIN_EVENTS_EXCHANGE,
+                    exchange_type="fanout",
+                    durable=True,
+                )
+                # Every API process gets its own copy of each event
+                queue = channel.queue_declare(queue="", exclusive=True).method.queue
+                channel.queue_bind(queue=queue, exchange=PLUGIN_EVENTS_EXCHANGE)
+
+                # Events may have been missed while disconnected
+                self.cache.expire_aliases()
+
+                def on_message(ch, method, properties, body):
+                    try:
+                        self.handle(json.loads(body))
+                    except Exception as e:
+                        logger.error(f"Error processing plugin event: {e}")
+
+                channel.basic_consume(
+                    queue=queue, on_message_callback=on_message, auto_ack=True
+                )
+                channel.start_consuming()
+            except Exception as e:
+                logger.error(f"Plugin event listener disconnected: {e}")
+            finally:
+                if connection and not connection.is_closed:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+            time.sleep(settings.MQ_RECONNECT_SECONDS)
+
+    def start(self) -> None:
+        """Start the listener thread if it is not already running"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(
+            target=self.run, name="plugin-event-listener", daemon=True
+        )
+        self._thread.start()
+        logger.info("Plugin event listener started")
+
+
+# Global instance
+plugin_event_listener = PluginEventListener()
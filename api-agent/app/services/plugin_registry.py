@@ -0,0 +1,219 @@
+"""
+Plugin registry client
+The plugin-registry service owns plugin metadata; api-agent reads it over
+pooled HTTP through the in-process snapshot in plugin_cache, revalidating
+alias entries with ETags and serving stale entries while the registry is
+being revalidated or is unreachable
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+import httpx
+
+from app.core.config import settings
+from app.schemas.plugin import Plugin
+from app.services.plugin_cache import CachedPlugin, PluginCache, plugin_cache
+from app.services.plugin_versions import LATEST_ALIAS, version_key
+
+logger = logging.getLogger(__name__)
+
+# Plugin versions fetched per request when listing the whole registry
+LIST_PAGE_SIZE = 1000
+
+
+class PluginRegistryUnavailable(Exception):
+    """The registry could not be reached and nothing usable was cached"""
+
+
+class PluginRegistryClient:
+    """Cached, revalidating reader of plugin metadata"""
+
+    def __init__(
+        self,
+        base_url: str,
+        cache: PluginCache,
+        ttl_seconds: float,
+        stale_seconds: float,
+        client: Optional[httpx.Client] = None,
+    ):
+        """
+        Initialize PluginRegistryClient.
+
+        Args:
+            base_url: Plugin Registry base URL
+            cache: Snapshot of fetched plugin versions
+            ttl_seconds: How long an alias entry is served without revalidation
+            stale_seconds: How much longer it is served while it is revalidated
+                in the background
+            client: HTTP client (a pooled client with a 5s timeout by default)
+        """
+        self.base_url = base_url.rstrip("/")
+        self.cache = cache
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.client = client or httpx.Client(
+            timeout=settings.PLUGIN_REGISTRY_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_keepalive_connections=20),
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="plugin-revalidate"
+        )
+        self._revalidating: Set[Tuple[str, str]] = set()
+        self._lock = threading.Lock()
+
+    def get_plugin(self, name: str, ref: Optional[str] = None) -> Optional[Plugin]:
+        """
+        Get plugin metadata by name and version or alias.
+
+        Args:
+            name: Plugin name
+            ref: Exact version, alias, or None for the latest version
+
+        Returns:
+            Plugin metadata, or None if no such plugin version exists
+
+        Raises:
+            PluginRegistryUnavailable: If the registry is unreachable and the
+                plugin was never fetched
+        """
+        ref = ref or LATEST_ALIAS
+        entry = self.cache.get(name, ref)
+        if entry is not None:
+            # Exact versions are immutable and never need revalidating
+            if ref == entry.plugin.version:
+                return entry.plugin
+            age = self.cache.clock() - entry.fetched_at
+            if age < self.ttl_seconds:
+                return entry.plugin
+            if age < self.ttl_seconds + self.stale_seconds:
+                self._revalidate_in_background(name, ref)
+                return entry.plugin
+
+        try:
+            return self._fetch(name, ref, entry)
+        except httpx.HTTPError as e:
+            if entry is not None:
+                logger.warning(
+                    f"Plugin registry unavailable, serving stale {name}: {e}"
+                )
+                return entry.plugin
+            raise PluginRegistryUnavailable(str(e)) from e
+
+    def list_plugins(self) -> List[Plugin]:
+        """
+        Fetch every registered plugin version, bypassing the cache.
+
+        Returns:
+            All plugin versions
+
+        Raises:
+            PluginRegistryUnavailable: If the registry cannot be reached
+        """
+        plugins: List[Plugin] = []
+        try:
+            while True:
+                # Keyset paging: versions registered meanwhile cannot shift
+                # rows between pages
+                response = self.client.get(
+                    f"{self.base_url}/api/v1/plugins",
+                    params={
+                        "after_id": plugins[-1].id if plugins else 0,
+                        "limit": LIST_PAGE_SIZE,
+                    },
+                )
+                response.raise_for_status()
+                page = response.json()["items"]
+                plugins.extend(Plugin.model_validate(item) for item in page)
+                if len(page) < LIST_PAGE_SIZE:
+                    break
+        except httpx.HTTPError as e:
+            raise PluginRegistryUnavailable(str(e)) from e
+        return plugins
+
+    def load_snapshot(self) -> None:
+        """Cache every registered version, and each plugin's latest, up front"""
+        try:
+            plugins = self.list_plugins()
+        except PluginRegistryUnavailable as e:
+            logger.warning(f"Could not load plugin snapshot: {e}")
+            return
+
+        latest: Dict[str, Plugin] = {}
+        for plugin in plugins:
+            self.cache.put(plugin)
+            current = latest.get(plugin.name)
+            if current is None or version_key(plugin.version) > version_key(
+                current.version
+            ):
+                latest[plugin.name] = plugin
+        for plugin in latest.values():
+            self.cache.put(plugin, LATEST_ALIAS)
+        logger.info(f"Loaded snapshot of {len(plugins)} plugin versions")
+
+    def _fetch(
+        self, name: str, ref: str, entry: Optional[CachedPlugin]
+    ) -> Optional[Plugin]:
+        headers = {}
+        if entry is not None and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        response = self.client.get(
+            f"{self.base_url}/api/v1/plugins/{name}/versions/{ref}", headers=headers
+        )
+
+        if response.status_code == httpx.codes.NOT_MODIFIED and entry is not None:
+            self.cache.touch(name, ref)
+            return entry.plugin
+        if response.status_code == httpx.codes.NOT_FOUND:
+            self.cache.discard(name, ref)
+            return None
+        response.raise_for_status()
+
+        plugin = Plugin.model_validate(response.json())
+        self.cache.put(plugin, ref, etag=response.headers.get("ETag"))
+        if ref != plugin.version:
+            self.cache.put(plugin)
+        return plugin
+
+    def _revalidate_in_background(self, name: str, ref: str) -> None:
+        key = (name, ref)
+        with self._lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+
+        def revalidate():
+            try:
+                self._fetch(name, ref, self.cache.get(name, ref))
+            except httpx.HTTPError as e:
+                logger.warning(f"Could not revalidate plugin {name} {ref}: {e}")
+            finally:
+                with self._lock:
+                    self._revalidating.discard(key)
+
+        self._executor.submit(revalidate)
+
+
+# Global instance
+plugin_registry = PluginRegistryClient(
+    base_url=settings.PLUGIN_REGISTRY_URL,
+    cache=plugin_cache,
+    ttl_seconds=settings.PLUGIN_CACHE_TTL_SECONDS,
+    stale_seconds=settings.PLUGIN_CACHE_STALE_SECONDS,
+)
+
+
+def get_plugin(name: str, ref: Optional[str] = None) -> Optional[Plugin]:
+    """
+    Get plugin metadata through the global registry client.
+
+    Args:
+        name: Plugin name
+        ref: Exact version, alias, or None for the latest version
+
+    Returns:
+        Plugin metadata, or None if no such plugin version exists
+    """
+    return plugin_registry.get_plugin(name, ref)
@@ -0,0 +1,43 @@
+"""
+Plugin version references
+Mirrors the plugin-registry rules: a reference is an exact version, an
+alias such as "stable", or the implicit "latest" (highest version)
+"""
+
+import re
+from typing import Optional, Tuple
+
+LATEST_ALIAS = "latest"
+
+VERSION_PATTERN = re.compile(r"^\d+\.\d+\.\d+$")
+
+
+def is_version(ref: str) -> bool:
+    """Check whether a reference is an exact version rather than an alias"""
+    return bool(VERSION_PATTERN.match(ref))
+
+
+def version_key(version: str) -> Tuple[int, ...]:
+    """Sort key ordering versions numerically (1.10.0 after 1.9.0)"""
+    return tuple(int(part) for part in version.split("."))
+
+
+def pinned_image(docker_image_url: str, image_digest: Optional[str]) -> str:
+    """
+    Build the image reference a job runs, pinned to its digest when known.
+
+    Args:
+        docker_image_url: Image reference registered for the version
+        image_digest: "sha256:..." digest registered for the version
+
+    Returns:
+        "repository@digest", or the registered reference if there is no digest
+    """
+    if not image_digest:
+        return docker_image_url
+    repository = docker_image_url.partition("@")[0]
+    # Drop the tag; a colon after the last slash is a tag, not a registry port
+    name_start = repository.rfind("/") + 1
+    if ":" in repository[name_start:]:
+        repository = repository[: repository.rindex(":")]
+    return f"{repository}@{image_digest}"
@@ -0,0 +1,135 @@
+"""
+JSON Schema validation of job input against plugin schemas
+Validators are compiled once per plugin version and reused across requests
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from jsonschema import SchemaError
+from jsonschema.protocols import Validator
+from jsonschema.validators import validator_for
+
+logger = logging.getLogger(__name__)
+
+
+def compile_schema(schema: Dict[str, Any]) -> Optional[Validator]:
+    """
+    Build a validator for a JSON Schema.
+
+    Args:
+        schema: JSON Schema document
+
+    Returns:
+        Validator instance, or None if the schema itself is invalid
+    """
+    validator_cls = validator_for(schema)
+    try:
+        validator_cls.check_schema(schema)
+    except SchemaError as e:
+        logger.error(f"Ignoring invalid plugin schema: {e.message}")
+        return None
+    return validator_cls(schema)
+
+
+def schema_errors(
+    validator: Validator, instance: Any, loc_prefix: Tuple = ()
+) -> List[Dict[str, Any]]:
+    """
+    Collect every validation error, in FastAPI's error format.
+
+    Args:
+        validator: Compiled validator
+        instance: Value to validate
+        loc_prefix: Location prepended to each error path
+
+    Returns:
+        List of errors with `loc`, `msg` and `type`, sorted by location
+    """
+    errors = sorted(validator.iter_errors(instance), key=lambda e: list(e.path))
+    return [
+        {
+            "loc": [*loc_prefix, *error.absolute_path],
+            "msg": error.message,
+            "type": f"schema.{error.validator}",
+        }
+        for error in errors
+    ]
+
+
+class SchemaValidatorCache:
+    """Compiled validators keyed by (plugin name, version, schema kind)"""
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries: OrderedDict[Tuple[str, str, str], Tuple[dict, Any]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(
+        self, name: str, version: str, kind: str, schema: Optional[Dict[str, Any]]
+    ) -> Optional[Validator]:
+        """
+        Get the compiled validator for a plugin schema.
+
+        The schema is compared against the one the validator was compiled from
+        (by identity first, so cached plugin metadata costs nothing), which
+        keeps in-place schema edits from being missed.
+
+        Args:
+            name: Plugin name
+            version: Plugin version
+            kind: "input" or "output"
+            schema: The plugin's current schema
+
+        Returns:
+            Validator, or None if the plugin declares no (valid) schema
+        """
+        if not schema:
+            return None
+
+        key = (name, version, kind)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] is schema or entry[0] == schema):
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        validator = compile_schema(schema)
+        with self._lock:
+            self._entries[key] = (schema, validator)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return validator
+
+    def clear(self) -> None:
+        """Drop every compiled validator"""
+        with self._lock:
+            self._entries.clear()
+
+
+# Global instance
+schema_validator_cache = SchemaValidatorCache()
+
+
+def validate_job_input(plugin, input_data: Any) -> List[Dict[str, Any]]:
+    """
+    Validate job input against a plugin's input_schema.
+
+    Args:
+        plugin: Plugin metadata with name, version and input_schema
+        input_data: Submitted job input
+
+    Returns:
+        Validation errors located under body.input_data (empty if valid)
+    """
+    validator = schema_validator_cache.get(
+        plugin.name, plugin.version, "input", plugin.input_schema
+    )
+    if validator is None:
+        return []
+    return schema_errors(validator, input_data, loc_prefix=("body", "input_data"))
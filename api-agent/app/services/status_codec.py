@@ -0,0 +1,42 @@
+"""
+Wire decoding for status_queue messages
+Ray workers send msgpack (optionally zstd-compressed) or plain JSON
+"""
+
+import json
+from typing import Dict, Optional
+
+import msgpack
+import zstandard
+
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+ZSTD_CONTENT_ENCODING = "zstd"
+
+
+def decode_status_message(
+    body: bytes,
+    content_type: Optional[str] = None,
+    content_encoding: Optional[str] = None,
+) -> Dict:
+    """
+    Decode a status message published by a Ray worker.
+
+    Args:
+        body: Raw message body
+        content_type: AMQP content type (JSON when missing)
+        content_encoding: AMQP content encoding ("zstd" or None)
+
+    Returns:
+        Decoded status message
+
+    Raises:
+        ValueError: If the content encoding is not supported
+    """
+    if content_encoding == ZSTD_CONTENT_ENCODING:
+        body = zstandard.ZstdDecompressor().decompress(body)
+    elif content_encoding:
+        raise ValueError(f"Unsupported content encoding: {content_encoding}")
+
+    if content_type == MSGPACK_CONTENT_TYPE:
+        return msgpack.unpackb(body, raw=False)
+    return json.loads(body)
@@ -0,0 +1,152 @@
+"""
+Status ingester
+Applies status_queue updates from Ray workers to jobs and notifies SSE clients
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.models.job import Job as JobModel, JobStatus
+from app.services.job_events import JobEventHub, job_event_hub
+from app.services.job_stats import record_finished_job
+from app.services.mq_service import RabbitMQService
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = frozenset({JobStatus.COMPLETED, JobStatus.FAILED})
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse a worker ISO timestamp; naive values are UTC"""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def job_event_payload(job: JobModel) -> Dict:
+    """
+    Build the event payload sent to SSE clients for a job.
+
+    Args:
+        job: Job model instance
+
+    Returns:
+        JSON-serializable dict describing the job's current state
+    """
+    payload = {
+        "job_id": job.id,
+        "status": job.status.value,
+        "progress": job.progress,
+    }
+    if job.status in TERMINAL_STATUSES:
+        payload["result"] = job.result
+        payload["error_message"] = job.error_message
+    return payload
+
+
+def apply_status_update(db: Session, message: Dict) -> Optional[JobModel]:
+    """
+    Apply a status_queue message to its job.
+
+    Args:
+        db: Database session
+        message: Status message from a Ray worker
+
+    Returns:
+        Updated job, or None if the message was ignored
+    """
+    job = db.query(JobModel).filter(JobModel.id == message["job_id"]).first()
+    if job is None:
+        logger.warning(f"Status update for unknown job {message['job_id']}")
+        return None
+
+    if job.status in TERMINAL_STATUSES:
+        # Late or redelivered update for a finished job
+        return None
+
+    status = JobStatus(message["status"])
+    updated_at = _parse_timestamp(message.get("updated_at"))
+
+    job.status = status
+    if status == JobStatus.PROCESSING:
+        job.started_at = job.started_at or updated_at
+        if message.get("progress") is not None:
+            job.progress = message["progress"]
+    elif status in TERMINAL_STATUSES:
+        job.started_at = (
+            job.started_at or _parse_timestamp(message.get("started_at")) or updated_at
+        )
+        job.completed_at = updated_at
+        job.result = message.get("result")
+        job.error_message = message.get("error_message")
+        if message.get("steps") is not None:
+            # Per-step summaries of a pipeline job, when it asked for them
+            job.step_summaries = message["steps"]
+        record_finished_job(db, job)
+
+    db.commit()
+    return job
+
+
+class StatusIngester:
+    """Consumes status_queue on a background thread"""
+
+    def __init__(self, session_factory=SessionLocal, hub: JobEventHub = job_event_hub):
+        self.session_factory = session_factory
+        self.hub = hub
+        self._thread: Optional[threading.Thread] = None
+
+    def handle(self, message: Dict) -> None:
+        """
+        Apply one status message and notify subscribers.
+
+        Args:
+            message: Status message from a Ray worker
+        """
+        db = self.session_factory()
+        try:
+            job = apply_status_update(db, message)
+            if job is not None:
+                event_type = "progress" if message.get("progress") else "status"
+                self.hub.publish(job.id, event_type, job_event_payload(job))
+        finally:
+            db.close()
+
+    def run(self) -> None:
+        """Consume status updates forever, reconnecting on failure"""
+        while True:
+            mq = RabbitMQService()
+            try:
+                mq.consume_status_updates(self.handle)
+            except Exception as e:
+                logger.error(f"Status ingester disconnected: {e}")
+            finally:
+                try:
+                    mq.close()
+                except Exception:
+                    pass
+            time.sleep(settings.MQ_RECONNECT_SECONDS)
+
+    def start(self) -> None:
+        """Start the consumer thread if it is not already running"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(
+            target=self.run, name="status-ingester", daemon=True
+        )
+        self._thread.start()
+        logger.info("Status ingester started")
+
+
+# Global instance
+status_ingester = StatusIngester()
@@ -1,21 +1,41 @@
+import os
+
+# Tests drive status updates directly; don't consume from RabbitMQ
+os.environ.setdefault("STATUS_INGESTER_ENABLED", "false")
+os.environ.setdefault("PLUGIN_EVENT_LISTENER_ENABLED", "false")
+os.environ.setdefault("PLUGIN_SNAPSHOT_ON_STARTUP", "false")
+
+import httpx
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool
 
-from app.core.db import Base, get_db
+from app.core.auth_cache import api_key_cache, token_cache, user_cache
+from app.core.db import Base, get_async_db
+from app.core.rate_limit import login_rate_limiter
 from app.main import app
+from app.models.plugin import Plugin as PluginModel, PluginAlias
+from app.schemas.plugin import Plugin
+from app.services.plugin_cache import plugin_cache
+from app.services.plugin_registry import plugin_registry
+from app.services.plugin_versions import LATEST_ALIAS, is_version, version_key
+
+
+@pytest.fixture(scope="function")
+def database_path(tmp_path):
+    """SQLite file shared by the test session and the app's async engine"""
+    return tmp_path / "test.db"
 
 
 @pytest.fixture(scope="function")
-def db_session():
+def db_session(database_path):
     """Create a new database session for each test."""
-    # Use in-memory SQLite database for testing
     engine = create_engine(
-        "sqlite:///:memory:",
+        f"sqlite:///{database_path}",
         connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
     )
     TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -23,24 +43,108 @@ def db_session():
     Base.metadata.create_all(bind=engine)
 
     db = TestingSessionLocal()
+    # User IDs repeat across per-test databases
+    user_cache.clear()
+    token_cache.clear()
+    api_key_cache.clear()
     try:
         yield db
     finally:
         db.close()
-        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+
+class FakePluginRegistry:
+    """Serves plugin-registry's version and list endpoints from the test database"""
+
+    def __init__(self, db):
+        self.db = db
+        self.available = True
+        self.requests = []
+
+    def handle(self, request):
+        self.requests.append(request)
+        if not self.available:
+            raise httpx.ConnectError("registry down", request=request)
+        if request.url.path == "/api/v1/plugins":
+            return self.list(request)
+
+        _, _, _, _, name, _, ref = request.url.path.split("/")
+        query = self.db.query(PluginModel).filter(PluginModel.name == name)
+        if is_version(ref):
+            plugin = query.filter(PluginModel.version == ref).first()
+        elif ref == LATEST_ALIAS:
+            plugin = max(query, key=lambda p: version_key(p.version), default=None)
+        else:
+            alias = self.db.get(PluginAlias, (name, ref))
+            plugin = (
+                alias and query.filter(PluginModel.version == alias.version).first()
+            )
+
+        if plugin is None:
+            return httpx.Response(404, json={"detail": "Plugin not found"})
+        etag = f'"{plugin.id}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(
+            200,
+            json=Plugin.model_validate(plugin).model_dump(mode="json"),
+            headers={"ETag": etag},
+        )
+
+    def list(self, request):
+        after_id = int(request.url.params["after_id"])
+        limit = int(request.url.params["limit"])
+        plugins = (
+            self.db.query(PluginModel)
+            .filter(PluginModel.id > after_id)
+            .order_by(PluginModel.id)
+            .limit(limit)
+        )
+        items = [Plugin.model_validate(p).model_dump(mode="json") for p in plugins]
+        return httpx.Response(200, json={"total": len(items), "items": items})
+
+
+@pytest.fixture(scope="function")
+def fake_registry(db_session):
+    """Point the plugin registry client at a fake backed by the test database"""
+    registry = FakePluginRegistry(db_session)
+    original_client = plugin_registry.client
+    plugin_registry.client = httpx.Client(
+        transport=httpx.MockTransport(registry.handle)
+    )
+    # Cached plugins must not leak between per-test databases
+    plugin_cache.clear()
+    yield registry
+    plugin_registry.client = original_client
+    plugin_cache.clear()
 
 
 @pytest.fixture(scope="function")
-def client(db_session):
+def async_engine(database_path, db_session):
+    """Async engine the app's request handlers use during a test"""
+    # No pooling: aiosqlite connections must not outlive the client's event loop
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{database_path}", poolclass=NullPool
+    )
+    yield engine
+    engine.sync_engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def client(async_engine, fake_registry):
     """Create a test client with overridden database dependency."""
+    TestingAsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
 
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
 
-    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    # Every test client logs in from the same address
+    login_rate_limiter.clear()
 
     with TestClient(app) as test_client:
         yield test_client
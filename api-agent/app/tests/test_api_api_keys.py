@@ -0,0 +1,227 @@
+"""
+Tests for API key endpoints and API key authentication
+"""
+
+import pytest
+
+
+def test_create_api_key_returns_key_once(client, auth_headers):
+    """Test the key is shown on creation and never listed"""
+    response = client.post(
+        "/api/v1/api-keys",
+        json={"name": "ci", "scopes": ["submit", "read"]},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 201
+    data = response.json()
+    assert data["key"].startswith(f"ora_{data['prefix']}_")
+    assert data["scopes"] == ["read", "submit"]
+
+    listed = client.get("/api/v1/api-keys", headers=auth_headers).json()
+    assert [key["prefix"] for key in listed] == [data["prefix"]]
+    assert "key" not in listed[0]
+
+
+def test_api_key_stored_as_keyed_hash(client, auth_headers, db_session):
+    """Test only the prefix and an HMAC of the key are stored"""
+    from app.core.security import hash_api_key
+    from app.models.api_key import ApiKey
+
+    key = create_key(client, auth_headers, ["read"])
+
+    stored = db_session.query(ApiKey).one()
+    assert stored.key_hash == hash_api_key(key)
+    assert key not in (stored.prefix, stored.key_hash)
+
+
+def test_api_key_authenticates(client, auth_headers):
+    """Test an API key works as a bearer token"""
+    key = create_key(client, auth_headers, ["read"])
+
+    response = client.get("/api/v1/auth/me", headers=bearer(key))
+
+    assert response.status_code == 200
+    assert response.json()["email"] == "testuser@example.com"
+
+
+def test_read_only_key_cannot_submit(client, auth_headers):
+    """Test a read-only key is refused job submission"""
+    key = create_key(client, auth_headers, ["read"])
+
+    response = client.post(
+        "/api/v1/jobs", json={"plugin_name": "test-plugin"}, headers=bearer(key)
+    )
+
+    assert response.status_code == 403
+    assert client.get("/api/v1/jobs", headers=bearer(key)).status_code == 200
+
+
+def test_submit_only_key_cannot_read(client, auth_headers, test_plugin):
+    """Test a submit-only key can submit jobs but not read them"""
+    key = create_key(client, auth_headers, ["submit"])
+
+    response = client.post(
+        "/api/v1/jobs", json={"plugin_name": "test-plugin"}, headers=bearer(key)
+    )
+
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+    assert client.get(f"/api/v1/jobs/{job_id}", headers=bearer(key)).status_code == 403
+
+
+def test_api_key_cannot_manage_keys(client, auth_headers):
+    """Test a leaked key cannot be used to mint more keys"""
+    key = create_key(client, auth_headers, ["read", "submit"])
+
+    response = client.post(
+        "/api/v1/api-keys",
+        json={"name": "escalate", "scopes": ["read"]},
+        headers=bearer(key),
+    )
+
+    assert response.status_code == 403
+
+
+def test_api_key_cannot_read_dashboard_stats(client, auth_headers):
+    """Test keys cannot read the dashboard's data across all users"""
+    for scopes in (["submit"], ["read", "submit"]):
+        key = create_key(client, auth_headers, scopes)
+
+        response = client.get("/dashboard/api/stats", headers=bearer(key))
+
+        assert response.status_code == 403
+    assert client.get("/dashboard/api/stats", headers=auth_headers).status_code == 200
+
+
+def test_revoked_key_rejected_immediately(client, auth_headers):
+    """Test revocation takes effect despite the key cache"""
+    response = client.post(
+        "/api/v1/api-keys",
+        json={"name": "ci", "scopes": ["read"]},
+        headers=auth_headers,
+    )
+    created = response.json()
+    assert client.get("/api/v1/auth/me", headers=bearer(created["key"])).is_success
+
+    response = client.delete(f"/api/v1/api-keys/{created['id']}", headers=auth_headers)
+
+    assert response.status_code == 204
+    me = client.get("/api/v1/auth/me", headers=bearer(created["key"]))
+    assert me.status_code == 401
+
+
+def test_expired_key_rejected(client, auth_headers, db_session):
+    """Test keys stop working at expires_at"""
+    from datetime import timedelta
+
+    from app.core.db import utcnow
+    from app.models.api_key import ApiKey
+
+    key = create_key(client, auth_headers, ["read"])
+    db_session.query(ApiKey).one().expires_at = utcnow() - timedelta(seconds=1)
+    db_session.commit()
+
+    assert client.get("/api/v1/auth/me", headers=bearer(key)).status_code == 401
+
+
+def test_wrong_secret_rejected(client, auth_headers):
+    """Test a known prefix with the wrong secret is refused"""
+    key = create_key(client, auth_headers, ["read"])
+    forged = key[: key.rindex("_") + 1] + "x" * 43
+
+    assert client.get("/api/v1/auth/me", headers=bearer(forged)).status_code == 401
+
+
+def test_api_key_cached_after_first_use(client, auth_headers, async_engine):
+    """Test repeat requests with a key do not query api_keys"""
+    from sqlalchemy import event
+
+    key = create_key(client, auth_headers, ["read"])
+    client.get("/api/v1/auth/me", headers=bearer(key))
+    statements = []
+    engine = async_engine.sync_engine
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        response = client.get("/api/v1/auth/me", headers=bearer(key))
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert response.status_code == 200
+    assert not [s for s in statements if "api_keys" in s]
+
+
+def test_cannot_revoke_other_users_key(client, auth_headers, db_session):
+    """Test keys of other users are not found"""
+    from app.models.api_key import ApiKey
+    from app.models.user import User
+
+    other = User(email="other@example.com", hashed_password="x", is_active=True)
+    db_session.add(other)
+    db_session.commit()
+    api_key = ApiKey(
+        user_id=other.id, name="other", prefix="abc", key_hash="0", scopes=["read"]
+    )
+    db_session.add(api_key)
+    db_session.commit()
+
+    response = client.delete(f"/api/v1/api-keys/{api_key.id}", headers=auth_headers)
+
+    assert response.status_code == 404
+
+
+def create_key(client, auth_headers, scopes):
+    response = client.post(
+        "/api/v1/api-keys",
+        json={"name": "test", "scopes": scopes},
+        headers=auth_headers,
+    )
+    return response.json()["key"]
+
+
+def bearer(key):
+    return {"Authorization": f"Bearer {key}"}
+
+
+@pytest.fixture
+def test_user(db_session):
+    """Create a test user"""
+    from app.core.security import get_password_hash
+    from app.models.user import User
+
+    user = User(
+        email="testuser@example.com",
+        hashed_password=get_password_hash("password123"),
+        full_name="Test User",
+        is_active=True,
+    )
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+    return user
+
+
+@pytest.fixture
+def test_plugin(db_session):
+    """Create a test plugin"""
+    from app.models.plugin import Plugin
+
+    plugin = Plugin(
+        name="test-plugin",
+        version="1.0.0",
+        docker_image_url="registry.example.com/test:1.0.0",
+    )
+    db_session.add(plugin)
+    db_session.commit()
+    return plugin
+
+
+@pytest.fixture
+def auth_headers(client, test_user):
+    """Get authentication headers with valid token"""
+    response = client.post(
+        "/api/v1/auth/token",
+        data={"username": "testuser@example.com", "password": "password123"},
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
@@ -3,6 +3,11 @@ TDD RED Phase: Tests for job management API endpoints
 These tests will fail until we implement the job endpoints
 """
 
+import csv
+import io
+import json
+from datetime import date, datetime
+
 import pytest
 
 
@@ -27,6 +32,191 @@ def test_create_job_success(client, test_user, test_plugin, auth_headers):
     assert "created_at" in data
 
 
+def test_create_job_with_priority(client, test_user, test_plugin, auth_headers):
+    """Test job priority is stored and used as the message priority"""
+    from unittest.mock import patch
+
+    with patch("app.api.v1.jobs.get_mq_service") as mock_get_mq:
+        response = client.post(
+            "/api/v1/jobs",
+            headers=auth_headers,
+            json={"plugin_name": "test-plugin", "input_data": {}, "priority": 7},
+        )
+
+    assert response.status_code == 202
+    assert response.json()["priority"] == 7
+    published = mock_get_mq.return_value.publish_job.call_args[0][0]
+    assert published["priority"] == 7
+
+
+def test_create_job_pins_resolved_version(
+    client, test_user, versioned_plugin, auth_headers
+):
+    """Test an alias is resolved and the job pinned to its version and digest"""
+    from unittest.mock import patch
+
+    with patch("app.api.v1.jobs.get_mq_service") as mock_get_mq:
+        response = client.post(
+            "/api/v1/jobs",
+            headers=auth_headers,
+            json={
+                "plugin_name": "versioned-plugin",
+                "plugin_version": "stable",
+                "input_data": {},
+            },
+        )
+
+    assert response.status_code == 202
+    data = response.json()
+    assert data["plugin_version"] == "1.0.0"
+    assert data["docker_image"] == f"registry.example.com/versioned@{DIGEST}"
+    published = mock_get_mq.return_value.publish_job.call_args[0][0]
+    assert published["plugin_version"] == "1.0.0"
+    assert published["docker_image_url"] == f"registry.example.com/versioned@{DIGEST}"
+
+
+def test_create_job_defaults_to_latest_version(
+    client, test_user, versioned_plugin, auth_headers
+):
+    """Test jobs without a version run the highest registered version"""
+    response = client.post(
+        "/api/v1/jobs",
+        headers=auth_headers,
+        json={"plugin_name": "versioned-plugin", "input_data": {}},
+    )
+
+    assert response.status_code == 202
+    assert response.json()["plugin_version"] == "1.1.0"
+    assert response.json()["docker_image"] == "registry.example.com/versioned:1.1.0"
+
+
+def test_create_job_unknown_version(client, versioned_plugin, auth_headers):
+    """Test jobs for an unregistered version are rejected"""
+    response = client.post(
+        "/api/v1/jobs",
+        headers=auth_headers,
+        json={
+            "plugin_name": "versioned-plugin",
+            "plugin_version": "9.9.9",
+            "input_data": {},
+        },
+    )
+
+    assert response.status_code == 404
+
+
+def test_create_job_resolves_plugin_off_event_loop(
+    client, test_user, test_plugin, auth_headers
+):
+    """Test the blocking registry lookup does not run on the event loop"""
+    import asyncio
+    from unittest.mock import patch
+
+    from app.services.plugin_registry import get_plugin
+
+    on_loop = []
+
+    def lookup(name, ref=None):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return get_plugin(name, ref)
+
+    with patch("app.api.v1.jobs.get_plugin", side_effect=lookup):
+        response = client.post(
+            "/api/v1/jobs",
+            headers=auth_headers,
+            json={"plugin_name": "test-plugin", "input_data": {}},
+        )
+
+    assert response.status_code == 202
+    assert on_loop == [False]
+
+
+def test_create_job_publishes_on_publish_thread(
+    client, test_user, test_plugin, auth_headers
+):
+    """Test the blocking publish runs on the dedicated publisher thread"""
+    import threading
+    from unittest.mock import patch
+
+    threads = []
+
+    with patch("app.api.v1.jobs.get_mq_service") as mock_get_mq:
+        mock_get_mq.return_value.publish_job.side_effect = (
+            lambda job_data: threads.append(threading.current_thread().name)
+        )
+        response = client.post(
+            "/api/v1/jobs",
+            headers=auth_headers,
+            json={"plugin_name": "test-plugin", "input_data": {}},
+        )
+
+    assert response.status_code == 202
+    assert len(threads) == 1
+    assert threads[0].startswith("mq-publish")
+
+
+def test_create_job_priority_out_of_range(client, auth_headers):
+    """Test job priority above the queue maximum is rejected"""
+    response = client.post(
+        "/api/v1/jobs",
+        headers=auth_headers,
+        json={"plugin_name": "test-plugin", "input_data": {}, "priority": 42},
+    )
+
+    assert response.status_code == 422
+
+
+def test_create_job_input_schema_violation(
+    client, test_user, schema_plugin, auth_headers
+):
+    """Test input not matching the plugin's input_schema is rejected with paths"""
+    response = client.post(
+        "/api/v1/jobs",
+        headers=auth_headers,
+        json={
+            "plugin_name": "schema-plugin",
+            "input_data": {"features": [1.0, "two"], "model_params": 3},
+        },
+    )
+
+    assert response.status_code == 422
+    errors = response.json()["detail"]
+    assert [e["loc"] for e in errors] == [
+        ["body", "input_data", "features", 1],
+        ["body", "input_data", "model_params"],
+    ]
+    assert errors[0]["type"] == "schema.type"
+
+
+def test_create_job_input_schema_missing_field(
+    client, test_user, schema_plugin, auth_headers
+):
+    """Test missing required input fields are reported"""
+    response = client.post(
+        "/api/v1/jobs",
+        headers=auth_headers,
+        json={"plugin_name": "schema-plugin", "input_data": {}},
+    )
+
+    assert response.status_code == 422
+    assert "'features' is a required property" in response.json()["detail"][0]["msg"]
+
+
+def test_create_job_input_schema_valid(client, test_user, schema_plugin, auth_headers):
+    """Test input matching the plugin's input_schema is accepted"""
+    response = client.post(
+        "/api/v1/jobs",
+        headers=auth_headers,
+        json={"plugin_name": "schema-plugin", "input_data": {"features": [1.0]}},
+    )
+
+    assert response.status_code == 202
+
+
 def test_create_job_requires_auth(client):
     """Test job creation requires authentication"""
     response = client.post(
@@ -69,6 +259,106 @@ def test_create_job_invalid_plugin_name(client, auth_headers):
     assert response.status_code == 422  # Validation error
 
 
+def test_create_pipeline_job(
+    client, test_user, test_plugin, versioned_plugin, auth_headers
+):
+    """Test a pipeline job is pinned per step and published as one message"""
+    from unittest.mock import patch
+
+    with patch("app.api.v1.jobs.get_mq_service") as mock_get_mq:
+        response = client.post(
+            "/api/v1/jobs/pipelines",
+            headers=auth_headers,
+            json={
+                "steps": [
+                    {
+                        "name": "classify",
+                        "plugin_name": "test-plugin",
+                        "input_data": {"model_params": {"threshold": 0.5}},
+                        "inputs": {"features": "extract.features"},
+                    },
+                    {
+                        "name": "extract",
+                        "plugin_name": "versioned-plugin",
+                        "plugin_version": "stable",
+                        "input_data": {"data": [1, 2, 3]},
+                    },
+                ],
+                "step_summaries": True,
+            },
+        )
+
+    assert response.status_code == 202
+    data = response.json()
+    # Listed under the final step, whose output is the result
+    assert data["plugin_name"] == "test-plugin"
+    assert data["docker_image"] == "registry.example.com/test:1.0.0"
+    assert data["input_data"] is None
+    steps = {step["name"]: step for step in data["pipeline"]["steps"]}
+    assert steps["extract"]["plugin_version"] == "1.0.0"
+    assert (
+        steps["extract"]["docker_image_url"]
+        == f"registry.example.com/versioned@{DIGEST}"
+    )
+    assert steps["classify"]["inputs"] == {"features": "extract.features"}
+    assert data["pipeline"]["step_summaries"] is True
+
+    published = mock_get_mq.return_value.publish_job.call_args[0][0]
+    assert published["plugin_name"] == "test-plugin"
+    assert published["pipeline"] == data["pipeline"]
+
+
+@pytest.mark.parametrize(
+    "steps",
+    [
+        # Cycle
+        [
+            {"name": "a", "plugin_name": "test-plugin", "inputs": {"x": "b"}},
+            {"name": "b", "plugin_name": "test-plugin", "inputs": {"x": "a"}},
+        ],
+        # Unknown upstream step
+        [{"name": "a", "plugin_name": "test-plugin", "inputs": {"x": "missing.y"}}],
+        # Two final steps
+        [
+            {"name": "a", "plugin_name": "test-plugin"},
+            {"name": "b", "plugin_name": "test-plugin"},
+        ],
+        # Duplicate name
+        [
+            {"name": "a", "plugin_name": "test-plugin"},
+            {"name": "a", "plugin_name": "test-plugin", "depends_on": ["a"]},
+        ],
+    ],
+)
+def test_create_pipeline_job_invalid_graph(client, test_plugin, auth_headers, steps):
+    """Test pipelines that do not form a DAG with one final step are rejected"""
+    response = client.post(
+        "/api/v1/jobs/pipelines", headers=auth_headers, json={"steps": steps}
+    )
+
+    assert response.status_code == 422
+
+
+def test_create_pipeline_job_plugin_not_found(client, test_plugin, auth_headers):
+    """Test a pipeline with an unregistered step plugin is rejected"""
+    response = client.post(
+        "/api/v1/jobs/pipelines",
+        headers=auth_headers,
+        json={
+            "steps": [
+                {"name": "extract", "plugin_name": "missing-plugin"},
+                {
+                    "name": "classify",
+                    "plugin_name": "test-plugin",
+                    "inputs": {"x": "extract"},
+                },
+            ]
+        },
+    )
+
+    assert response.status_code == 404
+
+
 def test_list_jobs(client, test_user, test_plugin, auth_headers, db_session):
     """Test listing jobs for current user"""
     from app.models.job import Job, JobStatus
@@ -138,6 +428,182 @@ def test_list_jobs_pagination(client, test_user, test_plugin, auth_headers, db_s
     assert len(data["items"]) <= 2
 
 
+def test_list_jobs_with_result_filter(client, test_user, auth_headers, db_session):
+    """Test listing jobs filtered on result fields"""
+    from app.models.job import Job, JobStatus
+
+    for prediction, confidence in [
+        ("class_A", 0.95),
+        ("class_A", 0.4),
+        ("class_B", 0.9),
+    ]:
+        db_session.add(
+            Job(
+                plugin_name="test-plugin",
+                status=JobStatus.COMPLETED,
+                owner_id=test_user.id,
+                result={"prediction": prediction, "confidence": confidence},
+            )
+        )
+    db_session.add(
+        Job(plugin_name="test-plugin", status=JobStatus.QUEUED, owner_id=test_user.id)
+    )
+    db_session.commit()
+
+    response = client.get(
+        "/api/v1/jobs",
+        headers=auth_headers,
+        params=[
+            ("filter", "result.prediction=class_A"),
+            ("filter", "result.confidence>=0.9"),
+        ],
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 1
+    assert data["items"][0]["result"] == {"prediction": "class_A", "confidence": 0.95}
+
+    response = client.get(
+        "/api/v1/jobs?filter=result.prediction!=class_A", headers=auth_headers
+    )
+    assert response.json()["total"] == 2
+
+
+def test_list_jobs_invalid_filter(client, auth_headers):
+    """Test a malformed filter is rejected"""
+    response = client.get(
+        "/api/v1/jobs?filter=result.confidence>high", headers=auth_headers
+    )
+
+    assert response.status_code == 400
+
+
+def test_list_jobs_invalid_status(client, auth_headers):
+    """Test an unknown status is rejected"""
+    response = client.get("/api/v1/jobs?status=paused", headers=auth_headers)
+
+    assert response.status_code == 400
+
+
+def test_list_jobs_matches_job_schema(client, test_user, auth_headers, db_session):
+    """Test the fast list serialization matches the Job schema's output"""
+    from app.models.job import Job as JobModel, JobStatus
+    from app.schemas.job import Job
+
+    job = JobModel(
+        plugin_name="test-plugin",
+        plugin_version="1.0.0",
+        status=JobStatus.COMPLETED,
+        owner_id=test_user.id,
+        input_data={"features": [1.0, 2.5]},
+        result={"prediction": "class_A", "scores": {"a": 0.9}},
+        started_at=datetime(2024, 1, 1, 10, 0, 0, 123456),
+    )
+    db_session.add(job)
+    db_session.commit()
+    db_session.refresh(job)
+
+    response = client.get("/api/v1/jobs", headers=auth_headers)
+
+    assert response.json()["items"] == [Job.model_validate(job).model_dump(mode="json")]
+
+
+def test_list_jobs_field_projection(client, test_user, auth_headers, db_session):
+    """Test only the requested fields are returned"""
+    from app.models.job import Job, JobStatus
+
+    db_session.add(
+        Job(
+            plugin_name="test-plugin",
+            status=JobStatus.COMPLETED,
+            owner_id=test_user.id,
+            result={"blob": "x" * 1000},
+        )
+    )
+    db_session.commit()
+
+    response = client.get("/api/v1/jobs?fields=id,status", headers=auth_headers)
+
+    assert response.status_code == 200
+    (item,) = response.json()["items"]
+    assert list(item) == ["id", "status"]
+    assert item["status"] == "completed"
+
+
+def test_list_jobs_unknown_field(client, auth_headers):
+    """Test projecting a field that is not part of a job is rejected"""
+    response = client.get(
+        "/api/v1/jobs?fields=id,hashed_password", headers=auth_headers
+    )
+
+    assert response.status_code == 400
+    assert "hashed_password" in response.json()["detail"]
+
+
+def test_export_jobs_ndjson(client, test_user, auth_headers, db_session):
+    """Test jobs are exported as NDJSON with the list filters applied"""
+    from app.models.job import Job, JobStatus
+
+    for status in (JobStatus.COMPLETED, JobStatus.COMPLETED, JobStatus.FAILED):
+        db_session.add(
+            Job(
+                plugin_name="test-plugin",
+                status=status,
+                owner_id=test_user.id,
+                result={"prediction": "class_A"},
+            )
+        )
+    db_session.commit()
+
+    response = client.get(
+        "/api/v1/jobs/export?status=completed&filter=result.prediction=class_A",
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 2
+    assert {row["status"] for row in rows} == {"completed"}
+    assert rows[0]["result"] == {"prediction": "class_A"}
+
+
+def test_export_jobs_csv_in_batches(
+    client, test_user, auth_headers, db_session, monkeypatch
+):
+    """Test CSV export streams every row across cursor batches"""
+    from app.models.job import Job, JobStatus
+
+    monkeypatch.setattr("app.services.job_export.EXPORT_BATCH_SIZE", 2)
+    for i in range(5):
+        db_session.add(
+            Job(
+                plugin_name="test-plugin",
+                status=JobStatus.QUEUED,
+                owner_id=test_user.id,
+                input_data={"n": i},
+            )
+        )
+    db_session.commit()
+
+    response = client.get("/api/v1/jobs/export?format=csv", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 5
+    assert sorted(json.loads(row["input_data"])["n"] for row in rows) == list(range(5))
+    assert rows[0]["status"] == "queued"
+
+
+def test_export_jobs_invalid_format(client, auth_headers):
+    """Test an unknown export format is rejected"""
+    response = client.get("/api/v1/jobs/export?format=xml", headers=auth_headers)
+
+    assert response.status_code == 422
+
+
 def test_get_job_by_id(client, test_user, test_plugin, auth_headers, db_session):
     """Test getting specific job by ID"""
     from app.models.job import Job, JobStatus
@@ -162,6 +628,140 @@ def test_get_job_by_id(client, test_user, test_plugin, auth_headers, db_session)
     assert data["result"] == {"prediction": "class_A"}
 
 
+def test_get_job_conditional_request(client, test_user, auth_headers, db_session):
+    """Test unchanged jobs are answered with 304 and changed ones re-sent"""
+    from app.models.job import Job, JobStatus
+    from app.services.status_ingester import apply_status_update
+
+    job = Job(plugin_name="test-plugin", status=JobStatus.QUEUED, owner_id=test_user.id)
+    db_session.add(job)
+    db_session.commit()
+    db_session.refresh(job)
+
+    response = client.get(f"/api/v1/jobs/{job.id}", headers=auth_headers)
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    response = client.get(
+        f"/api/v1/jobs/{job.id}", headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+    apply_status_update(db_session, {"job_id": job.id, "status": "processing"})
+
+    response = client.get(
+        f"/api/v1/jobs/{job.id}", headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["status"] == "processing"
+
+
+def test_get_job_conditional_request_checks_owner(
+    client, test_plugin, auth_headers, db_session
+):
+    """Test a matching ETag does not bypass the ownership check"""
+    from app.core.security import get_password_hash
+    from app.models.job import Job, JobStatus
+    from app.models.user import User
+
+    other_user = User(
+        email="other@example.com", hashed_password=get_password_hash("password")
+    )
+    db_session.add(other_user)
+    db_session.commit()
+    job = Job(
+        plugin_name="test-plugin", status=JobStatus.QUEUED, owner_id=other_user.id
+    )
+    db_session.add(job)
+    db_session.commit()
+
+    response = client.get(
+        f"/api/v1/jobs/{job.id}", headers={**auth_headers, "If-None-Match": "*"}
+    )
+
+    assert response.status_code == 403
+
+
+def test_get_job_projection(client, test_user, auth_headers, db_session, async_engine):
+    """Test include/exclude leave documents out of the query and response"""
+    from sqlalchemy import event
+
+    from app.models.job import Job, JobStatus
+
+    job = Job(
+        plugin_name="test-plugin",
+        status=JobStatus.COMPLETED,
+        owner_id=test_user.id,
+        input_data={"blob": "x" * 1000},
+        result={"prediction": "class_A"},
+        progress={"percent": 100.0},
+    )
+    db_session.add(job)
+    db_session.commit()
+
+    statements = []
+    engine = async_engine.sync_engine
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        response = client.get(
+            f"/api/v1/jobs/{job.id}?include=result", headers=auth_headers
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["result"] == {"prediction": "class_A"}
+    assert "input_data" not in data and "progress" not in data
+    assert data["status"] == "completed"
+    assert not [s for s in statements if "jobs.input_data" in s]
+
+    response = client.get(
+        f"/api/v1/jobs/{job.id}?exclude=input_data,error_message", headers=auth_headers
+    )
+    data = response.json()
+    assert "input_data" not in data and "error_message" not in data
+    assert data["progress"] == {"percent": 100.0}
+
+
+def test_get_job_projection_has_own_etag(client, test_user, auth_headers, db_session):
+    """Test a projection does not revalidate against the full representation"""
+    from app.models.job import Job, JobStatus
+
+    job = Job(plugin_name="test-plugin", status=JobStatus.QUEUED, owner_id=test_user.id)
+    db_session.add(job)
+    db_session.commit()
+
+    full = client.get(f"/api/v1/jobs/{job.id}", headers=auth_headers)
+    projected = client.get(
+        f"/api/v1/jobs/{job.id}?exclude=input_data", headers=auth_headers
+    )
+    assert full.headers["ETag"] != projected.headers["ETag"]
+
+    response = client.get(
+        f"/api/v1/jobs/{job.id}?exclude=input_data",
+        headers={**auth_headers, "If-None-Match": projected.headers["ETag"]},
+    )
+    assert response.status_code == 304
+
+
+def test_get_job_invalid_projection(client, test_user, auth_headers, db_session):
+    """Test unknown or non-document fields are rejected"""
+    from app.models.job import Job, JobStatus
+
+    job = Job(plugin_name="test-plugin", status=JobStatus.QUEUED, owner_id=test_user.id)
+    db_session.add(job)
+    db_session.commit()
+
+    for query in ("include=status", "exclude=id", "exclude=secret"):
+        response = client.get(f"/api/v1/jobs/{job.id}?{query}", headers=auth_headers)
+        assert response.status_code == 400
+
+
 def test_get_job_not_found(client, auth_headers):
     """Test getting non-existent job returns 404"""
     response = client.get("/api/v1/jobs/99999", headers=auth_headers)
@@ -198,6 +798,166 @@ def test_get_job_not_owner(client, test_plugin, auth_headers, db_session):
     assert response.status_code == 403  # Forbidden
 
 
+def test_stream_job_events_finished_job(
+    client, test_user, test_plugin, auth_headers, db_session
+):
+    """Test the event stream of a finished job sends its final state and ends"""
+    from app.models.job import Job, JobStatus
+
+    job = Job(
+        plugin_name="test-plugin",
+        status=JobStatus.COMPLETED,
+        result={"prediction": "class_A"},
+        progress={"percent": 100.0, "message": "Done", "partial": None},
+        owner_id=test_user.id,
+    )
+    db_session.add(job)
+    db_session.commit()
+    db_session.refresh(job)
+
+    response = client.get(f"/api/v1/jobs/{job.id}/events", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.startswith("event: status\ndata: ")
+    assert '"result": {"prediction": "class_A"}' in response.text
+    assert response.text.count("event: ") == 1
+
+
+def test_stream_job_events_not_found(client, auth_headers):
+    """Test streaming events of a non-existent job returns 404"""
+    response = client.get("/api/v1/jobs/99999/events", headers=auth_headers)
+
+    assert response.status_code == 404
+
+
+def test_job_stats(client, test_user, auth_headers, db_session):
+    """Test statistics are served from the rollup of the user's finished jobs"""
+    from app.models.job import Job, JobStatus
+    from app.services.status_ingester import apply_status_update
+
+    for status, seconds in [("completed", 2), ("completed", 4), ("failed", 1)]:
+        job = Job(
+            plugin_name="test-plugin",
+            status=JobStatus.QUEUED,
+            owner_id=test_user.id,
+            created_at=datetime(2024, 1, 1, 10, 0, 0),
+        )
+        db_session.add(job)
+        db_session.commit()
+        apply_status_update(
+            db_session,
+            {
+                "job_id": job.id,
+                "status": status,
+                "started_at": "2024-01-01T10:00:00",
+                "updated_at": f"2024-01-01T10:00:0{seconds}",
+            },
+        )
+
+    response = client.get("/api/v1/jobs/stats", headers=auth_headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["interval"] == "total"
+    completed, failed = data["groups"]
+    assert (completed["status"], completed["count"]) == ("completed", 2)
+    assert completed["run_seconds"]["mean"] == pytest.approx(3.0)
+    assert completed["wait_seconds"]["p99"] == pytest.approx(0.01)
+    assert (failed["status"], failed["count"]) == ("failed", 1)
+
+    response = client.get(
+        "/api/v1/jobs/stats?interval=hour&since=2024-01-01T11:00:00",
+        headers=auth_headers,
+    )
+    assert response.json()["groups"] == []
+
+    response = client.get(
+        "/api/v1/jobs/stats?interval=hour&until=2024-01-01T10:00:00",
+        headers=auth_headers,
+    )
+    assert response.json()["groups"] == []
+
+    response = client.get(
+        "/api/v1/jobs/stats?interval=hour&until=2024-01-01T10:00:01",
+        headers=auth_headers,
+    )
+    assert [group["count"] for group in response.json()["groups"]] == [2, 1]
+
+
+def test_list_job_archives(client, auth_headers, job_archive):
+    """Test archived months are listed oldest first"""
+    job_archive.write(date(2024, 2, 1), [])
+    job_archive.write(date(2024, 1, 1), [])
+
+    response = client.get("/api/v1/jobs/archives", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json() == ["2024-01", "2024-02"]
+
+
+def test_list_archived_jobs(client, test_user, auth_headers, job_archive):
+    """Test only the current user's archived jobs are returned, paginated"""
+    rows = [archived_job(i, owner_id=test_user.id - 1) for i in range(1, 3)] + [
+        archived_job(i, owner_id=test_user.id) for i in range(3, 8)
+    ]
+    job_archive.write(date(2024, 1, 1), rows)
+
+    response = client.get(
+        "/api/v1/jobs/archives/2024-01?skip=1&limit=2", headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 5
+    assert [job["id"] for job in data["items"]] == [4, 5]
+    assert data["items"][0]["status"] == "completed"
+
+
+def test_list_archived_jobs_unknown_month(client, auth_headers, job_archive):
+    """Test a month that is not archived returns 404"""
+    response = client.get("/api/v1/jobs/archives/2024-01", headers=auth_headers)
+
+    assert response.status_code == 404
+
+
+def test_list_archived_jobs_invalid_month(client, auth_headers, job_archive):
+    """Test a malformed month is rejected"""
+    response = client.get("/api/v1/jobs/archives/2024-1", headers=auth_headers)
+
+    assert response.status_code == 422
+
+
+def archived_job(job_id, owner_id):
+    return {
+        "id": job_id,
+        "plugin_name": "test-plugin",
+        "plugin_version": "1.0.0",
+        "docker_image": "test/plugin:1.0.0",
+        "status": "completed",
+        "priority": 0,
+        "input_data": {},
+        "result": {"ok": True},
+        "error_message": None,
+        "progress": None,
+        "owner_id": owner_id,
+        "created_at": "2024-01-15 10:00:00+00:00",
+        "started_at": None,
+        "completed_at": None,
+        "updated_at": None,
+    }
+
+
+@pytest.fixture
+def job_archive(client, tmp_path):
+    from app.main import app
+    from app.services.job_archive import JobArchive, get_job_archive
+
+    archive = JobArchive(str(tmp_path / "archive"))
+    app.dependency_overrides[get_job_archive] = lambda: archive
+    return archive
+
+
 @pytest.fixture
 def test_user(db_session):
     """Create a test user"""
@@ -233,6 +993,59 @@ def test_plugin(db_session):
     return plugin
 
 
+DIGEST = "sha256:" + "a" * 64
+
+
+@pytest.fixture
+def versioned_plugin(db_session):
+    """Create a plugin with two versions and a "stable" alias"""
+    from app.models.plugin import Plugin, PluginAlias
+
+    db_session.add(
+        Plugin(
+            name="versioned-plugin",
+            version="1.0.0",
+            docker_image_url="registry.example.com/versioned:1.0.0",
+            image_digest=DIGEST,
+        )
+    )
+    db_session.add(
+        Plugin(
+            name="versioned-plugin",
+            version="1.1.0",
+            docker_image_url="registry.example.com/versioned:1.1.0",
+        )
+    )
+    db_session.add(
+        PluginAlias(name="versioned-plugin", alias="stable", version="1.0.0")
+    )
+    db_session.commit()
+
+
+@pytest.fixture
+def schema_plugin(db_session):
+    """Create a plugin declaring an input_schema"""
+    from app.models.plugin import Plugin
+
+    plugin = Plugin(
+        name="schema-plugin",
+        version="1.0.0",
+        docker_image_url="registry.example.com/schema:1.0.0",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "features": {"type": "array", "items": {"type": "number"}},
+                "model_params": {"type": "object"},
+            },
+            "required": ["features"],
+        },
+    )
+    db_session.add(plugin)
+    db_session.commit()
+    db_session.refresh(plugin)
+    return plugin
+
+
 @pytest.fixture
 def auth_headers(client, test_user):
     """Get authentication headers with valid token"""
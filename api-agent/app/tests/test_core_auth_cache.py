@@ -0,0 +1,131 @@
+"""
+Tests for the token and user authentication caches
+"""
+
+import pytest
+
+from app.core.auth_cache import TokenCache, TTLCache
+
+
+def test_token_cache_returns_payload_until_exp(clock):
+    """Test cached tokens are served until their exp claim"""
+    cache = TokenCache(max_size=10, clock=clock)
+    cache.put("token", {"sub": "1", "exp": clock.now + 60})
+
+    assert cache.get("token") == {"sub": "1", "exp": clock.now + 60}
+
+    clock.now += 60
+    assert cache.get("token") is None
+
+
+def test_token_cache_skips_tokens_without_exp(clock):
+    """Test tokens that never expire are always re-verified"""
+    cache = TokenCache(max_size=10, clock=clock)
+    cache.put("token", {"sub": "1"})
+
+    assert cache.get("token") is None
+
+
+def test_token_cache_does_not_keep_raw_tokens(clock):
+    """Test entries are keyed by a hash of the token"""
+    cache = TokenCache(max_size=10, clock=clock)
+    cache.put("secret-token", {"sub": "1", "exp": clock.now + 60})
+
+    assert all(b"secret-token" not in key for key in cache._entries)
+
+
+def test_token_cache_evicts_least_recently_used(clock):
+    """Test the token cache stays within its size bound"""
+    cache = TokenCache(max_size=2, clock=clock)
+    for token in ("a", "b"):
+        cache.put(token, {"sub": token, "exp": clock.now + 60})
+    cache.get("a")
+    cache.put("c", {"sub": "c", "exp": clock.now + 60})
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+
+
+def test_user_cache_expires_after_ttl(clock):
+    """Test users are reloaded once the TTL passes"""
+    cache = TTLCache(ttl_seconds=30, max_size=10, clock=clock)
+    cache.put(1, "user")
+
+    clock.now += 29
+    assert cache.get(1) == "user"
+    clock.now += 1
+    assert cache.get(1) is None
+
+
+def test_user_invalidated_on_update(db_session):
+    """Test updating a user row drops it from the global user cache"""
+    from app.core.auth_cache import user_cache
+    from app.models.user import User
+
+    user = User(email="cached@example.com", hashed_password="x", is_active=True)
+    db_session.add(user)
+    db_session.commit()
+    user_cache.put(user.id, "cached user")
+
+    user.is_active = False
+    db_session.commit()
+
+    assert user_cache.get(user.id) is None
+
+
+def test_authenticated_reads_skip_user_query(client, auth_headers, async_engine):
+    """Test steady-state authenticated requests do not query the users table"""
+    from sqlalchemy import event
+
+    client.get("/api/v1/auth/me", headers=auth_headers)
+    statements = []
+    engine = async_engine.sync_engine
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        response = client.get("/api/v1/auth/me", headers=auth_headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert response.status_code == 200
+    assert response.json()["email"] == "cached@example.com"
+    assert not [s for s in statements if "users" in s]
+
+
+def test_deactivated_user_rejected_immediately(client, auth_headers, db_session):
+    """Test deactivation takes effect without waiting for the cache TTL"""
+    from app.models.user import User
+
+    assert client.get("/api/v1/auth/me", headers=auth_headers).status_code == 200
+
+    user = db_session.query(User).filter(User.email == "cached@example.com").one()
+    user.is_active = False
+    db_session.commit()
+
+    response = client.get("/api/v1/auth/me", headers=auth_headers)
+    assert response.status_code == 400
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def auth_headers(db_session):
+    from app.core.security import create_access_token
+    from app.models.user import User
+
+    user = User(email="cached@example.com", hashed_password="x", is_active=True)
+    db_session.add(user)
+    db_session.commit()
+    token = create_access_token({"sub": str(user.id)})
+    return {"Authorization": f"Bearer {token}"}
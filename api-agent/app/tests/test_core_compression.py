@@ -0,0 +1,154 @@
+"""
+Tests for the response compression middleware
+"""
+
+import pytest
+import zstandard
+from fastapi import FastAPI, Header
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, accepted_encoding
+from app.core.http_cache import etag_matches, not_modified
+
+LARGE = "x" * 5000
+ETAG = '"abc"'
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("gzip, deflate, br, zstd", "zstd"),
+        ("gzip", "gzip"),
+        ("zstd;q=0, gzip;q=0.5", "gzip"),
+        ("*", "zstd"),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_accepted_encoding(header, expected):
+    """Test zstd is preferred and q=0 refuses a coding"""
+    assert accepted_encoding(header) == expected
+
+
+def test_large_response_compressed_with_zstd(client):
+    """Test bodies over the threshold are zstd-compressed"""
+    response = client.get("/large", headers={"Accept-Encoding": "zstd"})
+
+    assert response.headers["Content-Encoding"] == "zstd"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert (
+        zstandard.ZstdDecompressor().decompressobj().decompress(response.content)
+        == LARGE.encode()
+    )
+
+
+def test_large_response_compressed_with_gzip(client):
+    """Test gzip is used when zstd is not accepted"""
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    # httpx decodes gzip itself
+    assert response.text == LARGE
+
+
+def test_small_response_not_compressed(client):
+    """Test bodies under the threshold are sent as-is"""
+    response = client.get("/small", headers={"Accept-Encoding": "zstd"})
+
+    assert "Content-Encoding" not in response.headers
+    assert response.text == "small"
+
+
+def test_streaming_response_compressed_per_chunk(client):
+    """Test each streamed chunk is flushed as a decodable block"""
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.text == "".join(f"line {i}\n" for i in range(100))
+
+
+def test_event_stream_not_compressed(client):
+    """Test Server-Sent Events are never buffered or compressed"""
+    response = client.get("/events", headers={"Accept-Encoding": "zstd"})
+
+    assert "Content-Encoding" not in response.headers
+    assert response.text == "data: " + LARGE + "\n\n"
+
+
+def test_compressed_response_etag_names_coding(client):
+    """Test a compressed body gets its own ETag per content coding"""
+    zstd = client.get("/versioned", headers={"Accept-Encoding": "zstd"})
+    gzip = client.get("/versioned", headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/versioned", headers={"Accept-Encoding": "identity"})
+
+    assert zstd.headers["ETag"] == '"abc-zstd"'
+    assert gzip.headers["ETag"] == '"abc-gzip"'
+    assert identity.headers["ETag"] == ETAG
+
+
+def test_compressed_etag_revalidates(client):
+    """Test a cached compressed copy is answered with 304 and its own ETag"""
+    response = client.get(
+        "/versioned",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": '"abc-gzip"'},
+    )
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == '"abc-gzip"'
+
+    response = client.get(
+        "/versioned",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": ETAG},
+    )
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == ETAG
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ('"abc"', True),
+        ('"abc-zstd"', True),
+        ('W/"abc-gzip"', True),
+        ('"other", "abc-gzip"', True),
+        ('"abc-br"', False),
+        ('"abcd"', False),
+    ],
+)
+def test_etag_matches_coding_suffix(header, expected):
+    """Test If-None-Match accepts the coding-suffixed forms of a tag"""
+    assert etag_matches(header, ETAG) is expected
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/large")
+    def large():
+        return PlainTextResponse(LARGE)
+
+    @app.get("/versioned")
+    def versioned(if_none_match: str = Header(None)):
+        if etag_matches(if_none_match, ETAG):
+            return not_modified(ETAG, "no-cache")
+        return PlainTextResponse(LARGE, headers={"ETag": ETAG})
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("small")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(f"line {i}\n" for i in range(100))
+
+    @app.get("/events")
+    def events():
+        return StreamingResponse(
+            iter(["data: " + LARGE + "\n\n"]), media_type="text/event-stream"
+        )
+
+    return TestClient(app)
@@ -0,0 +1,81 @@
+"""
+Tests for per-client rate limiting
+"""
+
+import pytest
+
+from app.core.rate_limit import RateLimiter, retry_after
+
+
+def test_allows_burst_then_limits(clock):
+    """Test a key gets its burst of attempts and then has to wait"""
+    limiter = RateLimiter(attempts=3, window_seconds=60, clock=clock)
+
+    assert [limiter.acquire("1.2.3.4") for _ in range(3)] == [0, 0, 0]
+    assert limiter.acquire("1.2.3.4") == pytest.approx(20)
+
+
+def test_bucket_refills_over_window(clock):
+    """Test attempts come back at attempts/window per second"""
+    limiter = RateLimiter(attempts=3, window_seconds=60, clock=clock)
+    for _ in range(3):
+        limiter.acquire("1.2.3.4")
+
+    clock.now += 20
+    assert limiter.acquire("1.2.3.4") == 0
+    assert limiter.acquire("1.2.3.4") > 0
+
+
+def test_keys_are_limited_independently(clock):
+    """Test one client's attempts do not count against another"""
+    limiter = RateLimiter(attempts=1, window_seconds=60, clock=clock)
+    limiter.acquire("1.2.3.4")
+
+    assert limiter.acquire("5.6.7.8") == 0
+
+
+def test_tracked_keys_are_bounded(clock):
+    """Test only the most recently seen keys are tracked"""
+    limiter = RateLimiter(attempts=1, window_seconds=60, max_keys=2, clock=clock)
+    for key in ("a", "b", "c"):
+        limiter.acquire(key)
+
+    assert list(limiter._buckets) == ["b", "c"]
+
+
+def test_retry_after_rounds_up():
+    """Test Retry-After is a whole number of seconds, at least one"""
+    assert retry_after(0.2) == "1"
+    assert retry_after(20.01) == "21"
+
+
+def test_login_rate_limited_per_ip(client):
+    """Test repeated logins from one address get 429 with Retry-After"""
+    from app.core.config import settings
+
+    for _ in range(settings.LOGIN_RATE_LIMIT_ATTEMPTS):
+        response = client.post(
+            "/api/v1/auth/token",
+            data={"username": "nobody@example.com", "password": "password"},
+        )
+        assert response.status_code == 401
+
+    response = client.post(
+        "/api/v1/auth/token",
+        data={"username": "nobody@example.com", "password": "password"},
+    )
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
@@ -0,0 +1,232 @@
+"""
+Tests for read replica routing
+"""
+
+import math
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.db import Replica, ReplicaRouter, request_sessionmaker
+
+
+def test_no_replicas_reads_primary():
+    """Test reads go to the primary when no replicas are configured"""
+    router = ReplicaRouter([], max_lag_seconds=5, read_your_writes_seconds=10)
+
+    assert router.choose(1) is None
+
+
+def test_unmeasured_and_lagging_replicas_skipped():
+    """Test only replicas measured within the lag budget serve reads"""
+    unmeasured, lagging, healthy = (make_replica(name) for name in "abc")
+    lagging.lag_seconds = 6
+    healthy.lag_seconds = 1
+    router = ReplicaRouter(
+        [unmeasured, lagging, healthy], max_lag_seconds=5, read_your_writes_seconds=10
+    )
+
+    assert {router.choose(1).name for _ in range(4)} == {"c"}
+
+
+def test_reads_spread_across_replicas():
+    """Test healthy replicas take turns"""
+    replicas = [make_replica(name, lag=0) for name in "ab"]
+    router = ReplicaRouter(replicas, max_lag_seconds=5, read_your_writes_seconds=10)
+
+    assert [router.choose().name for _ in range(4)] == ["a", "b", "a", "b"]
+
+
+def test_read_your_writes_window(clock):
+    """Test a writer reads from the primary until the window passes"""
+    router = ReplicaRouter(
+        [make_replica("a", lag=0)],
+        max_lag_seconds=5,
+        read_your_writes_seconds=10,
+        clock=clock,
+    )
+    router.record_write(1)
+
+    assert router.choose(1) is None
+    assert router.choose(2).name == "a"
+    clock.now += 10
+    assert router.choose(1).name == "a"
+
+
+def test_write_marker_pins_reads(clock):
+    """Test a client's write marker keeps its reads on the primary"""
+    router = ReplicaRouter(
+        [make_replica("a", lag=0)],
+        max_lag_seconds=5,
+        read_your_writes_seconds=10,
+        clock=clock,
+    )
+
+    assert router.choose(1, written_at=clock.now - 1) is None
+    assert router.choose(1, written_at=clock.now - 10).name == "a"
+    # A marker far in the future cannot pin reads indefinitely
+    assert router.choose(1, written_at=clock.now + 3600).name == "a"
+
+
+async def test_check_lag_marks_unreachable_replica(tmp_path):
+    """Test replicas that cannot be queried are taken out of rotation"""
+    reachable = make_replica("ok", url=f"sqlite+aiosqlite:///{tmp_path}/replica.db")
+    unreachable = make_replica(
+        "down", url=f"sqlite+aiosqlite:///{tmp_path}/missing/replica.db", lag=0
+    )
+    router = ReplicaRouter(
+        [reachable, unreachable], max_lag_seconds=5, read_your_writes_seconds=10
+    )
+
+    await router.check_lag()
+
+    assert reachable.lag_seconds == 0
+    assert unreachable.lag_seconds == math.inf
+
+
+def test_reads_served_by_replica(client, auth_headers, replica_job):
+    """Test read endpoints are served from a healthy replica"""
+    response = client.get("/api/v1/jobs", headers=auth_headers)
+
+    assert [job["id"] for job in response.json()["items"]] == [replica_job]
+
+
+def test_submitter_reads_own_job_from_primary(
+    client, auth_headers, replica_job, test_plugin
+):
+    """Test a user sees their new job even though the replica lacks it"""
+    response = client.post(
+        "/api/v1/jobs", json={"plugin_name": "test-plugin"}, headers=auth_headers
+    )
+    job_id = response.json()["id"]
+
+    assert client.get(f"/api/v1/jobs/{job_id}", headers=auth_headers).is_success
+    response = client.get("/api/v1/jobs", headers=auth_headers)
+    assert [job["id"] for job in response.json()["items"]] == [job_id]
+
+
+def test_write_marker_read_by_other_process(
+    client, auth_headers, replica_job, test_plugin
+):
+    """Test the write marker keeps a new job visible on another API process"""
+    from app.core.db import replica_router
+
+    response = client.post(
+        "/api/v1/jobs", json={"plugin_name": "test-plugin"}, headers=auth_headers
+    )
+    job_id = response.json()["id"]
+    marker = response.headers["X-Last-Write"]
+    # Another process has not seen the write
+    replica_router._last_writes.clear()
+
+    assert client.get(f"/api/v1/jobs/{job_id}", headers=auth_headers).is_success
+    client.cookies.clear()
+    response = client.get(f"/api/v1/jobs/{job_id}", headers=auth_headers)
+    assert response.status_code == 404
+    response = client.get(
+        f"/api/v1/jobs/{job_id}", headers={**auth_headers, "X-Last-Write": marker}
+    )
+    assert response.is_success
+
+
+def test_new_user_read_from_primary(client, auth_headers, replica_job):
+    """Test a registered user can be read back before replicas have it"""
+    from app.core.db import replica_router
+
+    response = client.post(
+        "/api/v1/users",
+        json={"email": "new@example.com", "password": "password123"},
+    )
+    user_id = response.json()["id"]
+    replica_router._last_writes.clear()
+
+    assert client.get(f"/api/v1/users/{user_id}", headers=auth_headers).is_success
+
+
+def make_replica(name, url="sqlite+aiosqlite://", lag=math.inf):
+    engine = create_async_engine(url, poolclass=NullPool)
+    return Replica(
+        name=name,
+        engine=engine,
+        sessionmaker=request_sessionmaker(engine),
+        lag_seconds=lag,
+    )
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def test_user(db_session):
+    """Create a test user"""
+    from app.core.security import get_password_hash
+    from app.models.user import User
+
+    user = User(
+        email="testuser@example.com",
+        hashed_password=get_password_hash("password123"),
+        is_active=True,
+    )
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+@pytest.fixture
+def test_plugin(db_session):
+    """Create a test plugin"""
+    from app.models.plugin import Plugin
+
+    db_session.add(
+        Plugin(
+            name="test-plugin",
+            version="1.0.0",
+            docker_image_url="registry.example.com/test:1.0.0",
+        )
+    )
+    db_session.commit()
+
+
+@pytest.fixture
+def auth_headers(client, test_user):
+    """Get authentication headers with valid token"""
+    response = client.post(
+        "/api/v1/auth/token",
+        data={"username": "testuser@example.com", "password": "password123"},
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def replica_job(tmp_path, test_user, monkeypatch):
+    """Route reads to a replica holding one job the primary does not have"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from app.core.db import Base, replica_router
+    from app.models.job import Job
+
+    path = tmp_path / "replica.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as session:
+        job = Job(id=42, plugin_name="replicated", owner_id=test_user.id)
+        session.add(job)
+        session.commit()
+    engine.dispose()
+
+    replica = make_replica("replica", url=f"sqlite+aiosqlite:///{path}", lag=0)
+    monkeypatch.setattr(replica_router, "replicas", [replica])
+    monkeypatch.setattr(replica_router, "_last_writes", {})
+    return 42
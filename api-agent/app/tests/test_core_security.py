@@ -105,3 +105,32 @@ def test_decode_expired_token():
 
     decoded = decode_access_token(token)
     assert decoded is None
+
+
+async def test_password_hashing_runs_off_event_loop():
+    """Test async hashing and verification run on the password pool"""
+    import threading
+
+    from app.core import security
+
+    threads = []
+    original = security.pwd_context
+
+    class RecordingContext:
+        def hash(self, password):
+            threads.append(threading.current_thread().name)
+            return original.hash(password)
+
+        def verify(self, password, hashed):
+            threads.append(threading.current_thread().name)
+            return original.verify(password, hashed)
+
+    security.pwd_context = RecordingContext()
+    try:
+        hashed = await security.get_password_hash_async("mypassword")
+        assert await security.verify_password_async("mypassword", hashed) is True
+    finally:
+        security.pwd_context = original
+
+    assert all(name.startswith("password-hash") for name in threads)
+    assert len(threads) == 2
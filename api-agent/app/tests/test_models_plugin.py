@@ -43,8 +43,8 @@ def test_plugin_model_creation(db_session):
     assert isinstance(plugin.created_at, datetime)
 
 
-def test_plugin_name_must_be_unique(db_session):
-    """Test that plugin name must be unique"""
+def test_plugin_version_must_be_unique(db_session):
+    """Test that a plugin name and version pair must be unique"""
     from app.models.plugin import Plugin
     from sqlalchemy.exc import IntegrityError
 
@@ -58,8 +58,8 @@ def test_plugin_name_must_be_unique(db_session):
 
     plugin2 = Plugin(
         name="unique-plugin",
-        version="2.0.0",
-        docker_image_url="registry.example.com/unique:2.0.0",
+        version="1.0.0",
+        docker_image_url="registry.example.com/unique:1.0.1",
     )
     db_session.add(plugin2)
 
@@ -67,6 +67,23 @@ def test_plugin_name_must_be_unique(db_session):
         db_session.commit()
 
 
+def test_plugin_can_have_multiple_versions(db_session):
+    """Test that several versions of one plugin can coexist"""
+    from app.models.plugin import Plugin
+
+    for version in ("1.0.0", "2.0.0"):
+        db_session.add(
+            Plugin(
+                name="versioned-plugin",
+                version=version,
+                docker_image_url=f"registry.example.com/versioned:{version}",
+            )
+        )
+    db_session.commit()
+
+    assert db_session.query(Plugin).filter_by(name="versioned-plugin").count() == 2
+
+
 def test_plugin_with_minimal_fields(db_session):
     """Test Plugin can be created with minimal required fields"""
     from app.models.plugin import Plugin
@@ -86,3 +103,44 @@ def test_plugin_with_minimal_fields(db_session):
     assert plugin.description is None
     assert plugin.input_schema is None
     assert plugin.output_schema is None
+
+
+def test_plugin_tables_match_plugin_registry(monkeypatch):
+    """Test the plugin tables are declared as plugin-registry declares them"""
+    import importlib.util
+    import sys
+    import types
+    from pathlib import Path
+
+    from sqlalchemy.dialects import postgresql
+    from sqlalchemy.orm import declarative_base
+    from sqlalchemy.schema import CreateIndex, CreateTable
+
+    from app.core.db import utcnow
+    from app.models.plugin import Plugin, PluginAlias
+
+    path = Path(__file__).parents[3] / "plugin-registry/app/models/plugin.py"
+    if not path.exists():
+        pytest.skip("plugin-registry is not checked out alongside api-agent")
+
+    # Declare plugin-registry's models on their own metadata
+    registry_db = types.ModuleType("app.core.db")
+    registry_db.Base = declarative_base()
+    registry_db.utcnow = utcnow
+    monkeypatch.setitem(sys.modules, "app.core.db", registry_db)
+    spec = importlib.util.spec_from_file_location("registry_plugin_models", path)
+    registry = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(registry)
+
+    def ddl(table):
+        dialect = postgresql.dialect()
+        return [
+            str(CreateTable(table).compile(dialect=dialect)),
+            *sorted(
+                str(CreateIndex(index).compile(dialect=dialect))
+                for index in table.indexes
+            ),
+        ]
+
+    assert ddl(Plugin.__table__) == ddl(registry.Plugin.__table__)
+    assert ddl(PluginAlias.__table__) == ddl(registry.PluginAlias.__table__)
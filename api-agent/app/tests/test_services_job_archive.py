@@ -0,0 +1,61 @@
+"""
+Tests for the compressed job archive
+"""
+
+from datetime import date
+
+import pytest
+
+from app.services.job_archive import JobArchive, month_label
+
+
+def test_month_label():
+    """Test months are labelled YYYY-MM"""
+    assert month_label(date(2024, 3, 1)) == "2024-03"
+
+
+def test_write_and_read_per_owner(tmp_path):
+    """Test each owner's jobs are read back from their own frame"""
+    archive = JobArchive(str(tmp_path))
+    rows = [row(1, owner_id=1), row(2, owner_id=1), row(3, owner_id=2)]
+
+    assert archive.write(date(2024, 1, 1), rows) == 3
+
+    assert archive.read("2024-01", owner_id=1) == (2, [row(1, 1), row(2, 1)])
+    assert archive.read("2024-01", owner_id=2) == (1, [row(3, 2)])
+    assert archive.read("2024-01", owner_id=3) == (0, [])
+
+
+def test_read_paginates(tmp_path):
+    """Test skip and limit select a page of an owner's jobs"""
+    archive = JobArchive(str(tmp_path))
+    archive.write(date(2024, 1, 1), [row(i, owner_id=1) for i in range(10)])
+
+    total, page = archive.read("2024-01", owner_id=1, skip=4, limit=3)
+
+    assert total == 10
+    assert [job["id"] for job in page] == [4, 5, 6]
+
+
+def test_read_missing_month(tmp_path):
+    """Test reading a month that is not archived raises FileNotFoundError"""
+    archive = JobArchive(str(tmp_path))
+
+    with pytest.raises(FileNotFoundError):
+        archive.read("2024-01", owner_id=1)
+
+
+def test_months_lists_complete_archives(tmp_path):
+    """Test months only lists archives whose index was written"""
+    archive = JobArchive(str(tmp_path / "archive"))
+    assert archive.months() == []
+
+    archive.write(date(2024, 2, 1), [row(1, owner_id=1)])
+    archive.write(date(2023, 12, 1), [])
+    (tmp_path / "archive" / "jobs-2024-03.jsonl.zst").write_bytes(b"")
+
+    assert archive.months() == ["2023-12", "2024-02"]
+
+
+def row(job_id, owner_id):
+    return {"id": job_id, "owner_id": owner_id, "status": "completed"}
@@ -0,0 +1,111 @@
+"""
+Tests for job input/result filters
+"""
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+import app.models.user  # noqa: F401  (configures the Job.owner relationship)
+from app.models.job import Job
+from app.services.job_filters import (
+    JobFilter,
+    declared_result_fields,
+    job_filter_clauses,
+    parse_job_filter,
+    result_index,
+)
+
+
+def test_parse_job_filter():
+    """Test columns, paths, operators and JSON values are parsed"""
+    assert parse_job_filter("result.prediction=class_A") == JobFilter(
+        "result", ("prediction",), "=", "class_A"
+    )
+    assert parse_job_filter("input_data.params.depth>=3") == JobFilter(
+        "input_data", ("params", "depth"), ">=", 3
+    )
+    assert parse_job_filter('result.label!="42"') == JobFilter(
+        "result", ("label",), "!=", "42"
+    )
+    assert parse_job_filter("result.ok=true").value is True
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "error_message=oops",
+        "result=class_A",
+        "result.a-b=1",
+        "result.prediction",
+        "result.prediction>high",
+        "result.flag<true",
+    ],
+)
+def test_parse_job_filter_rejects(expression):
+    """Test malformed filters and non-numeric ranges are rejected"""
+    with pytest.raises(ValueError):
+        parse_job_filter(expression)
+
+
+def test_postgres_equality_uses_containment():
+    """Test equality compiles to JSONB containment served by the GIN index"""
+    sql = compile_postgres(["result.metadata.model=v2", "input_data.mode!=fast"])
+
+    assert "jobs.result @> %(param_1)s" in sql
+    assert "NOT coalesce(jobs.input_data @> %(param_2)s, false)" in sql
+
+
+def test_postgres_range_matches_declared_index():
+    """Test range filters repeat the declared index expression exactly"""
+    sql = compile_postgres(["result.confidence>=0.9"])
+    ddl = str(
+        CreateIndex(result_index("confidence")).compile(dialect=postgresql.dialect())
+    )
+
+    expression = (
+        "CASE WHEN (jsonb_typeof(result -> 'confidence') = 'number') "
+        "THEN CAST(result ->> 'confidence' AS FLOAT) END"
+    )
+    assert expression.replace("result", "jobs.result") + " >= %(param_1)s" in sql
+    assert ddl == f"CREATE INDEX ix_jobs_result_confidence ON jobs ({expression})"
+
+
+def test_result_index_names_keep_case_apart():
+    """Test fields differing only in case get distinct index names"""
+    names = {result_index(field).name for field in ("score", "Score", "SCORE")}
+
+    assert len(names) == 3
+    assert "ix_jobs_result_score" in names
+    assert all(name == name.lower() for name in names)
+
+
+def test_result_index_name_fits_postgres():
+    """Test long field names get a short, stable index name"""
+    name = result_index("x" * 80).name
+
+    assert len(name) == 63
+    assert name == result_index("x" * 80).name
+
+
+def test_declared_result_fields():
+    """Test only numeric top-level fields marked x-index are declared"""
+    schema = {
+        "type": "object",
+        "properties": {
+            "prediction": {"type": "string", "x-index": True},
+            "confidence": {"type": "number", "x-index": True},
+            "rank": {"type": "integer", "x-index": True},
+            "score": {"type": "number"},
+            "bad-name": {"type": "number", "x-index": True},
+        },
+    }
+
+    assert declared_result_fields(schema) == ["confidence", "rank"]
+    assert declared_result_fields(None) == []
+
+
+def compile_postgres(expressions):
+    query = select(Job.id).where(job_filter_clauses(expressions, "postgresql"))
+    return str(query.compile(dialect=postgresql.dialect()))
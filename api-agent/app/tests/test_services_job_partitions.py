@@ -0,0 +1,75 @@
+"""
+Tests for jobs partition maintenance
+"""
+
+from datetime import date, datetime, timezone
+
+from sqlalchemy import create_engine
+
+from app.services.job_archive import JobArchive
+from app.services.job_partitions import (
+    JobPartitionMaintainer,
+    add_months,
+    archive_row,
+    create_partition_sql,
+    expired_months,
+    month_start,
+    partition_month,
+    partition_name,
+)
+
+
+def test_month_arithmetic():
+    """Test month starts and month offsets across year boundaries"""
+    assert month_start(datetime(2024, 3, 17, 8, 30)) == date(2024, 3, 1)
+    assert add_months(date(2024, 11, 1), 3) == date(2025, 2, 1)
+    assert add_months(date(2024, 1, 1), -1) == date(2023, 12, 1)
+
+
+def test_partition_names_round_trip():
+    """Test partition names encode their month"""
+    assert partition_name(date(2024, 1, 1)) == "jobs_y2024m01"
+    assert partition_month("jobs_y2024m01") == date(2024, 1, 1)
+    assert partition_month("jobs_default") is None
+
+
+def test_create_partition_sql():
+    """Test a partition covers exactly its month"""
+    assert create_partition_sql(date(2024, 12, 1)) == (
+        "CREATE TABLE IF NOT EXISTS jobs_y2024m12 PARTITION OF jobs "
+        "FOR VALUES FROM ('2024-12-01') TO ('2025-01-01')"
+    )
+
+
+def test_expired_months():
+    """Test months before the retention window expire, oldest first"""
+    months = [date(2024, m, 1) for m in (6, 1, 3, 4, 5)]
+
+    assert expired_months(months, date(2024, 6, 1), retention_months=3) == [
+        date(2024, 1, 1),
+        date(2024, 3, 1),
+    ]
+    assert expired_months(months, date(2024, 6, 1), retention_months=0) == []
+
+
+def test_archive_row_uses_status_values():
+    """Test raw enum names are archived as the API's status values"""
+    assert archive_row({"id": 1, "status": "COMPLETED"}) == {
+        "id": 1,
+        "status": "completed",
+    }
+
+
+def test_maintainer_skips_non_postgres(tmp_path):
+    """Test maintenance does nothing where jobs is not partitioned"""
+    maintainer = JobPartitionMaintainer(
+        create_engine("sqlite://"),
+        JobArchive(str(tmp_path)),
+        retention_months=1,
+        months_ahead=3,
+        clock=lambda: datetime(2024, 6, 1, tzinfo=timezone.utc),
+    )
+
+    result = maintainer.run()
+
+    assert result.created == [] and result.archived == []
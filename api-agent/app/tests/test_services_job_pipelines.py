@@ -0,0 +1,78 @@
+"""
+Tests for pipeline job graph validation
+"""
+
+import pytest
+
+from app.services.job_pipelines import (
+    PipelineError,
+    final_step,
+    parse_reference,
+    pipeline_order,
+    step_dependencies,
+)
+
+
+def test_parse_reference():
+    """Test references name a step and an optional path into its output"""
+    assert parse_reference("extract") == ("extract", [])
+    assert parse_reference("extract.features.0") == ("extract", ["features", "0"])
+
+
+def test_parse_reference_empty_segment():
+    """Test references with empty segments are rejected"""
+    with pytest.raises(PipelineError):
+        parse_reference("extract..features")
+
+
+def test_step_dependencies_read_before_order_only():
+    """Test steps read from come first, without duplicates"""
+    dependencies = step_dependencies(
+        {"features": "extract.features", "scale": "normalize"},
+        ["prepare", "extract"],
+    )
+
+    assert dependencies == ["extract", "normalize", "prepare"]
+
+
+def test_pipeline_order():
+    """Test steps come after their dependencies, independent steps as declared"""
+    order = pipeline_order(
+        {
+            "classify": ["left", "right"],
+            "left": ["extract"],
+            "extract": [],
+            "right": ["extract"],
+        }
+    )
+
+    assert order == ["extract", "left", "right", "classify"]
+
+
+def test_pipeline_order_cycle():
+    """Test cyclic pipelines are rejected"""
+    with pytest.raises(PipelineError, match="cycle"):
+        pipeline_order({"a": [], "b": ["a", "c"], "c": ["b"]})
+
+
+def test_pipeline_order_unknown_step():
+    """Test dependencies on undeclared steps are rejected"""
+    with pytest.raises(PipelineError, match="unknown step 'missing'"):
+        pipeline_order({"a": ["missing"]})
+
+
+def test_pipeline_order_self_dependency():
+    """Test a step cannot depend on itself"""
+    with pytest.raises(PipelineError, match="itself"):
+        pipeline_order({"a": ["a"]})
+
+
+def test_final_step():
+    """Test the final step is the one nothing depends on"""
+    assert final_step({"extract": [], "classify": ["extract"]}) == "classify"
+
+
+def test_final_step_must_be_unique():
+    """Test pipelines with two unconnected ends are rejected"""
+    with pytest.raises(PipelineError, match="exactly one step"):
+        final_step({"extract": [], "left": ["extract"], "right": ["extract"]})
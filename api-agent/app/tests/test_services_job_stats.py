@@ -0,0 +1,130 @@
+"""
+Tests for the job statistics rollup
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.models.job import Job, JobStatus
+from app.models.job_stats import JobStatsBucket
+from app.services.job_stats import (
+    histogram_index,
+    histogram_percentile,
+    histogram_value,
+    rebuild_job_stats,
+    summarize,
+)
+from app.services.status_ingester import apply_status_update
+
+
+def test_histogram_buckets_bound_relative_error():
+    """Test a duration's bucket value is within ~12% of it"""
+    for seconds in (0.05, 0.9, 3.0, 61.0, 7200.0):
+        estimate = histogram_value(histogram_index(seconds))
+        assert abs(estimate - seconds) / seconds < 0.12
+
+    assert histogram_index(0.0) == 0
+    assert histogram_index(1e8) == histogram_index(1e12)
+
+
+def test_histogram_percentile():
+    """Test percentiles walk the cumulative bucket counts"""
+    histogram = {str(histogram_index(1.0)): 90, str(histogram_index(10.0)): 10}
+
+    assert histogram_percentile(histogram, 0.5) == pytest.approx(1.0, rel=0.12)
+    assert histogram_percentile(histogram, 0.95) == pytest.approx(10.0, rel=0.12)
+    assert histogram_percentile({}, 0.5) is None
+
+
+def test_finished_jobs_are_rolled_up(db_session, owner):
+    """Test the ingester folds finished jobs into their hourly row"""
+    for run_seconds in (2, 4):
+        job = submit(db_session, owner, created_at=at(10, 0, 0))
+        finish(db_session, job, "completed", at(10, 0, 1), at(10, 0, 1 + run_seconds))
+    finish(
+        db_session,
+        submit(db_session, owner, created_at=at(11, 0, 0)),
+        "failed",
+        at(11, 0, 5),
+        at(11, 30, 0),
+    )
+
+    buckets = db_session.query(JobStatsBucket).order_by(JobStatsBucket.status).all()
+
+    assert [(b.status, b.count) for b in buckets] == [
+        (JobStatus.COMPLETED, 2),
+        (JobStatus.FAILED, 1),
+    ]
+    assert buckets[0].run_seconds_sum == pytest.approx(6.0)
+    assert buckets[0].wait_seconds_sum == pytest.approx(2.0)
+    assert sum(buckets[0].run_histogram.values()) == 2
+
+
+def test_summarize_by_interval(db_session, owner):
+    """Test rollup rows are grouped per plugin, status and time bucket"""
+    for hour in (10, 11):
+        job = submit(db_session, owner, created_at=at(hour, 0, 0))
+        finish(db_session, job, "completed", at(hour, 0, 0), at(hour, 0, 3))
+    buckets = db_session.query(JobStatsBucket).all()
+
+    hourly = summarize(buckets, "hour")
+    (daily,) = summarize(buckets, "day")
+    (total,) = summarize(buckets, "total")
+
+    assert [group["count"] for group in hourly] == [1, 1]
+    assert hourly[0]["bucket_start"] == at(10, 0, 0)
+    assert daily["bucket_start"] == datetime(2024, 1, 1, tzinfo=timezone.utc)
+    assert total["bucket_start"] is None
+    assert total["count"] == 2
+    assert total["run_seconds"]["mean"] == pytest.approx(3.0)
+    assert total["run_seconds"]["p50"] == pytest.approx(3.0, rel=0.12)
+
+
+def test_rebuild_matches_incremental_rollup(db_session, owner):
+    """Test rebuilding from the jobs table reproduces the rollup"""
+    for run_seconds in (1, 30):
+        job = submit(db_session, owner, created_at=at(9, 0, 0))
+        finish(db_session, job, "completed", at(9, 0, 0), at(9, 0, run_seconds))
+    before = summarize(db_session.query(JobStatsBucket).all())
+
+    assert rebuild_job_stats(db_session) == 2
+    assert summarize(db_session.query(JobStatsBucket).all()) == before
+
+
+def at(hour, minute, second):
+    return datetime(2024, 1, 1, hour, minute, second, tzinfo=timezone.utc)
+
+
+def submit(db, owner, created_at):
+    job = Job(
+        plugin_name="test-plugin",
+        status=JobStatus.QUEUED,
+        owner_id=owner.id,
+        created_at=created_at,
+    )
+    db.add(job)
+    db.commit()
+    return job
+
+
+def finish(db, job, status, started_at, completed_at):
+    apply_status_update(
+        db,
+        {
+            "job_id": job.id,
+            "status": status,
+            "started_at": started_at.isoformat(),
+            "updated_at": completed_at.isoformat(),
+        },
+    )
+
+
+@pytest.fixture
+def owner(db_session):
+    from app.models.user import User
+
+    user = User(email="stats@example.com", hashed_password="pass")
+    db_session.add(user)
+    db_session.commit()
+    return user
@@ -0,0 +1,102 @@
+"""
+Tests for the in-process plugin metadata snapshot
+"""
+
+import math
+from datetime import datetime
+
+import pytest
+
+from app.schemas.plugin import Plugin
+from app.services.plugin_cache import PluginCache, PluginEventListener
+
+
+def test_cache_evicts_least_recently_used(clock):
+    """Test the cache stays within its size bound"""
+    cache = PluginCache(max_size=2, clock=clock)
+    cache.put(make_plugin("a"))
+    cache.put(make_plugin("b"))
+    cache.get("a", "1.0.0")
+    cache.put(make_plugin("c"))
+
+    assert cache.get("a", "1.0.0") is not None
+    assert cache.get("b", "1.0.0") is None
+    assert cache.get("c", "1.0.0") is not None
+
+
+def test_entries_record_etag_and_fetch_time(clock):
+    """Test entries keep what revalidation needs"""
+    cache = PluginCache(max_size=10, clock=clock)
+    cache.put(make_plugin("a"), "latest", etag='"1"')
+
+    clock.now += 5
+    cache.touch("a", "latest")
+
+    entry = cache.get("a", "latest")
+    assert entry.etag == '"1"'
+    assert entry.fetched_at == clock.now
+
+
+def test_new_version_event_expires_aliases_only(clock):
+    """Test a new version marks alias entries stale but keeps exact versions"""
+    cache = PluginCache(max_size=10, clock=clock)
+    cache.put(make_plugin("a"))
+    cache.put(make_plugin("a"), "latest")
+
+    PluginEventListener(cache).handle(
+        {"event": "created", "name": "a", "version": "1.1.0"}
+    )
+
+    assert cache.get("a", "latest").fetched_at == -math.inf
+    assert cache.get("a", "1.0.0").fetched_at == clock.now
+
+
+def test_delete_event_invalidates_version(clock):
+    """Test deleting a version drops it and aliases resolving to it"""
+    cache = PluginCache(max_size=10, clock=clock)
+    cache.put(make_plugin("a"))
+    cache.put(make_plugin("a"), "stable")
+    cache.put(make_plugin("a", "2.0.0"))
+
+    PluginEventListener(cache).handle(
+        {"event": "deleted", "name": "a", "version": "1.0.0"}
+    )
+
+    assert cache.get("a", "1.0.0") is None
+    assert cache.get("a", "stable") is None
+    assert cache.get("a", "2.0.0") is not None
+
+
+def test_prepull_event_keeps_cache(clock):
+    """Test worker-only prepull events do not invalidate anything"""
+    cache = PluginCache(max_size=10, clock=clock)
+    cache.put(make_plugin("a"), "latest")
+
+    PluginEventListener(cache).handle(
+        {"event": "prepull", "name": "a", "version": "1.0.0"}
+    )
+
+    assert cache.get("a", "latest").fetched_at == clock.now
+
+
+def make_plugin(name, version="1.0.0"):
+    return Plugin(
+        id=1,
+        name=name,
+        version=version,
+        docker_image_url=f"{name}:{version}",
+        created_at=datetime(2024, 1, 1),
+    )
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
@@ -0,0 +1,137 @@
+"""
+Tests for the cached plugin registry client
+"""
+
+import httpx
+import pytest
+
+from app.services.plugin_cache import PluginCache
+from app.services.plugin_registry import (
+    PluginRegistryClient,
+    PluginRegistryUnavailable,
+)
+
+
+def test_exact_version_fetched_once(registry_client, fake_registry, plugins):
+    """Test immutable versions are never fetched twice"""
+    registry_client.get_plugin("multi", "1.9.0")
+    registry_client.cache.clock.now += 10_000
+
+    assert registry_client.get_plugin("multi", "1.9.0").version == "1.9.0"
+    assert len(fake_registry.requests) == 1
+
+
+def test_resolves_latest_and_aliases(registry_client, plugins):
+    """Test latest, aliases and unknown references resolve like the registry"""
+    assert registry_client.get_plugin("multi").version == "1.10.0"
+    assert registry_client.get_plugin("multi", "stable").version == "1.9.0"
+    assert registry_client.get_plugin("multi", "2.0.0") is None
+    assert registry_client.get_plugin("missing") is None
+
+
+def test_alias_served_from_cache_within_ttl(registry_client, fake_registry, plugins):
+    """Test fresh alias entries are served without a request"""
+    registry_client.get_plugin("multi")
+    registry_client.cache.clock.now += 59
+
+    registry_client.get_plugin("multi")
+
+    assert len(fake_registry.requests) == 1
+
+
+def test_expired_alias_revalidated_with_etag(registry_client, fake_registry, plugins):
+    """Test expired alias entries are revalidated with If-None-Match"""
+    registry_client.get_plugin("multi")
+    registry_client.cache.clock.now += 1000
+
+    assert registry_client.get_plugin("multi").version == "1.10.0"
+
+    revalidation = fake_registry.requests[-1]
+    assert revalidation.headers["If-None-Match"] == '"2"'
+    entry = registry_client.cache.get("multi", "latest")
+    assert entry.fetched_at == registry_client.cache.clock.now
+
+
+def test_stale_alias_served_while_revalidating(registry_client, fake_registry, plugins):
+    """Test an alias past its TTL is served at once and refreshed in background"""
+    registry_client.get_plugin("multi")
+    registry_client.cache.clock.now += 90
+
+    assert registry_client.get_plugin("multi").version == "1.10.0"
+
+    registry_client._executor.shutdown(wait=True)
+    assert len(fake_registry.requests) == 2
+
+
+def test_stale_entry_served_when_registry_down(registry_client, fake_registry, plugins):
+    """Test a cached plugin is still served while the registry is unreachable"""
+    registry_client.get_plugin("multi")
+    registry_client.cache.clock.now += 1000
+    fake_registry.available = False
+
+    assert registry_client.get_plugin("multi").version == "1.10.0"
+
+
+def test_registry_down_without_cache_raises(registry_client, fake_registry):
+    """Test an uncached plugin cannot be served while the registry is down"""
+    fake_registry.available = False
+
+    with pytest.raises(PluginRegistryUnavailable):
+        registry_client.get_plugin("multi")
+
+
+def test_list_plugins_pages_by_id(registry_client, fake_registry, db_session):
+    """Test every version is listed once across pages, in id order"""
+    from unittest.mock import patch
+
+    from app.models.plugin import Plugin as PluginModel
+
+    db_session.add_all(
+        PluginModel(name=f"bulk-{i}", version="1.0.0", docker_image_url="img")
+        for i in range(5)
+    )
+    db_session.commit()
+
+    with patch("app.services.plugin_registry.LIST_PAGE_SIZE", 2):
+        plugins = registry_client.list_plugins()
+
+    assert [p.name for p in plugins] == [f"bulk-{i}" for i in range(5)]
+    assert [r.url.params["after_id"] for r in fake_registry.requests] == [
+        "0",
+        str(plugins[1].id),
+        str(plugins[3].id),
+    ]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def registry_client(fake_registry):
+    return PluginRegistryClient(
+        base_url="http://registry",
+        cache=PluginCache(max_size=100, clock=FakeClock()),
+        ttl_seconds=60,
+        stale_seconds=60,
+        client=httpx.Client(transport=httpx.MockTransport(fake_registry.handle)),
+    )
+
+
+@pytest.fixture
+def plugins(db_session):
+    """Register two versions of a plugin and a "stable" alias"""
+    from app.models.plugin import Plugin as PluginModel, PluginAlias
+
+    for version in ("1.9.0", "1.10.0"):
+        db_session.add(
+            PluginModel(
+                name="multi", version=version, docker_image_url=f"multi:{version}"
+            )
+        )
+    db_session.add(PluginAlias(name="multi", alias="stable", version="1.9.0"))
+    db_session.commit()
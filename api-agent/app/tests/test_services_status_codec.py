@@ -0,0 +1,42 @@
+"""
+Tests for status message wire decoding
+"""
+
+import json
+
+import msgpack
+import pytest
+import zstandard
+
+from app.services.status_codec import decode_status_message
+
+
+def test_decodes_json_without_content_type():
+    """Test messages from older workers are decoded as JSON"""
+    message = {"job_id": 1, "status": "processing"}
+
+    assert decode_status_message(json.dumps(message).encode()) == message
+
+
+def test_decodes_msgpack():
+    """Test msgpack-encoded messages are decoded"""
+    message = {"job_id": 1, "status": "completed", "result": {"score": 0.5}}
+    body = msgpack.packb(message, use_bin_type=True)
+
+    assert decode_status_message(body, "application/msgpack") == message
+
+
+def test_decodes_zstd_compressed_msgpack():
+    """Test zstd-compressed messages are decompressed before decoding"""
+    message = {"job_id": 1, "status": "completed", "result": {"values": [1] * 1000}}
+    body = zstandard.ZstdCompressor().compress(
+        msgpack.packb(message, use_bin_type=True)
+    )
+
+    assert decode_status_message(body, "application/msgpack", "zstd") == message
+
+
+def test_rejects_unknown_content_encoding():
+    """Test unsupported encodings are reported rather than misread"""
+    with pytest.raises(ValueError):
+        decode_status_message(b"{}", "application/json", "gzip")
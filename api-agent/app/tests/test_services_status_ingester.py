@@ -0,0 +1,165 @@
+"""
+Tests for the status ingester and job event hub
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.models.job import Job, JobStatus
+from app.services.job_events import JobEventHub
+from app.services.status_ingester import StatusIngester, apply_status_update
+
+
+def test_processing_update_sets_started_at(db_session, queued_job):
+    """Test a 'processing' update marks the job as started"""
+    job = apply_status_update(
+        db_session,
+        {
+            "job_id": queued_job.id,
+            "status": "processing",
+            "updated_at": "2024-01-01T00:00:01",
+        },
+    )
+
+    assert job.status == JobStatus.PROCESSING
+    assert job.started_at is not None
+    assert job.completed_at is None
+
+
+def test_progress_update_stores_latest_progress(db_session, queued_job):
+    """Test progress events are stored on the job"""
+    progress = {"percent": 40.0, "message": "step 2/5", "partial": None}
+
+    job = apply_status_update(
+        db_session,
+        {"job_id": queued_job.id, "status": "processing", "progress": progress},
+    )
+
+    assert job.progress == progress
+
+
+def test_completed_update_without_processing(db_session, queued_job):
+    """Test a coalesced terminal update still records the start time"""
+    job = apply_status_update(
+        db_session,
+        {
+            "job_id": queued_job.id,
+            "status": "completed",
+            "result": {"prediction": "class_A"},
+            "started_at": "2024-01-01T00:00:01",
+            "updated_at": "2024-01-01T00:00:02",
+        },
+    )
+
+    assert job.status == JobStatus.COMPLETED
+    assert job.result == {"prediction": "class_A"}
+    assert job.started_at.replace(tzinfo=None).second == 1
+    assert job.completed_at.replace(tzinfo=None).second == 2
+
+
+def test_completed_pipeline_stores_step_summaries(db_session, queued_job):
+    """Test a pipeline's per-step summaries are stored with its result"""
+    steps = [
+        {"name": "extract", "plugin_name": "example-processor", "status": "completed"},
+        {
+            "name": "classify",
+            "plugin_name": "example-classifier",
+            "status": "completed",
+        },
+    ]
+
+    job = apply_status_update(
+        db_session,
+        {
+            "job_id": queued_job.id,
+            "status": "completed",
+            "result": {"prediction": "class_A"},
+            "steps": steps,
+        },
+    )
+
+    assert job.result == {"prediction": "class_A"}
+    assert job.step_summaries == steps
+
+
+def test_late_update_for_finished_job_is_ignored(db_session, queued_job):
+    """Test a redelivered 'processing' cannot reopen a finished job"""
+    apply_status_update(
+        db_session,
+        {"job_id": queued_job.id, "status": "failed", "error_message": "boom"},
+    )
+
+    assert (
+        apply_status_update(
+            db_session, {"job_id": queued_job.id, "status": "processing"}
+        )
+        is None
+    )
+    assert queued_job.status == JobStatus.FAILED
+
+
+def test_update_for_unknown_job_is_ignored(db_session):
+    """Test status updates for missing jobs are dropped"""
+    assert (
+        apply_status_update(db_session, {"job_id": 999, "status": "processing"}) is None
+    )
+
+
+def test_ingester_publishes_progress_event(db_session, queued_job):
+    """Test the ingester notifies subscribers with the event type"""
+    published = []
+
+    class RecordingHub:
+        def publish(self, job_id, event_type, payload):
+            published.append((job_id, event_type, payload))
+
+    ingester = StatusIngester(session_factory=lambda: db_session, hub=RecordingHub())
+    ingester.handle(
+        {
+            "job_id": queued_job.id,
+            "status": "processing",
+            "progress": {"percent": 10.0, "message": None, "partial": None},
+        }
+    )
+
+    assert published[0][0] == queued_job.id
+    assert published[0][1] == "progress"
+    assert published[0][2]["progress"]["percent"] == 10.0
+
+
+async def test_hub_delivers_events_from_other_threads():
+    """Test events published from the ingester thread reach asyncio subscribers"""
+    hub = JobEventHub()
+    queue = hub.subscribe(1)
+
+    thread = threading.Thread(
+        target=hub.publish, args=(1, "status", {"status": "completed"})
+    )
+    thread.start()
+    thread.join()
+
+    event = await asyncio.wait_for(queue.get(), timeout=1)
+    assert event == ("status", {"status": "completed"})
+
+    hub.unsubscribe(1, queue)
+    hub.publish(1, "status", {"status": "failed"})
+    await asyncio.sleep(0)
+    assert queue.empty()
+
+
+@pytest.fixture
+def queued_job(db_session):
+    """Create a queued job"""
+    from app.models.user import User
+
+    user = User(email="ingest@example.com", hashed_password="pass")
+    db_session.add(user)
+    db_session.commit()
+
+    job = Job(plugin_name="test-plugin", status=JobStatus.QUEUED, owner_id=user.id)
+    db_session.add(job)
+    db_session.commit()
+    db_session.refresh(job)
+    return job
@@ -1,132 +1,388 @@
 """
 Plugin management API endpoints for Plugin Registry service
+
+Plugin versions are immutable: publishing a change creates a new
+(name, version) row, and aliases such as "stable" are moved explicitly.
 """
 
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Path,
+    Query,
+    Response,
+    status,
+)
+from pydantic import ValidationError
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.core.db import get_db
-from app.models.plugin import Plugin as PluginModel
-from app.schemas.plugin import Plugin, PluginCreate, PluginList, PluginUpdate
+from app.core.http_cache import etag_matches, make_etag, not_modified
+from app.models.plugin import Plugin as PluginModel, PluginAlias as PluginAliasModel
+from app.schemas.plugin import (
+    Plugin,
+    PluginAlias,
+    PluginAliasUpdate,
+    PluginBulkResult,
+    PluginBulkUpsert,
+    PluginCreate,
+    PluginList,
+    PluginUpdate,
+)
+from app.services.plugin_events import (
+    PluginEventPublisher,
+    get_plugin_event_publisher,
+)
+from app.services.plugin_search import search_plugins
+from app.services.plugin_versions import (
+    LATEST_ALIAS,
+    image_digest_from_url,
+    is_version,
+    resolve_version,
+    version_key,
+)
 
 router = APIRouter()
 
+# Plugins are public metadata; clients may store them but must revalidate
+PLUGIN_CACHE_CONTROL = "public, no-cache"
+# An exact (name, version) never changes once published
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
 
-@router.post("", response_model=Plugin, status_code=status.HTTP_201_CREATED)
-async def create_plugin(
-    plugin_in: PluginCreate,
-    db: Session = Depends(get_db),
-):
-    """
-    Create new plugin.
 
-    Register a new plugin in the registry.
-    """
-    # Check if plugin with this name already exists
-    existing = db.query(PluginModel).filter(PluginModel.name == plugin_in.name).first()
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Plugin with this name already exists",
-        )
+# Fields that make up a version; they can never change once registered
+VERSION_FIELDS = (
+    "description",
+    "docker_image_url",
+    "image_digest",
+    "input_schema",
+    "output_schema",
+)
+
 
-    # Create plugin
-    db_plugin = PluginModel(
+def _new_version(plugin_in: PluginCreate) -> PluginModel:
+    """Build a plugin version row, deriving the digest from the image if pinned"""
+    return PluginModel(
         name=plugin_in.name,
         version=plugin_in.version,
         description=plugin_in.description,
         docker_image_url=plugin_in.docker_image_url,
+        image_digest=plugin_in.image_digest
+        or image_digest_from_url(plugin_in.docker_image_url),
         input_schema=plugin_in.input_schema,
         output_schema=plugin_in.output_schema,
     )
+
+
+def _add_version(db: Session, plugin_in: PluginCreate) -> PluginModel:
+    """Insert a new plugin version, rejecting duplicates"""
+    existing = (
+        db.query(PluginModel.id)
+        .filter(
+            PluginModel.name == plugin_in.name,
+            PluginModel.version == plugin_in.version,
+        )
+        .first()
+    )
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Plugin version already exists; versions are immutable",
+        )
+
+    db_plugin = _new_version(plugin_in)
     db.add(db_plugin)
     db.commit()
     db.refresh(db_plugin)
+    return db_plugin
+
+
+@router.post("", response_model=Plugin, status_code=status.HTTP_201_CREATED)
+async def create_plugin(
+    plugin_in: PluginCreate,
+    db: Session = Depends(get_db),
+    events: PluginEventPublisher = Depends(get_plugin_event_publisher),
+):
+    """
+    Create new plugin version.
+
+    Register a plugin, or a new version of an existing plugin.
+    """
+    db_plugin = _add_version(db, plugin_in)
+
+    events.publish("created", db_plugin.name, db_plugin.version)
 
     return db_plugin
 
 
+@router.post("/bulk", response_model=PluginBulkResult)
+async def bulk_upsert_plugins(
+    bulk_in: PluginBulkUpsert,
+    db: Session = Depends(get_db),
+    events: PluginEventPublisher = Depends(get_plugin_event_publisher),
+):
+    """
+    Register plugin versions in bulk.
+
+    Versions that are not registered yet are created in one transaction;
+    identical ones are left alone. A version whose registered content
+    differs is a conflict (versions are immutable), and any conflict
+    rejects the whole batch. With `dry_run`, only report the diff.
+    With `prepull`, ask workers to pull the images of created versions.
+    """
+    names = {plugin_in.name for plugin_in in bulk_in.plugins}
+    existing = {
+        (plugin.name, plugin.version): plugin
+        for plugin in db.query(PluginModel).filter(PluginModel.name.in_(names))
+    }
+
+    new_versions = {}
+    unchanged, conflicts = [], []
+    for plugin_in in bulk_in.plugins:
+        key = (plugin_in.name, plugin_in.version)
+        label = f"{plugin_in.name}@{plugin_in.version}"
+        candidate = _new_version(plugin_in)
+        current = existing.get(key) or new_versions.get(key)
+        if current is None:
+            new_versions[key] = candidate
+        elif all(
+            getattr(current, field) == getattr(candidate, field)
+            for field in VERSION_FIELDS
+        ):
+            if key in existing and label not in unchanged:
+                unchanged.append(label)
+        elif label not in conflicts:
+            conflicts.append(label)
+
+    result = {
+        "created": [f"{name}@{version}" for name, version in new_versions],
+        "unchanged": unchanged,
+        "conflicts": conflicts,
+        "applied": False,
+    }
+    if bulk_in.dry_run:
+        return result
+    if conflicts:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=result,
+        )
+
+    db.add_all(new_versions.values())
+    db.commit()
+    result["applied"] = True
+
+    for plugin in new_versions.values():
+        events.publish("created", plugin.name, plugin.version)
+        if bulk_in.prepull:
+            events.publish(
+                "prepull",
+                plugin.name,
+                plugin.version,
+                details={
+                    "docker_image_url": plugin.docker_image_url,
+                    "image_digest": plugin.image_digest,
+                },
+            )
+
+    return result
+
+
 @router.get("", response_model=PluginList)
 async def list_plugins(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     name: Optional[str] = None,
+    q: Optional[str] = Query(None, max_length=200),
+    after_id: Optional[int] = Query(
+        None, description="Return versions with a larger id, in id order"
+    ),
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
 ):
     """
     List plugins.
 
-    Retrieve paginated list of all registered plugins.
+    Retrieve paginated list of all registered plugin versions, newest first.
+    With `q`, search names and descriptions and order by relevance.
+    With `after_id` (and no `q`), page by id instead of offset, so versions
+    added or removed meanwhile do not shift later pages.
+    Supports conditional requests via ETag / If-None-Match.
     """
     query = db.query(PluginModel)
 
-    # Filter by name if provided
+    # Filter by name if provided (indexed by the trigram index on Postgres)
     if name:
         query = query.filter(PluginModel.name.contains(name))
 
-    # Get total count
-    total = query.count()
-
-    # Get paginated plugins
-    plugins = (
-        query.order_by(PluginModel.created_at.desc()).offset(skip).limit(limit).all()
-    )
+    # Row count and newest row version identify the result set; deletes
+    # change the count, inserts and updates the newest version
+    total, last_updated = query.with_entities(
+        func.count(PluginModel.id), func.max(PluginModel.updated_at)
+    ).one()
+    etag = make_etag("plugins", total, last_updated, skip, limit, name, q, after_id)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, PLUGIN_CACHE_CONTROL)
+
+    if q:
+        total, plugins = search_plugins(db, query, q, skip, limit)
+    elif after_id is not None:
+        plugins = (
+            query.filter(PluginModel.id > after_id)
+            .order_by(PluginModel.id)
+            .limit(limit)
+            .all()
+        )
+    else:
+        # Get paginated plugins; id breaks ties between versions created in
+        # one transaction
+        plugins = (
+            query.order_by(PluginModel.created_at.desc(), PluginModel.id.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
 
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = PLUGIN_CACHE_CONTROL
     return {
         "total": total,
         "items": plugins,
     }
 
 
+def _get_plugin_version(
+    db: Session,
+    name: str,
+    ref: str,
+    response: Response,
+    if_none_match: Optional[str],
+):
+    """Serve one plugin version by exact version, alias or "latest" """
+    resolved = resolve_version(db, name, ref)
+    if resolved is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Plugin not found",
+        )
+
+    # Version rows never change, so the resolved identity is the ETag
+    plugin_id, version = resolved
+    etag = make_etag("plugin", plugin_id, name, version)
+    cache_control = IMMUTABLE_CACHE_CONTROL if is_version(ref) else PLUGIN_CACHE_CONTROL
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, cache_control)
+
+    plugin = db.get(PluginModel, plugin_id)
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    return plugin
+
+
 @router.get("/{name}", response_model=Plugin)
 async def get_plugin(
     name: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
 ):
     """
     Get plugin by name.
 
-    Retrieve detailed information about a specific plugin.
+    Retrieve the latest version of a specific plugin.
+    Supports conditional requests via ETag / If-None-Match.
     """
-    plugin = db.query(PluginModel).filter(PluginModel.name == name).first()
+    return _get_plugin_version(db, name, LATEST_ALIAS, response, if_none_match)
 
-    if not plugin:
+
+@router.get("/{name}/versions", response_model=PluginList)
+async def list_plugin_versions(
+    name: str,
+    db: Session = Depends(get_db),
+):
+    """
+    List plugin versions.
+
+    Retrieve every version of a plugin, newest version first.
+    """
+    versions = db.query(PluginModel).filter(PluginModel.name == name).all()
+
+    if not versions:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Plugin not found",
         )
 
-    return plugin
+    versions.sort(key=lambda plugin: version_key(plugin.version), reverse=True)
+    return {
+        "total": len(versions),
+        "items": versions,
+    }
 
 
-@router.put("/{name}", response_model=Plugin)
+@router.get("/{name}/versions/{ref}", response_model=Plugin)
+async def get_plugin_version(
+    name: str,
+    ref: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
+    """
+    Get plugin version.
+
+    Retrieve a plugin version by exact version, alias, or "latest".
+    Exact versions are served as immutable.
+    """
+    return _get_plugin_version(db, name, ref, response, if_none_match)
+
+
+@router.put("/{name}", response_model=Plugin, status_code=status.HTTP_201_CREATED)
 async def update_plugin(
     name: str,
     plugin_in: PluginUpdate,
     db: Session = Depends(get_db),
+    events: PluginEventPublisher = Depends(get_plugin_event_publisher),
 ):
     """
     Update plugin.
 
-    Update plugin information by name.
+    Publish a new version of a plugin. Fields that are not set are
+    carried over from the latest version; existing versions never change.
     """
-    plugin = db.query(PluginModel).filter(PluginModel.name == name).first()
+    resolved = resolve_version(db, name, LATEST_ALIAS)
 
-    if not plugin:
+    if not resolved:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Plugin not found",
         )
 
-    # Update fields
+    latest = db.get(PluginModel, resolved[0])
     update_data = plugin_in.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(plugin, field, value)
+    if "docker_image_url" in update_data and "image_digest" not in update_data:
+        # A new image invalidates the previous version's digest
+        update_data["image_digest"] = None
+    fields = {field: getattr(latest, field) for field in VERSION_FIELDS}
+    fields.update(update_data)
+
+    try:
+        plugin_create = PluginCreate(name=name, **fields)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=e.errors(include_url=False, include_context=False),
+        ) from e
+    plugin = _add_version(db, plugin_create)
 
-    db.commit()
-    db.refresh(plugin)
+    events.publish("created", plugin.name, plugin.version)
 
     return plugin
 
@@ -135,21 +391,145 @@ async def update_plugin(
 async def delete_plugin(
     name: str,
     db: Session = Depends(get_db),
+    events: PluginEventPublisher = Depends(get_plugin_event_publisher),
 ):
     """
     Delete plugin.
 
-    Remove a plugin from the registry.
+    Remove a plugin, with all of its versions and aliases, from the registry.
     """
-    plugin = db.query(PluginModel).filter(PluginModel.name == name).first()
+    deleted = db.query(PluginModel).filter(PluginModel.name == name).count()
 
-    if not plugin:
+    if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Plugin not found",
         )
 
+    db.query(PluginAliasModel).filter(PluginAliasModel.name == name).delete()
+    db.query(PluginModel).filter(PluginModel.name == name).delete()
+    db.commit()
+
+    events.publish("deleted", name)
+
+    return None
+
+
+@router.delete("/{name}/versions/{version}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_plugin_version(
+    name: str,
+    version: str,
+    db: Session = Depends(get_db),
+    events: PluginEventPublisher = Depends(get_plugin_event_publisher),
+):
+    """
+    Delete plugin version.
+
+    Remove one version of a plugin, and any aliases pointing at it.
+    """
+    plugin = (
+        db.query(PluginModel)
+        .filter(PluginModel.name == name, PluginModel.version == version)
+        .first()
+    )
+
+    if not plugin:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Plugin version not found",
+        )
+
+    db.query(PluginAliasModel).filter(
+        PluginAliasModel.name == name, PluginAliasModel.version == version
+    ).delete()
     db.delete(plugin)
     db.commit()
 
+    events.publish("deleted", name, version)
+
+    return None
+
+
+@router.get("/{name}/aliases", response_model=list[PluginAlias])
+async def list_plugin_aliases(
+    name: str,
+    db: Session = Depends(get_db),
+):
+    """
+    List plugin aliases.
+
+    Retrieve the explicit aliases of a plugin ("latest" is implicit).
+    """
+    return (
+        db.query(PluginAliasModel)
+        .filter(PluginAliasModel.name == name)
+        .order_by(PluginAliasModel.alias)
+        .all()
+    )
+
+
+@router.put("/{name}/aliases/{alias}", response_model=PluginAlias)
+async def set_plugin_alias(
+    name: str,
+    alias_in: PluginAliasUpdate,
+    alias: str = Path(..., max_length=50, pattern=r"^[a-z][a-z0-9-]*$"),
+    db: Session = Depends(get_db),
+    events: PluginEventPublisher = Depends(get_plugin_event_publisher),
+):
+    """
+    Set plugin alias.
+
+    Point an alias such as "stable" at an existing version.
+    """
+    if alias == LATEST_ALIAS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='"latest" always resolves to the highest version',
+        )
+
+    if not resolve_version(db, name, alias_in.version):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Plugin version not found",
+        )
+
+    db_alias = db.get(PluginAliasModel, (name, alias))
+    if db_alias is None:
+        db_alias = PluginAliasModel(name=name, alias=alias)
+        db.add(db_alias)
+    db_alias.version = alias_in.version
+    db.commit()
+    db.refresh(db_alias)
+
+    events.publish("alias_updated", name, db_alias.version)
+
+    return db_alias
+
+
+@router.delete("/{name}/aliases/{alias}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_plugin_alias(
+    name: str,
+    alias: str,
+    db: Session = Depends(get_db),
+    events: PluginEventPublisher = Depends(get_plugin_event_publisher),
+):
+    """
+    Delete plugin alias.
+
+    Remove an alias; the version it pointed at is kept.
+    """
+    db_alias = db.get(PluginAliasModel, (name, alias))
+
+    if not db_alias:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Plugin alias not found",
+        )
+
+    version = db_alias.version
+    db.delete(db_alias)
+    db.commit()
+
+    events.publish("alias_deleted", name, version)
+
     return None
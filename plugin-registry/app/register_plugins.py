@@ -0,0 +1,112 @@
+"""
+Register plugins from plugin.json manifests
+
+Scans a directory for */plugin.json, diffs the manifests against the
+registry and applies every new version in a single bulk request:
+
+    python -m app.register_plugins ../plugins --registry-url http://localhost:6901
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import List
+
+import httpx
+from pydantic import ValidationError
+
+from app.schemas.plugin import PluginCreate
+
+
+def load_manifest(path: Path) -> PluginCreate:
+    """
+    Load one plugin.json manifest.
+
+    Manifests name the image `docker_image`; `docker_image_url` is accepted too.
+
+    Args:
+        path: Path to plugin.json
+
+    Returns:
+        Validated plugin version
+
+    Raises:
+        ValueError: If the manifest is not valid JSON or not a valid plugin
+    """
+    try:
+        manifest = json.loads(path.read_text())
+        if "docker_image_url" not in manifest and "docker_image" in manifest:
+            manifest["docker_image_url"] = manifest.pop("docker_image")
+        return PluginCreate.model_validate(manifest)
+    except (json.JSONDecodeError, ValidationError) as e:
+        raise ValueError(f"{path}: {e}") from e
+
+
+def scan_manifests(directory: Path) -> List[PluginCreate]:
+    """
+    Load every plugin manifest under a directory.
+
+    Args:
+        directory: Directory with one sub-directory per plugin
+
+    Returns:
+        Plugin versions, in path order
+    """
+    return [load_manifest(path) for path in sorted(directory.glob("*/plugin.json"))]
+
+
+def main(argv=None) -> int:
+    """Command line entry point; returns the process exit code"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("directory", type=Path, help="directory of plugins")
+    parser.add_argument("--registry-url", default="http://localhost:6901")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="show the diff without applying it"
+    )
+    parser.add_argument(
+        "--prepull", action="store_true", help="have workers pull new images"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        plugins = scan_manifests(args.directory)
+    except ValueError as e:
+        print(f"Invalid manifest: {e}", file=sys.stderr)
+        return 1
+    if not plugins:
+        print(f"No plugin.json manifests found in {args.directory}")
+        return 0
+
+    response = httpx.post(
+        f"{args.registry_url.rstrip('/')}/api/v1/plugins/bulk",
+        json={
+            "plugins": [plugin.model_dump() for plugin in plugins],
+            "dry_run": args.dry_run,
+            "prepull": args.prepull,
+        },
+        timeout=60.0,
+    )
+    if response.status_code not in (200, 409):
+        print(f"Registry error {response.status_code}: {response.text}")
+        return 1
+
+    result = response.json()
+    if response.status_code == 409:
+        result = result["detail"]
+    for label in result["created"]:
+        print(f"+ {label}")
+    for label in result["unchanged"]:
+        print(f"= {label}")
+    for label in result["conflicts"]:
+        print(f"! {label} differs from the registered version (bump its version)")
+
+    if result["applied"]:
+        print(f"Registered {len(result['created'])} plugin version(s)")
+    elif not args.dry_run:
+        print("Nothing applied", file=sys.stderr)
+    return 1 if result["conflicts"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,7 +5,7 @@ Pydantic schemas for Plugin entity
 from datetime import datetime
 from typing import Any, Dict, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
 class PluginBase(BaseModel):
@@ -15,6 +15,7 @@ class PluginBase(BaseModel):
     version: str = Field(..., pattern=r"^\d+\.\d+\.\d+$")
     description: Optional[str] = None
     docker_image_url: str
+    image_digest: Optional[str] = Field(None, pattern=r"^sha256:[a-f0-9]{64}$")
 
 
 class PluginCreate(PluginBase):
@@ -25,14 +26,23 @@ class PluginCreate(PluginBase):
 
 
 class PluginUpdate(BaseModel):
-    """Schema for updating a plugin"""
+    """Schema for publishing a new version derived from the latest one"""
 
-    version: Optional[str] = Field(None, pattern=r"^\d+\.\d+\.\d+$")
+    version: str = Field(..., pattern=r"^\d+\.\d+\.\d+$")
     description: Optional[str] = None
     docker_image_url: Optional[str] = None
+    image_digest: Optional[str] = Field(None, pattern=r"^sha256:[a-f0-9]{64}$")
     input_schema: Optional[Dict[str, Any]] = None
     output_schema: Optional[Dict[str, Any]] = None
 
+    @field_validator("docker_image_url")
+    @classmethod
+    def image_not_null(cls, value: Optional[str]) -> str:
+        """Every version needs an image; omit the field to keep the latest's"""
+        if value is None:
+            raise ValueError("docker_image_url cannot be null")
+        return value
+
 
 class PluginInDB(PluginBase):
     """Schema for plugin in database"""
@@ -41,6 +51,7 @@ class PluginInDB(PluginBase):
     input_schema: Optional[Dict[str, Any]] = None
     output_schema: Optional[Dict[str, Any]] = None
     created_at: datetime
+    updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -57,3 +68,38 @@ class PluginList(BaseModel):
 
     total: int
     items: list[Plugin]
+
+
+class PluginAliasUpdate(BaseModel):
+    """Schema for pointing an alias at a version"""
+
+    version: str = Field(..., pattern=r"^\d+\.\d+\.\d+$")
+
+
+class PluginAlias(BaseModel):
+    """Schema for plugin alias response"""
+
+    name: str
+    alias: str
+    version: str
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class PluginBulkUpsert(BaseModel):
+    """Schema for registering many plugin versions at once"""
+
+    plugins: list[PluginCreate] = Field(..., max_length=1000)
+    dry_run: bool = False
+    prepull: bool = False
+
+
+class PluginBulkResult(BaseModel):
+    """Schema for bulk registration result, as "name@version" lists"""
+
+    created: list[str]
+    unchanged: list[str]
+    conflicts: list[str]
+    applied: bool
@@ -0,0 +1,122 @@
+"""
+Plugin change event publisher
+Lets api-agent instances invalidate their cached plugin metadata and asks
+Ray workers to pre-pull the images of new plugin versions. Events are sent
+from one background thread that owns the pika connection, so request
+handlers never wait on the broker
+"""
+
+import json
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import pika
+from pika.adapters.blocking_connection import BlockingChannel, BlockingConnection
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Fanout exchange every api-agent and worker process binds its own queue to
+PLUGIN_EVENTS_EXCHANGE = "plugin_events"
+
+
+class PluginEventPublisher:
+    """Publishes plugin version and alias change events to RabbitMQ"""
+
+    def __init__(self):
+        self.connection: Optional[BlockingConnection] = None
+        self.channel: Optional[BlockingChannel] = None
+        # pika connections are not thread-safe; only this thread uses it
+        self.executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="plugin-events"
+        )
+        self.retry_at = 0.0
+
+    def connect(self):
+        """Establish connection to RabbitMQ"""
+        parameters = pika.URLParameters(settings.RABBITMQ_URL)
+        self.connection = pika.BlockingConnection(parameters)
+        self.channel = self.connection.channel()
+        self.channel.exchange_declare(
+            exchange=PLUGIN_EVENTS_EXCHANGE,
+            exchange_type="fanout",
+            durable=True,
+        )
+        logger.info("Connected to RabbitMQ")
+
+    def publish(
+        self,
+        event: str,
+        name: str,
+        version: Optional[str] = None,
+        details: Optional[Dict[str, Any]] = None,
+    ) -> Future:
+        """
+        Queue a plugin change event for publishing.
+
+        Failures are logged, not raised: the change is already committed and
+        consumers' cache TTL bounds how long they can serve stale metadata.
+        For RABBITMQ_RECONNECT_SECONDS after a failure, events are dropped
+        instead of each waiting out another connect timeout.
+
+        Args:
+            event: created, deleted, alias_updated, alias_deleted or prepull
+            name: Plugin name
+            version: Plugin version affected (None for the whole plugin)
+            details: Extra event fields (e.g. the image to pre-pull)
+
+        Returns:
+            Future done once the event was sent or dropped
+        """
+        message = {
+            "event": event,
+            "name": name,
+            "version": version,
+            "occurred_at": datetime.utcnow().isoformat(),
+            **(details or {}),
+        }
+        return self.executor.submit(self._send, message)
+
+    def _send(self, message: Dict[str, Any]):
+        """Publish an event on the publisher thread"""
+        name, event = message["name"], message["event"]
+        if time.monotonic() < self.retry_at:
+            logger.warning(
+                f"RabbitMQ unavailable, dropped plugin event: {name} {event}"
+            )
+            return
+        try:
+            if not self.connection or self.connection.is_closed:
+                self.connect()
+            self.channel.basic_publish(
+                exchange=PLUGIN_EVENTS_EXCHANGE,
+                routing_key="",
+                body=json.dumps(message),
+                properties=pika.BasicProperties(content_type="application/json"),
+            )
+            logger.info(f"Published plugin event: {name} {event}")
+        except Exception as e:
+            logger.error(f"Failed to publish plugin event for {name}: {e}")
+            self.connection = None
+            self.retry_at = time.monotonic() + settings.RABBITMQ_RECONNECT_SECONDS
+
+    def close(self):
+        """Send queued events, then close the RabbitMQ connection"""
+        self.executor.submit(self._close).result()
+
+    def _close(self):
+        if self.connection and not self.connection.is_closed:
+            self.connection.close()
+
+
+# Global instance
+plugin_event_publisher = PluginEventPublisher()
+
+
+def get_plugin_event_publisher() -> PluginEventPublisher:
+    """Get plugin event publisher instance"""
+    return plugin_event_publisher
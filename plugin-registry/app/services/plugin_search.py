@@ -0,0 +1,164 @@
+"""
+Ranked plugin search over name and description
+Postgres answers from its trigram and full-text GIN indexes; other backends
+(SQLite in tests) use an in-memory trigram index rebuilt when the table
+changes
+"""
+
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Query, Session
+
+from app.models.plugin import SEARCH_DOCUMENT, Plugin as PluginModel
+
+# Same cut-off as pg_trgm's default similarity_threshold
+SIMILARITY_THRESHOLD = 0.3
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def trigrams(text: Optional[str]) -> Set[str]:
+    """
+    Split text into trigrams the way pg_trgm does.
+
+    Args:
+        text: Text to index or search for
+
+    Returns:
+        Trigrams of every word, each word padded with two leading and one
+        trailing space
+    """
+    grams = set()
+    for word in _WORD.findall((text or "").lower()):
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class PluginSearchIndex:
+    """In-memory trigram index of plugin names and descriptions"""
+
+    def __init__(self):
+        self._stamp = None
+        self._name_postings: Dict[str, Set[int]] = {}
+        self._description_postings: Dict[str, Set[int]] = {}
+        self._name_sizes: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def refresh(self, db: Session) -> None:
+        """
+        Rebuild the index if the plugins table changed since the last build.
+
+        Args:
+            db: Database session
+        """
+        stamp = db.query(
+            func.count(PluginModel.id), func.max(PluginModel.updated_at)
+        ).one()
+        with self._lock:
+            if stamp == self._stamp:
+                return
+
+        name_postings: Dict[str, Set[int]] = {}
+        description_postings: Dict[str, Set[int]] = {}
+        name_sizes: Dict[int, int] = {}
+        rows = db.query(PluginModel.id, PluginModel.name, PluginModel.description)
+        for plugin_id, name, description in rows:
+            name_grams = trigrams(name)
+            name_sizes[plugin_id] = len(name_grams)
+            for gram in name_grams:
+                name_postings.setdefault(gram, set()).add(plugin_id)
+            for gram in trigrams(description):
+                description_postings.setdefault(gram, set()).add(plugin_id)
+
+        with self._lock:
+            self._stamp = stamp
+            self._name_postings = name_postings
+            self._description_postings = description_postings
+            self._name_sizes = name_sizes
+
+    def search(self, q: str) -> List[Tuple[int, float]]:
+        """
+        Rank plugins against a search query.
+
+        Only the posting lists of the query's trigrams are visited, so the
+        cost depends on the matches rather than the catalog size.
+
+        Args:
+            q: Search query
+
+        Returns:
+            (plugin id, score) pairs, best match first
+        """
+        query_grams = trigrams(q)
+        if not query_grams:
+            return []
+
+        with self._lock:
+            name_hits = Counter()
+            description_hits = Counter()
+            for gram in query_grams:
+                name_hits.update(self._name_postings.get(gram, ()))
+                description_hits.update(self._description_postings.get(gram, ()))
+            name_sizes = self._name_sizes
+
+        scores = {}
+        for plugin_id in name_hits.keys() | description_hits.keys():
+            shared = name_hits[plugin_id]
+            # pg_trgm similarity() on the name, share of the query in the text
+            name_score = shared / (len(query_grams) + name_sizes[plugin_id] - shared)
+            description_score = description_hits[plugin_id] / len(query_grams)
+            if max(name_score, description_score) >= SIMILARITY_THRESHOLD:
+                scores[plugin_id] = name_score + description_score
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+# Global instance
+plugin_search_index = PluginSearchIndex()
+
+
+def search_plugins(
+    db: Session, query: Query, q: str, skip: int, limit: int
+) -> Tuple[int, List[PluginModel]]:
+    """
+    Run a ranked search within a plugin query.
+
+    Args:
+        db: Database session
+        query: Plugin query carrying any other filters
+        q: Search query
+        skip: Number of results to skip
+        limit: Maximum number of results
+
+    Returns:
+        (total matches, page of plugins ordered by relevance)
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        ts_query = func.websearch_to_tsquery("simple", q)
+        matches = query.filter(
+            or_(SEARCH_DOCUMENT.op("@@")(ts_query), PluginModel.name.op("%")(q))
+        )
+        rank = func.ts_rank(SEARCH_DOCUMENT, ts_query) + func.similarity(
+            PluginModel.name, q
+        )
+        plugins = (
+            matches.order_by(rank.desc(), PluginModel.created_at.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+        return matches.count(), plugins
+
+    plugin_search_index.refresh(db)
+    ranked = plugin_search_index.search(q)
+    if not ranked:
+        return 0, []
+
+    position = {plugin_id: i for i, (plugin_id, _) in enumerate(ranked)}
+    plugins = query.filter(PluginModel.id.in_(position)).all()
+    plugins.sort(key=lambda plugin: position[plugin.id])
+    return len(plugins), plugins[skip : skip + limit]
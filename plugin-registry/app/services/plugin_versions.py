@@ -0,0 +1,70 @@
+"""
+Plugin version and alias resolution
+Versions are immutable; a reference is either an exact version, an alias
+such as "stable", or the implicit "latest" (highest version)
+"""
+
+import re
+from typing import Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.plugin import Plugin as PluginModel, PluginAlias
+
+LATEST_ALIAS = "latest"
+
+VERSION_PATTERN = re.compile(r"^\d+\.\d+\.\d+$")
+DIGEST_PATTERN = re.compile(r"^sha256:[a-f0-9]{64}$")
+
+
+def is_version(ref: str) -> bool:
+    """Check whether a reference is an exact version rather than an alias"""
+    return bool(VERSION_PATTERN.match(ref))
+
+
+def version_key(version: str) -> Tuple[int, ...]:
+    """Sort key ordering versions numerically (1.10.0 after 1.9.0)"""
+    return tuple(int(part) for part in version.split("."))
+
+
+def image_digest_from_url(image_url: str) -> Optional[str]:
+    """
+    Extract the digest from a digest-pinned image reference.
+
+    Args:
+        image_url: Image reference, e.g. "repo/name@sha256:..."
+
+    Returns:
+        The "sha256:..." digest, or None if the reference is not pinned
+    """
+    _, _, digest = image_url.partition("@")
+    return digest if DIGEST_PATTERN.match(digest) else None
+
+
+def resolve_version(db: Session, name: str, ref: str) -> Optional[Tuple[int, str]]:
+    """
+    Resolve a version reference without loading the plugin row.
+
+    Args:
+        db: Database session
+        name: Plugin name
+        ref: Exact version, alias, or "latest"
+
+    Returns:
+        (id, version) of the referenced plugin version, or None if unknown
+    """
+    query = db.query(PluginModel.id, PluginModel.version).filter(
+        PluginModel.name == name
+    )
+
+    if is_version(ref):
+        row = query.filter(PluginModel.version == ref).first()
+    elif ref == LATEST_ALIAS:
+        row = max(query.all(), key=lambda r: version_key(r.version), default=None)
+    else:
+        alias = db.get(PluginAlias, (name, ref))
+        if alias is None:
+            return None
+        row = query.filter(PluginModel.version == alias.version).first()
+
+    return (row.id, row.version) if row else None
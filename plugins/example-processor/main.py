@@ -10,6 +10,22 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+PROGRESS_FRAME_PREFIX = "##progress "
+
+
+def report_progress(percent, message=None, partial=None):
+    """
+    Report progress to the worker as a framed line on stderr.
+
+    Args:
+        percent: Completion percentage (0-100)
+        message: Optional human-readable status
+        partial: Optional JSON-serializable partial output
+    """
+    frame = {"percent": percent, "message": message, "partial": partial}
+    sys.stderr.write(PROGRESS_FRAME_PREFIX + json.dumps(frame) + "\n")
+    sys.stderr.flush()
+
 
 def process(input_data):
     """
@@ -28,6 +44,8 @@ def process(input_data):
         if not data:
             raise ValueError("No data provided")
 
+        report_progress(0, f"Running '{operation}' over {len(data)} values")
+
         # Simple data processing operations
         if operation == "sum":
             result_value = sum(data)
@@ -40,6 +58,8 @@ def process(input_data):
         else:
             raise ValueError(f"Unknown operation: {operation}")
 
+        report_progress(100, "Done", partial={"result": result_value})
+
         return {
             "operation": operation,
             "result": result_value,
@@ -5,14 +5,115 @@ Implementation from blueprint specification
 
 import json
 import logging
+import queue
+import threading
+from datetime import datetime
+from typing import List, Optional
 
 import docker
 import pika
 import ray
 
+from pipeline import (
+    PipelineError,
+    PipelineStepFailed,
+    build_step_input,
+    collect_steps,
+    final_step,
+    pipeline_order,
+    step_summary,
+    submit_steps,
+)
+from plugin_schemas import PluginSchemaCache, compile_schema, describe_errors
+from progress import (
+    ProgressThrottle,
+    parse_progress_line,
+    strip_progress_frames,
+)
+from status_codec import encode_status_message
+from status_coalescer import StatusCoalescer
+
 logger = logging.getLogger(__name__)
 
 
+def _schema_errors(schema: Optional[dict], instance) -> List[str]:
+    validator = compile_schema(schema)
+    return describe_errors(validator, instance) if validator is not None else []
+
+
+@ray.remote(num_returns=2)
+def run_pipeline_step(
+    step: dict,
+    input_schema: Optional[dict],
+    output_schema: Optional[dict],
+    read_from: List[str],
+    *upstream,
+):
+    """
+    Run one step of a pipeline job in its own container.
+
+    `upstream` holds the outputs of the steps in `read_from`, followed by the
+    summaries of steps only waited for. Ray resolves them from the object
+    store before the task starts, so step outputs never pass through the
+    actor, RabbitMQ or the database.
+
+    Args:
+        step: Step definition, pinned to a plugin version and image
+        input_schema: Plugin input_schema, checked once the input is assembled
+        output_schema: Plugin output_schema
+        read_from: Steps whose outputs lead `upstream`
+
+    Returns:
+        Tuple of (step output, step summary), stored as separate objects so
+        summaries can be collected without fetching outputs
+
+    Raises:
+        PipelineStepFailed: If the step cannot produce a valid output
+    """
+    name = step["name"]
+    try:
+        input_data = build_step_input(
+            step, dict(zip(read_from, upstream, strict=False))
+        )
+    except PipelineError as e:
+        raise PipelineStepFailed(name, str(e)) from e
+    errors = _schema_errors(input_schema, input_data)
+    if errors:
+        raise PipelineStepFailed(name, "Invalid input: " + "; ".join(errors))
+
+    started_at = datetime.utcnow()
+    try:
+        container = docker.from_env().containers.run(
+            step["docker_image_url"],
+            command=["python", "main.py", json.dumps(input_data)],
+            detach=True,
+            remove=False,  # Keep container for log retrieval
+        )
+        try:
+            result = container.wait()
+            stdout = container.logs(stdout=True, stderr=False).decode("utf-8")
+            logs = strip_progress_frames(container.logs().decode("utf-8"))
+        finally:
+            # Also stops the container if the step is cancelled
+            container.remove(force=True)
+    except Exception as e:
+        raise PipelineStepFailed(name, str(e)) from e
+
+    if result["StatusCode"] != 0:
+        raise PipelineStepFailed(name, logs)
+    try:
+        output = json.loads(stdout)
+    except json.JSONDecodeError as e:
+        raise PipelineStepFailed(name, f"Invalid JSON output: {stdout}") from e
+    errors = _schema_errors(output_schema, output)
+    if errors:
+        raise PipelineStepFailed(name, "Invalid output: " + "; ".join(errors))
+
+    return output, step_summary(
+        step, "completed", started_at, datetime.utcnow(), output
+    )
+
+
 @ray.remote
 class PluginExecutorActor:
     """
@@ -22,15 +123,34 @@ class PluginExecutorActor:
     and reports status updates back via RabbitMQ.
     """
 
-    def __init__(self, rabbitmq_url: str):
+    def __init__(
+        self,
+        rabbitmq_url: str,
+        status_coalesce_window_ms: int = 0,
+        progress_min_interval_ms: int = 1000,
+        plugin_registry_url: Optional[str] = None,
+        status_encoding: str = "msgpack",
+        status_compress_min_bytes: int = 0,
+    ):
         """
         Initialize the PluginExecutorActor.
 
         Args:
             rabbitmq_url: RabbitMQ connection URL
+            status_coalesce_window_ms: How long to hold 'processing' updates so
+                a quick terminal update can replace them (0 disables)
+            progress_min_interval_ms: Minimum time between progress events
+                forwarded for one job
+            plugin_registry_url: Plugin Registry URL used to fetch plugin
+                schemas for input/output validation (None disables it)
+            status_encoding: Wire encoding of status messages (msgpack, json)
+            status_compress_min_bytes: zstd-compress status messages at least
+                this large (0 disables compression)
         """
         self.docker_client = docker.from_env()
         self.rabbitmq_url = rabbitmq_url
+        self.status_encoding = status_encoding
+        self.status_compress_min_bytes = status_compress_min_bytes
 
         # Setup RabbitMQ connection
         parameters = pika.URLParameters(rabbitmq_url)
@@ -40,9 +160,28 @@ class PluginExecutorActor:
         # Declare status queue
         self.channel.queue_declare(queue="status_queue", durable=True)
 
+        self.status_coalescer = StatusCoalescer(
+            publish=self._publish_status,
+            window_seconds=status_coalesce_window_ms / 1000,
+        )
+        self.progress_throttle = ProgressThrottle(
+            publish=self._publish_progress,
+            min_interval_seconds=progress_min_interval_ms / 1000,
+        )
+        self.plugin_schemas = (
+            PluginSchemaCache(plugin_registry_url) if plugin_registry_url else None
+        )
+
         logger.info("PluginExecutorActor initialized")
 
-    def execute_plugin(self, job_id: int, image_url: str, input_data: dict) -> None:
+    def execute_plugin(
+        self,
+        job_id: int,
+        image_url: str,
+        input_data: dict,
+        plugin_name: Optional[str] = None,
+        plugin_version: Optional[str] = None,
+    ) -> None:
         """
         Execute a plugin container.
 
@@ -50,10 +189,26 @@ class PluginExecutorActor:
             job_id: Job ID
             image_url: Docker image URL for the plugin
             input_data: Input data to pass to the plugin
+            plugin_name: Plugin name, for schema validation
+            plugin_version: Plugin version the job was submitted against
         """
         logger.info(f"Executing plugin for job {job_id} with image {image_url}")
 
-        # Update status to 'processing'
+        # Pre-flight: don't spend a container launch on input that can't work
+        validators = self._get_validators(plugin_name, plugin_version)
+        if validators is not None and validators.input is not None:
+            errors = describe_errors(validators.input, input_data)
+            if errors:
+                self._update_status(
+                    job_id,
+                    "failed",
+                    error_message="Invalid input: " + "; ".join(errors),
+                )
+                logger.error(f"Job {job_id} rejected by input_schema pre-flight")
+                return
+
+        # Update status to 'processing' (held briefly, see StatusCoalescer)
+        started_at = datetime.utcnow().isoformat()
         self._update_status(job_id, "processing")
 
         try:
@@ -61,14 +216,17 @@ class PluginExecutorActor:
             # Pass input_data as command line argument
             container = self.docker_client.containers.run(
                 image_url,
-                command=f"python main.py '{json.dumps(input_data)}'",
+                command=["python", "main.py", json.dumps(input_data)],
                 detach=True,
                 remove=False,  # Keep container for log retrieval
             )
 
-            # Wait for container to finish
-            result = container.wait()
-            logs = container.logs().decode("utf-8")
+            # Wait for container to finish, forwarding progress as it runs
+            result = self._follow_container(job_id, container)
+            # stdout carries the result; stderr carries logs and progress
+            stdout = container.logs(stdout=True, stderr=False).decode("utf-8")
+            logs = strip_progress_frames(container.logs().decode("utf-8"))
+            self.progress_throttle.discard(job_id)
 
             # Clean up container
             container.remove()
@@ -77,30 +235,268 @@ class PluginExecutorActor:
             if result["StatusCode"] == 0:
                 # Success - parse output from stdout
                 try:
-                    output = json.loads(logs)
-                    self._update_status(job_id, "completed", result=output)
-                    logger.info(f"Job {job_id} completed successfully")
+                    output = json.loads(stdout)
+                    output_errors = (
+                        describe_errors(validators.output, output)
+                        if validators is not None and validators.output is not None
+                        else []
+                    )
+                    if output_errors:
+                        self._update_status(
+                            job_id,
+                            "failed",
+                            error_message="Invalid output: " + "; ".join(output_errors),
+                            started_at=started_at,
+                        )
+                        logger.error(f"Job {job_id} output violates output_schema")
+                    else:
+                        self._update_status(
+                            job_id, "completed", result=output, started_at=started_at
+                        )
+                        logger.info(f"Job {job_id} completed successfully")
                 except json.JSONDecodeError:
                     # If output is not valid JSON, treat as error
                     self._update_status(
                         job_id,
                         "failed",
-                        error_message=f"Invalid JSON output: {logs}",
+                        error_message=f"Invalid JSON output: {stdout}",
+                        started_at=started_at,
                     )
             else:
                 # Failure - report error
-                self._update_status(job_id, "failed", error_message=logs)
+                self._update_status(
+                    job_id, "failed", error_message=logs, started_at=started_at
+                )
                 logger.error(
                     f"Job {job_id} failed with exit code {result['StatusCode']}"
                 )
 
         except Exception as e:
             # Exception during execution
+            self.progress_throttle.discard(job_id)
             error_msg = str(e)
-            self._update_status(job_id, "failed", error_message=error_msg)
+            self._update_status(
+                job_id, "failed", error_message=error_msg, started_at=started_at
+            )
             logger.error(f"Job {job_id} failed with exception: {error_msg}")
 
-    def _update_status(self, job_id: int, status: str, result=None, error_message=None):
+    def execute_pipeline(self, job_id: int, pipeline: dict) -> None:
+        """
+        Execute a pipeline job.
+
+        Every step is submitted up front as a Ray task waiting on the steps
+        it depends on, so independent branches run in parallel and outputs
+        move between steps through the object store. Only the final step's
+        output, and the step summaries if the job asked for them, are
+        reported to status_queue.
+
+        Args:
+            job_id: Job ID
+            pipeline: Pipeline from the job message, with "steps" pinned to
+                plugin versions and images and a "step_summaries" flag
+        """
+        steps = pipeline["steps"]
+        logger.info(f"Executing pipeline of {len(steps)} steps for job {job_id}")
+        try:
+            ordered = pipeline_order(steps)
+            final = final_step(steps)
+        except PipelineError as e:
+            self._update_status(
+                job_id, "failed", error_message=f"Invalid pipeline: {e}"
+            )
+            logger.error(f"Job {job_id} has an invalid pipeline: {e}")
+            return
+
+        started_at = datetime.utcnow().isoformat()
+        self._update_status(job_id, "processing")
+
+        outputs, summaries = submit_steps(ordered, self._submit_step)
+        step_results = collect_steps(
+            ordered,
+            summaries,
+            self._wait_for_steps,
+            ray.get,
+            ray.cancel,
+            lambda step, done: self._publish_step_progress(
+                job_id, step, done, len(ordered)
+            ),
+        )
+        self.progress_throttle.discard(job_id)
+        report = step_results if pipeline.get("step_summaries") else None
+        failed = next((s for s in step_results if s["status"] == "failed"), None)
+        if failed is not None:
+            self._update_status(
+                job_id,
+                "failed",
+                error_message=f"Step {failed['name']!r} failed: "
+                f"{failed['error_message']}",
+                started_at=started_at,
+                steps=report,
+            )
+            logger.error(f"Job {job_id} failed at pipeline step {failed['name']}")
+            return
+
+        self._update_status(
+            job_id,
+            "completed",
+            result=ray.get(outputs[final["name"]]),
+            started_at=started_at,
+            steps=report,
+        )
+        logger.info(f"Job {job_id} pipeline completed successfully")
+
+    def _submit_step(self, step: dict, read_from: List[str], upstream: list):
+        """
+        Submit one pipeline step as a Ray task.
+
+        Returns:
+            Tuple of (output ref, summary ref)
+        """
+        validators = self._get_validators(
+            step["plugin_name"], step.get("plugin_version")
+        )
+        return run_pipeline_step.remote(
+            step,
+            validators.input.schema if validators and validators.input else None,
+            validators.output.schema if validators and validators.output else None,
+            read_from,
+            *upstream,
+        )
+
+    def _wait_for_steps(self, refs: List[ray.ObjectRef]) -> List[ray.ObjectRef]:
+        """
+        Wait for a pipeline step to finish, flushing due updates meanwhile.
+
+        Returns:
+            The refs that are ready; none if an update fell due first
+        """
+        self.status_coalescer.flush_due()
+        self.progress_throttle.flush_due()
+        timeouts = [
+            t
+            for t in (
+                self.status_coalescer.time_until_flush(),
+                self.progress_throttle.time_until_flush(),
+            )
+            if t is not None
+        ]
+        ready, _ = ray.wait(
+            refs, num_returns=1, timeout=min(timeouts) if timeouts else None
+        )
+        return ready
+
+    def _publish_step_progress(
+        self, job_id: int, step: dict, done: int, total: int
+    ) -> None:
+        """Report a completed pipeline step as job progress"""
+        self.progress_throttle.submit(
+            {
+                "job_id": job_id,
+                "status": "processing",
+                "progress": {
+                    "percent": 100.0 * done / total,
+                    "message": f"step {done}/{total}: {step['name']}",
+                    "partial": None,
+                },
+                "updated_at": datetime.utcnow().isoformat(),
+            }
+        )
+
+    def _get_validators(self, plugin_name, plugin_version):
+        """
+        Get cached schema validators for a plugin version.
+
+        Returns:
+            PluginValidators, or None if unavailable (validation is skipped)
+        """
+        if self.plugin_schemas is None or not plugin_name:
+            return None
+        return self.plugin_schemas.get(plugin_name, plugin_version)
+
+    def _follow_container(self, job_id: int, container) -> dict:
+        """
+        Wait for a container to exit while forwarding its progress frames.
+
+        stderr is tailed on a helper thread; all publishing stays on the actor
+        thread, which also flushes held status and progress updates when due.
+
+        Args:
+            job_id: Job ID
+            container: Running Docker container
+
+        Returns:
+            Container wait result with 'StatusCode'
+        """
+        events: queue.Queue = queue.Queue()
+        tail = threading.Thread(
+            target=self._tail_progress, args=(container, events), daemon=True
+        )
+        tail.start()
+
+        while True:
+            self.status_coalescer.flush_due()
+            self.progress_throttle.flush_due()
+            timeouts = [
+                t
+                for t in (
+                    self.status_coalescer.time_until_flush(),
+                    self.progress_throttle.time_until_flush(),
+                )
+                if t is not None
+            ]
+            try:
+                progress = events.get(timeout=min(timeouts) if timeouts else None)
+            except queue.Empty:
+                continue
+            if progress is None:
+                break
+            self.progress_throttle.submit(
+                {
+                    "job_id": job_id,
+                    "status": "processing",
+                    "progress": progress,
+                    "updated_at": datetime.utcnow().isoformat(),
+                }
+            )
+
+        return container.wait()
+
+    def _tail_progress(self, container, events: queue.Queue) -> None:
+        """
+        Read container stderr until it exits and queue parsed progress frames.
+
+        Args:
+            container: Running Docker container
+            events: Queue receiving progress dicts, then None at end of stream
+        """
+        buffer = ""
+        try:
+            for chunk in container.logs(
+                stream=True, follow=True, stdout=False, stderr=True
+            ):
+                buffer += chunk.decode("utf-8", errors="replace")
+                *lines, buffer = buffer.split("\n")
+                for line in lines:
+                    progress = parse_progress_line(line)
+                    if progress is not None:
+                        events.put(progress)
+            progress = parse_progress_line(buffer)
+            if progress is not None:
+                events.put(progress)
+        except Exception as e:
+            logger.warning(f"Stopped tailing container progress: {e}")
+        finally:
+            events.put(None)
+
+    def _update_status(
+        self,
+        job_id: int,
+        status: str,
+        result=None,
+        error_message=None,
+        started_at=None,
+        steps=None,
+    ):
         """
         Send status update to status_queue.
 
@@ -109,9 +505,10 @@ class PluginExecutorActor:
             status: New status (processing, completed, failed)
             result: Result data (for completed jobs)
             error_message: Error message (for failed jobs)
+            started_at: When execution started (for terminal updates, so it
+                survives a coalesced-away 'processing' update)
+            steps: Step summaries (for terminal updates of pipeline jobs)
         """
-        from datetime import datetime
-
         message = {
             "job_id": job_id,
             "status": status,
@@ -119,15 +516,45 @@ class PluginExecutorActor:
             "error_message": error_message,
             "updated_at": datetime.utcnow().isoformat(),
         }
+        if started_at is not None:
+            message["started_at"] = started_at
+        if steps is not None:
+            message["steps"] = steps
 
+        self.status_coalescer.submit(message)
+
+    def _publish_progress(self, message: dict):
+        """
+        Publish a progress message after any held 'processing' update.
+
+        Args:
+            message: Progress message
+        """
+        # A job reporting progress is not a short job; keep ordering intact
+        self.status_coalescer.flush()
+        self._publish_status(message)
+
+    def _publish_status(self, message: dict):
+        """
+        Publish a status message to status_queue.
+
+        Args:
+            message: Status message
+        """
+        body, content_type, content_encoding = encode_status_message(
+            message, self.status_encoding, self.status_compress_min_bytes
+        )
         self.channel.basic_publish(
             exchange="",
             routing_key="status_queue",
-            body=json.dumps(message),
+            body=body,
             properties=pika.BasicProperties(
                 delivery_mode=2,  # Persistent message
-                content_type="application/json",
+                content_type=content_type,
+                content_encoding=content_encoding,
             ),
         )
 
-        logger.info(f"Status update sent for job {job_id}: {status}")
+        logger.info(
+            f"Status update sent for job {message['job_id']}: {message['status']}"
+        )
@@ -0,0 +1,134 @@
+"""
+Per-owner fair-share scheduling
+
+Jobs are buffered in one virtual queue per owner and handed out with
+deficit round robin (DRR), so a user who submits a large batch cannot
+monopolize the actor pool. Owners can be given weights (share of dispatches
+per round) and concurrency caps (jobs running at once).
+"""
+
+import heapq
+import itertools
+from collections import defaultdict, deque
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class FairShareScheduler:
+    """Deficit round robin across owners, priority order within an owner"""
+
+    def __init__(
+        self,
+        weights: Optional[Dict[int, float]] = None,
+        max_concurrency: Optional[Dict[int, int]] = None,
+        default_weight: float = 1.0,
+        default_max_concurrency: int = 0,
+    ):
+        """
+        Initialize FairShareScheduler.
+
+        Args:
+            weights: Per-owner weight; an owner with weight 2 gets twice the
+                dispatches of a weight 1 owner while both have jobs waiting
+            max_concurrency: Per-owner cap on running jobs
+            default_weight: Weight of owners not listed in `weights`
+            default_max_concurrency: Cap for owners not listed in
+                `max_concurrency` (0 means unlimited)
+        """
+        self.weights = weights or {}
+        if default_weight <= 0 or any(w <= 0 for w in self.weights.values()):
+            raise ValueError("Fair-share weights must be positive")
+        self.max_concurrency = max_concurrency or {}
+        self.default_weight = default_weight
+        self.default_max_concurrency = default_max_concurrency
+
+        self.queues: Dict[int, List[Tuple[int, int, Any]]] = {}
+        self.active: deque = deque()
+        self.deficit: Dict[int, float] = {}
+        self.running: Dict[int, int] = defaultdict(int)
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in self.queues.values())
+
+    def buffered(self, owner_id: int) -> int:
+        """Number of an owner's jobs waiting in its virtual queue"""
+        return len(self.queues.get(owner_id, ()))
+
+    def dispatchable(self) -> int:
+        """Number of buffered jobs whose owner is below its concurrency cap"""
+        return sum(
+            len(queue)
+            for owner_id, queue in self.queues.items()
+            if self._under_cap(owner_id)
+        )
+
+    def push(self, owner_id: int, item: Any, priority: int = 0) -> None:
+        """
+        Buffer a job in its owner's virtual queue.
+
+        Args:
+            owner_id: Job owner
+            item: Job to dispatch later
+            priority: Higher priority jobs of the same owner go first
+        """
+        if owner_id not in self.queues:
+            self.queues[owner_id] = []
+            self.active.append(owner_id)
+            self.deficit[owner_id] = 0.0
+        heapq.heappush(self.queues[owner_id], (-priority, next(self._sequence), item))
+
+    def pop(self) -> Optional[Tuple[int, Any]]:
+        """
+        Take the next job to dispatch.
+
+        Returns:
+            (owner_id, item), or None if every buffered owner is at its cap
+        """
+        if not any(self._under_cap(owner_id) for owner_id in self.active):
+            return None
+
+        while True:
+            owner_id = self.active[0]
+            if not self._under_cap(owner_id):
+                self.active.rotate(-1)
+                continue
+            if self.deficit[owner_id] < 1:
+                # Owner just reached the head of the round: grant its quantum
+                self.deficit[owner_id] += self._weight(owner_id)
+                if self.deficit[owner_id] < 1:
+                    self.active.rotate(-1)
+                    continue
+            return owner_id, self._take(owner_id)
+
+    def release(self, owner_id: int) -> None:
+        """
+        Record that one of an owner's dispatched jobs has finished.
+
+        Args:
+            owner_id: Job owner
+        """
+        if self.running[owner_id] > 0:
+            self.running[owner_id] -= 1
+        if not self.running[owner_id]:
+            del self.running[owner_id]
+
+    def _take(self, owner_id: int) -> Any:
+        self.deficit[owner_id] -= 1
+        _, _, item = heapq.heappop(self.queues[owner_id])
+        self.running[owner_id] += 1
+
+        if not self.queues[owner_id]:
+            # Owner is at the head of `active`; idle owners keep no credit
+            self.active.popleft()
+            del self.queues[owner_id]
+            del self.deficit[owner_id]
+        elif self.deficit[owner_id] < 1:
+            self.active.rotate(-1)
+        return item
+
+    def _weight(self, owner_id: int) -> float:
+        return self.weights.get(owner_id, self.default_weight)
+
+    def _under_cap(self, owner_id: int) -> bool:
+        cap = self.max_concurrency.get(owner_id, self.default_max_concurrency)
+        return not cap or self.running[owner_id] < cap
@@ -0,0 +1,149 @@
+"""
+Image pre-pulling for newly registered plugin versions
+Listens for "prepull" events from the Plugin Registry and pulls the images in
+the background, so the first job of a new version does not wait for the pull
+"""
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, Set
+
+import pika
+
+logger = logging.getLogger(__name__)
+
+# Must match the exchange plugin-registry publishes change events to
+PLUGIN_EVENTS_EXCHANGE = "plugin_events"
+RECONNECT_SECONDS = 5.0
+
+
+def image_reference(docker_image_url: str, image_digest: Optional[str]) -> str:
+    """
+    Build the image reference jobs of a version run, pinned to its digest.
+
+    Args:
+        docker_image_url: Registered image reference
+        image_digest: Registered "sha256:..." digest, if any
+
+    Returns:
+        "repository@digest", or the registered reference if there is no digest
+    """
+    if not image_digest:
+        return docker_image_url
+    repository = docker_image_url.partition("@")[0]
+    # Drop the tag; a colon after the last slash is a tag, not a registry port
+    name_start = repository.rfind("/") + 1
+    if ":" in repository[name_start:]:
+        repository = repository[: repository.rindex(":")]
+    return f"{repository}@{image_digest}"
+
+
+class ImagePrepuller:
+    """Pulls plugin images announced by the registry on a bounded thread pool"""
+
+    def __init__(
+        self,
+        rabbitmq_url: str,
+        pull: Callable[[str], None],
+        max_concurrency: int = 4,
+    ):
+        """
+        Initialize ImagePrepuller.
+
+        Args:
+            rabbitmq_url: RabbitMQ connection URL
+            pull: Pulls one image reference (e.g. docker images.pull)
+            max_concurrency: Maximum number of concurrent pulls
+        """
+        self.rabbitmq_url = rabbitmq_url
+        self.pull = pull
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="image-prepull"
+        )
+        self._pending: Set[str] = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def handle(self, message: dict) -> Optional[Future]:
+        """
+        Schedule the pull requested by a plugin event.
+
+        Args:
+            message: Plugin event; only "prepull" events are acted on
+
+        Returns:
+            Future of the scheduled pull, or None if nothing was scheduled
+        """
+        if message.get("event") != "prepull" or not message.get("docker_image_url"):
+            return None
+
+        image = image_reference(
+            message["docker_image_url"], message.get("image_digest")
+        )
+        with self._lock:
+            if image in self._pending:
+                return None
+            self._pending.add(image)
+        return self.executor.submit(self._pull, image)
+
+    def _pull(self, image: str) -> None:
+        try:
+            start = time.monotonic()
+            self.pull(image)
+            logger.info(f"Pre-pulled {image} in {time.monotonic() - start:.1f}s")
+        except Exception as e:
+            logger.warning(f"Failed to pre-pull {image}: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(image)
+
+    def run(self) -> None:
+        """Listen for plugin events forever, reconnecting on failure"""
+        while True:
+            connection = None
+            try:
+                connection = pika.BlockingConnection(
+                    pika.URLParameters(self.rabbitmq_url)
+                )
+                channel = connection.channel()
+                channel.exchange_declare(
+                    exchange=PLUGIN_EVENTS_EXCHANGE,
+                    exchange_type="fanout",
+                    durable=True,
+                )
+                # Every worker pulls into its own Docker daemon
+                queue = channel.queue_declare(queue="", exclusive=True).method.queue
+                channel.queue_bind(queue=queue, exchange=PLUGIN_EVENTS_EXCHANGE)
+
+                def on_message(ch, method, properties, body):
+                    try:
+                        self.handle(json.loads(body))
+                    except Exception as e:
+                        logger.error(f"Error processing plugin event: {e}")
+
+                channel.basic_consume(
+                    queue=queue, on_message_callback=on_message, auto_ack=True
+                )
+                channel.start_consuming()
+            except Exception as e:
+                logger.error(f"Image prepuller disconnected: {e}")
+            finally:
+                if connection and not connection.is_closed:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+            time.sleep(RECONNECT_SECONDS)
+
+    def start(self) -> None:
+        """Start the listener thread if it is not already running"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(
+            target=self.run, name="image-prepuller", daemon=True
+        )
+        self._thread.start()
+        logger.info("Image prepuller started")
@@ -0,0 +1,165 @@
+"""
+Job message buffering for fair-share dispatch
+Pulls job messages from RabbitMQ into a FairShareScheduler. Only jobs that
+could be dispatched now count against the lookahead, and each owner may only
+take a share of the buffer: messages beyond an owner's share are moved to the
+back of their queue, so jobs of other owners queued behind a large backlog
+are reached without reading the whole backlog into memory.
+
+A deferred message is acknowledged only once the broker has confirmed its
+copy (the channel must be in confirm mode), keeps what was left of its queue
+TTL, and deferral is rate-limited so a capped owner's backlog is not cycled
+through the queue on every poll
+"""
+
+import json
+import logging
+import time
+from typing import Callable, List, Optional
+
+from fair_share import FairShareScheduler
+
+logger = logging.getLogger(__name__)
+
+
+class JobBuffer:
+    """Fills a FairShareScheduler from job queues"""
+
+    def __init__(
+        self,
+        scheduler: FairShareScheduler,
+        queues: List[str],
+        lookahead: int,
+        owner_lookahead: int,
+        defer_batch: int,
+        defer_interval: float = 1.0,
+        message_ttl_ms: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize JobBuffer.
+
+        Args:
+            scheduler: Scheduler receiving (delivery_tag, job_data) items
+            queues: Queues to pull from, round-robin
+            lookahead: Dispatchable jobs to keep buffered; jobs of owners at
+                their concurrency cap do not count
+            owner_lookahead: Most jobs buffered for one owner
+            defer_batch: Most messages moved to the back of their queue per
+                `defer_interval` (0 disables deferral); past it, fetching from
+                a queue stops at the first message of an owner over its share
+            defer_interval: Seconds over which `defer_batch` applies
+            message_ttl_ms: Queue message TTL, kept by deferred messages
+            clock: Wall clock, in seconds since the epoch
+        """
+        self.scheduler = scheduler
+        self.queues = queues
+        self.lookahead = lookahead
+        self.owner_lookahead = owner_lookahead
+        self.defer_batch = defer_batch
+        self.defer_interval = defer_interval
+        self.message_ttl_ms = message_ttl_ms
+        self.clock = clock
+        self._defer_window_start: Optional[float] = None
+        self._deferred = 0
+
+    def fill(self, channel) -> None:
+        """
+        Pull messages round-robin from the queues until enough are buffered.
+
+        Args:
+            channel: RabbitMQ channel, in publisher confirm mode
+        """
+        blocked = set()
+        while self.scheduler.dispatchable() < self.lookahead:
+            received = False
+            for queue in self.queues:
+                if queue in blocked:
+                    continue
+                if self.scheduler.dispatchable() >= self.lookahead:
+                    return
+                method, properties, body = channel.basic_get(queue=queue)
+                if method is None:
+                    continue
+                received = True
+                job_data = self._parse(channel, method, body)
+                if job_data is None:
+                    continue
+
+                owner_id = job_data.get("owner_id")
+                if self.scheduler.buffered(owner_id) < self.owner_lookahead:
+                    self.scheduler.push(
+                        owner_id,
+                        (method.delivery_tag, job_data),
+                        priority=job_data.get("priority", 0),
+                    )
+                    logger.info(f"Received job {job_data['job_id']}")
+                elif not self._take_deferral() or not self._defer(
+                    channel, queue, method, properties, body
+                ):
+                    channel.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+                    blocked.add(queue)
+            if not received:
+                return
+
+    def _take_deferral(self) -> bool:
+        """Count a deferral against the rate limit, if it allows one"""
+        now = self.clock()
+        if (
+            self._defer_window_start is None
+            or now - self._defer_window_start >= self.defer_interval
+        ):
+            self._defer_window_start = now
+            self._deferred = 0
+        if self._deferred >= self.defer_batch:
+            return False
+        self._deferred += 1
+        return True
+
+    def _defer(self, channel, queue, method, properties, body) -> bool:
+        """
+        Move a message to the back of its queue to make room for the owners
+        queued behind it.
+
+        Returns:
+            True if the message was moved, or dropped for having expired;
+            False if it is still unacknowledged
+        """
+        now = self.clock()
+        if properties.timestamp is None:
+            properties.timestamp = int(now)
+        if self.message_ttl_ms is not None:
+            remaining = self.message_ttl_ms - int((now - properties.timestamp) * 1000)
+            if properties.expiration is not None:
+                remaining = min(remaining, int(properties.expiration))
+            if remaining <= 0:
+                # Expired while buffered; dead-letter it as the queue TTL would
+                channel.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+                return True
+            properties.expiration = str(remaining)
+        try:
+            # Returns once the broker has confirmed the copy
+            channel.basic_publish(
+                exchange="",
+                routing_key=queue,
+                body=body,
+                properties=properties,
+                mandatory=True,
+            )
+        except Exception as e:
+            logger.warning(f"Could not defer a message on {queue}: {e}")
+            return False
+        channel.basic_ack(delivery_tag=method.delivery_tag)
+        return True
+
+    def _parse(self, channel, method, body):
+        """Parse a job message, dead-lettering it if it is malformed"""
+        try:
+            job_data = json.loads(body)
+            job_data["job_id"]
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error(f"Dropping malformed job message: {e}")
+            # Dead-letter instead of requeueing a message that can never parse
+            channel.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+            return None
+        return job_data
@@ -6,9 +6,11 @@ Initializes Ray and starts consuming jobs from RabbitMQ
 import logging
 import os
 
+import docker
 import ray
 
 from config import settings
+from image_prepuller import ImagePrepuller
 from mq_consumer import JobQueueConsumer
 
 # Configure logging
@@ -34,6 +36,14 @@ def main():
         ray.init(address=ray_address)
         logger.info(f"Ray initialized, connected to {ray_address}")
 
+    # Pull images of newly registered plugin versions ahead of their first job
+    if settings.IMAGE_PREPULL_ENABLED:
+        ImagePrepuller(
+            rabbitmq_url=settings.RABBITMQ_URL,
+            pull=docker.from_env().images.pull,
+            max_concurrency=settings.IMAGE_PREPULL_CONCURRENCY,
+        ).start()
+
     # Create and start job queue consumer
     consumer = JobQueueConsumer(
         rabbitmq_url=settings.RABBITMQ_URL,
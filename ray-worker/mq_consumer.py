@@ -2,20 +2,69 @@
 RabbitMQ consumer for job queue
 """
 
-import json
 import logging
+from typing import Dict, List
 
 import pika
 import ray
 
 from actors import PluginExecutorActor
 from config import settings
+from fair_share import FairShareScheduler
+from job_buffer import JobBuffer
 
 logger = logging.getLogger(__name__)
 
+# Must match the declarations in api-agent's RabbitMQService
+JOB_EXCHANGE = "jobs_exchange"
+UNROUTED_JOB_EXCHANGE = "jobs_unrouted"
+SHARED_JOB_QUEUE = "job_queue"
+JOB_QUEUE_ARGUMENTS = {
+    "x-message-ttl": 3600000,  # 1 hour
+    "x-max-length": 10000,
+    "x-dead-letter-exchange": "dlx_exchange",
+    "x-dead-letter-routing-key": SHARED_JOB_QUEUE,
+    "x-max-priority": settings.JOB_QUEUE_MAX_PRIORITY,
+}
+
+
+def dedicated_job_queues(plugins: List[str], group: str) -> Dict[str, List[str]]:
+    """
+    Map dedicated queue names to the plugins routed into them.
+
+    Args:
+        plugins: Plugins this worker serves
+        group: Optional group name; all plugins then share one queue that
+            every worker of the group consumes
+
+    Returns:
+        Queue name -> plugin names bound to it
+    """
+    if not plugins:
+        return {}
+    if group:
+        return {f"{SHARED_JOB_QUEUE}.{group}": list(plugins)}
+    return {f"{SHARED_JOB_QUEUE}.{plugin}": [plugin] for plugin in plugins}
+
 
 class JobQueueConsumer:
-    """Consumes jobs from RabbitMQ job_queue and dispatches to Ray actors"""
+    """
+    Consumes jobs from RabbitMQ and dispatches to Ray actors.
+
+    Workers configured with WORKER_PLUGINS consume only dedicated queues bound
+    to those plugins' routing keys, keeping their images warm and isolating
+    other plugins' backlogs; other workers consume the shared job_queue, which
+    receives every job no dedicated queue is bound for.
+
+    Up to FAIR_SHARE_LOOKAHEAD dispatchable messages are buffered,
+    unacknowledged, in per-owner virtual queues; a FairShareScheduler decides
+    which one an idle actor gets, so one owner's bulk submission cannot starve
+    everyone else. An owner gets at most FAIR_SHARE_OWNER_LOOKAHEAD of the
+    buffer; its further messages go to the back of their queue (see
+    JobBuffer), so other owners' jobs behind its backlog are still reached.
+    The rest of the backlog stays in RabbitMQ, where higher priority messages
+    overtake older ones, instead of piling up in FIFO actor mailboxes.
+    """
 
     def __init__(self, rabbitmq_url: str, num_actors: int = 5):
         """
@@ -28,12 +77,43 @@ class JobQueueConsumer:
         self.rabbitmq_url = rabbitmq_url
         self.connection = None
         self.channel = None
+        self.poll_interval = settings.DISPATCH_POLL_INTERVAL_MS / 1000
+        self.dedicated_queues = dedicated_job_queues(
+            settings.WORKER_PLUGINS, settings.WORKER_PLUGIN_GROUP
+        )
+        self.queues = list(self.dedicated_queues)
+        if not self.queues or settings.WORKER_CONSUME_SHARED_QUEUE:
+            self.queues.append(SHARED_JOB_QUEUE)
+        self.scheduler = FairShareScheduler(
+            weights=settings.FAIR_SHARE_WEIGHTS,
+            max_concurrency=settings.FAIR_SHARE_MAX_CONCURRENCY,
+            default_max_concurrency=settings.FAIR_SHARE_DEFAULT_MAX_CONCURRENCY,
+        )
+        self.buffer = JobBuffer(
+            self.scheduler,
+            self.queues,
+            lookahead=settings.FAIR_SHARE_LOOKAHEAD,
+            owner_lookahead=settings.FAIR_SHARE_OWNER_LOOKAHEAD,
+            defer_batch=settings.FAIR_SHARE_DEFER_BATCH,
+            defer_interval=settings.FAIR_SHARE_DEFER_INTERVAL_MS / 1000,
+            message_ttl_ms=JOB_QUEUE_ARGUMENTS["x-message-ttl"],
+        )
 
         # Create pool of Ray actors
         self.actors = [
-            PluginExecutorActor.remote(rabbitmq_url) for _ in range(num_actors)
+            PluginExecutorActor.remote(
+                rabbitmq_url,
+                status_coalesce_window_ms=settings.STATUS_COALESCE_WINDOW_MS,
+                progress_min_interval_ms=settings.PROGRESS_MIN_INTERVAL_MS,
+                plugin_registry_url=settings.PLUGIN_REGISTRY_URL,
+                status_encoding=settings.STATUS_ENCODING,
+                status_compress_min_bytes=settings.STATUS_COMPRESS_MIN_BYTES,
+            )
+            for _ in range(num_actors)
         ]
-        self.current_actor_idx = 0
+        self.idle_actors = list(self.actors)
+        # Pending execute_plugin call -> (actor running it, job owner)
+        self.in_flight = {}
 
         logger.info(f"Created {num_actors} PluginExecutorActor instances")
 
@@ -42,66 +122,138 @@ class JobQueueConsumer:
         parameters = pika.URLParameters(self.rabbitmq_url)
         self.connection = pika.BlockingConnection(parameters)
         self.channel = self.connection.channel()
+        # JobBuffer acks a deferred message only once its copy is confirmed
+        self.channel.confirm_delivery()
 
-        # Declare job queue
-        self.channel.queue_declare(queue="job_queue", durable=True)
+        # Declare job exchanges and the shared job queue
+        self.channel.exchange_declare(
+            exchange=UNROUTED_JOB_EXCHANGE, exchange_type="fanout", durable=True
+        )
+        self.channel.exchange_declare(
+            exchange=JOB_EXCHANGE,
+            exchange_type="topic",
+            durable=True,
+            arguments={"alternate-exchange": UNROUTED_JOB_EXCHANGE},
+        )
+        self.channel.queue_declare(
+            queue=SHARED_JOB_QUEUE, durable=True, arguments=JOB_QUEUE_ARGUMENTS
+        )
+        self.channel.queue_bind(queue=SHARED_JOB_QUEUE, exchange=UNROUTED_JOB_EXCHANGE)
 
-        # Set QoS to process one message at a time
-        self.channel.basic_qos(prefetch_count=1)
+        # Declare and bind queues dedicated to this worker's plugins
+        for queue, plugins in self.dedicated_queues.items():
+            self.channel.queue_declare(
+                queue=queue, durable=True, arguments=JOB_QUEUE_ARGUMENTS
+            )
+            for plugin in plugins:
+                self.channel.queue_bind(
+                    queue=queue, exchange=JOB_EXCHANGE, routing_key=f"jobs.{plugin}"
+                )
 
-        logger.info("Connected to RabbitMQ")
+        logger.info(f"Connected to RabbitMQ, consuming {', '.join(self.queues)}")
 
-    def on_message(self, ch, method, properties, body):
+    def dispatch(self, owner_id, delivery_tag, job_data) -> None:
         """
-        Callback for processing job messages.
+        Dispatch a buffered job to an idle actor.
 
         Args:
-            ch: Channel
-            method: Delivery method
-            properties: Message properties
-            body: Message body
+            owner_id: Job owner
+            delivery_tag: Delivery tag of the job message
+            job_data: Parsed job message
         """
+        job_id = job_data["job_id"]
         try:
-            # Parse job message
-            job_data = json.loads(body)
-            job_id = job_data["job_id"]
-            image_url = job_data["docker_image_url"]
-            input_data = job_data["input_data"]
-
-            logger.info(f"Received job {job_id}")
-
-            # Get next actor from pool (round-robin)
-            actor = self.actors[self.current_actor_idx]
-            self.current_actor_idx = (self.current_actor_idx + 1) % len(self.actors)
-
-            # Execute plugin asynchronously via Ray actor
-            actor.execute_plugin.remote(job_id, image_url, input_data)
+            # Execute plugin asynchronously via an idle Ray actor
+            actor = self.idle_actors[-1]
+            if job_data.get("pipeline"):
+                # The actor coordinates the steps; they run as Ray tasks
+                ref = actor.execute_pipeline.remote(job_id, job_data["pipeline"])
+            else:
+                ref = actor.execute_plugin.remote(
+                    job_id,
+                    job_data["docker_image_url"],
+                    job_data["input_data"],
+                    plugin_name=job_data.get("plugin_name"),
+                    plugin_version=job_data.get("plugin_version"),
+                )
+            self.in_flight[ref] = (self.idle_actors.pop(), owner_id)
 
             # Acknowledge message
-            ch.basic_ack(delivery_tag=method.delivery_tag)
+            self.channel.basic_ack(delivery_tag=delivery_tag)
 
             logger.info(f"Job {job_id} dispatched to Ray actor")
 
         except Exception as e:
-            logger.error(f"Error processing job: {e}")
+            logger.error(f"Error processing job {job_id}: {e}")
+            self.scheduler.release(owner_id)
             # Reject message and requeue
-            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+            self.channel.basic_nack(delivery_tag=delivery_tag, requeue=True)
+
+    def reap_finished(self, timeout: float = 0):
+        """
+        Return actors whose job has finished to the idle pool.
+
+        Args:
+            timeout: Seconds to wait for at least one job to finish
+        """
+        if not self.in_flight:
+            return
+
+        ready, _ = ray.wait(list(self.in_flight), num_returns=1, timeout=timeout)
+        if ready:
+            # Collect everything else that is already done without waiting
+            ready, _ = ray.wait(
+                list(self.in_flight), num_returns=len(self.in_flight), timeout=0
+            )
+        for ref in ready:
+            actor, owner_id = self.in_flight.pop(ref)
+            self.idle_actors.append(actor)
+            self.scheduler.release(owner_id)
+            try:
+                ray.get(ref)
+            except Exception as e:
+                logger.error(f"Plugin execution task failed: {e}")
+
+    def poll_once(self) -> bool:
+        """
+        Dispatch one buffered job if an actor is idle.
+
+        Returns:
+            True if a job was dispatched
+        """
+        if not self.idle_actors:
+            return False
+
+        self.buffer.fill(self.channel)
+        next_job = self.scheduler.pop()
+        if next_job is None:
+            return False
+
+        owner_id, (delivery_tag, job_data) = next_job
+        self.dispatch(owner_id, delivery_tag, job_data)
+        return True
 
     def start_consuming(self):
         """Start consuming messages from job_queue"""
         self.connect()
 
-        logger.info("Starting to consume jobs from job_queue")
-
-        self.channel.basic_consume(
-            queue="job_queue", on_message_callback=self.on_message
-        )
+        logger.info("Starting to consume jobs")
 
         try:
-            self.channel.start_consuming()
+            while True:
+                self.reap_finished()
+                if self.poll_once():
+                    continue
+
+                if self.idle_actors:
+                    # Nothing dispatchable; sleep while keeping the connection alive
+                    self.connection.sleep(self.poll_interval)
+                else:
+                    # All actors busy; wait for one to finish
+                    self.reap_finished(timeout=self.poll_interval)
+                    self.connection.process_data_events(time_limit=0)
         except KeyboardInterrupt:
             logger.info("Stopping consumer...")
-            self.channel.stop_consuming()
         finally:
             if self.connection and not self.connection.is_closed:
                 self.connection.close()
@@ -0,0 +1,306 @@
+"""
+Pipeline jobs for the worker
+Orders the steps of a pipeline job and assembles each step's input from the
+outputs of the steps it reads from. The graph was validated by api-agent at
+submission (app.services.job_pipelines); it is checked again here so a bad
+message fails its job instead of the actor. Submitting and collecting the
+steps goes through callables the actor binds to Ray tasks
+"""
+
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+
+class PipelineError(ValueError):
+    """Raised for a pipeline whose steps do not form a valid graph"""
+
+
+class PipelineStepFailed(Exception):
+    """
+    Raised by a pipeline step that could not produce an output.
+
+    Steps depending on it fail with the same exception, so `step` always
+    names the step that actually failed.
+    """
+
+    def __init__(self, step: str, message: str):
+        super().__init__(step, message)
+        self.step = step
+        self.message = message
+
+    def __str__(self) -> str:
+        return f"Step {self.step!r} failed: {self.message}"
+
+
+def parse_reference(reference: str) -> Tuple[str, List[str]]:
+    """
+    Split an upstream output reference.
+
+    Args:
+        reference: "step" for a step's whole output, or "step.path.to.field";
+            numeric path segments index into lists
+
+    Returns:
+        Tuple of (step name, path segments)
+    """
+    step, *path = reference.split(".")
+    if not step or any(not segment for segment in path):
+        raise PipelineError(f"Invalid output reference {reference!r}")
+    return step, path
+
+
+def read_steps(step: Mapping[str, Any]) -> List[str]:
+    """Upstream steps whose output a step reads, in reference order"""
+    return list(
+        dict.fromkeys(
+            parse_reference(reference)[0]
+            for reference in step.get("inputs", {}).values()
+        )
+    )
+
+
+def step_dependencies(step: Mapping[str, Any]) -> List[str]:
+    """Upstream steps a step waits for, those it reads from first"""
+    return list(dict.fromkeys([*read_steps(step), *step.get("depends_on", [])]))
+
+
+def pipeline_order(steps: List[Mapping[str, Any]]) -> List[Mapping[str, Any]]:
+    """
+    Order pipeline steps so every step comes after the steps it depends on.
+
+    Args:
+        steps: Step definitions from the job message
+
+    Returns:
+        The steps in execution order
+
+    Raises:
+        PipelineError: If names repeat, a dependency is unknown, or the steps
+            form a cycle
+    """
+    by_name = {step["name"]: step for step in steps}
+    if len(by_name) != len(steps):
+        raise PipelineError("Step names must be unique")
+
+    remaining = {name: set(step_dependencies(step)) for name, step in by_name.items()}
+    for name, upstream in remaining.items():
+        unknown = upstream - by_name.keys()
+        if unknown or name in upstream:
+            raise PipelineError(
+                f"Step {name!r} depends on {', '.join(sorted(unknown or {name}))}"
+            )
+
+    order = []
+    while remaining:
+        ready = [name for name, upstream in remaining.items() if not upstream]
+        if not ready:
+            raise PipelineError(
+                f"Steps {', '.join(sorted(remaining))} form a dependency cycle"
+            )
+        for name in ready:
+            del remaining[name]
+            for upstream in remaining.values():
+                upstream.discard(name)
+        order.extend(by_name[name] for name in ready)
+    return order
+
+
+def final_step(steps: List[Mapping[str, Any]]) -> Mapping[str, Any]:
+    """
+    The step whose output is the pipeline's result.
+
+    Raises:
+        PipelineError: Unless exactly one step has no dependents
+    """
+    upstream = {name for step in steps for name in step_dependencies(step)}
+    sinks = [step for step in steps if step["name"] not in upstream]
+    if len(sinks) != 1:
+        raise PipelineError("A pipeline must end in exactly one step")
+    return sinks[0]
+
+
+def resolve_reference(reference: str, outputs: Mapping[str, Any]) -> Any:
+    """
+    Look up an upstream output reference.
+
+    Args:
+        reference: "step" or "step.path.to.field"
+        outputs: Outputs of the steps read from, by step name
+
+    Returns:
+        The referenced value
+
+    Raises:
+        PipelineError: If the path does not exist in the output
+    """
+    step, path = parse_reference(reference)
+    value = outputs[step]
+    for segment in path:
+        if isinstance(value, dict) and segment in value:
+            value = value[segment]
+        elif (
+            isinstance(value, list) and segment.isdigit() and int(segment) < len(value)
+        ):
+            value = value[int(segment)]
+        else:
+            raise PipelineError(f"Output of step {step!r} has no {reference!r}")
+    return value
+
+
+def build_step_input(
+    step: Mapping[str, Any], outputs: Mapping[str, Any]
+) -> Dict[str, Any]:
+    """
+    Assemble a step's input.
+
+    Args:
+        step: Step definition
+        outputs: Outputs of the steps it reads from, by step name
+
+    Returns:
+        The step's static input_data with its referenced fields filled in
+    """
+    input_data = dict(step.get("input_data") or {})
+    for field, reference in step.get("inputs", {}).items():
+        input_data[field] = resolve_reference(reference, outputs)
+    return input_data
+
+
+def step_summary(
+    step: Mapping[str, Any],
+    status: str,
+    started_at: Optional[datetime] = None,
+    completed_at: Optional[datetime] = None,
+    output: Any = None,
+    error_message: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Summarize one step of a pipeline job for its status update.
+
+    Args:
+        step: Step definition
+        status: "completed", "failed", or "skipped" when an upstream step
+            failed first
+        started_at: When the step's container started
+        completed_at: When it finished
+        output: Step output, measured but not included
+        error_message: Why the step failed
+
+    Returns:
+        JSON-serializable summary
+    """
+    summary = {
+        "name": step["name"],
+        "plugin_name": step.get("plugin_name"),
+        "plugin_version": step.get("plugin_version"),
+        "status": status,
+        "started_at": started_at.isoformat() if started_at else None,
+        "completed_at": completed_at.isoformat() if completed_at else None,
+        "duration_seconds": (
+            (completed_at - started_at).total_seconds()
+            if started_at and completed_at
+            else None
+        ),
+        "output_bytes": (
+            len(json.dumps(output, separators=(",", ":")))
+            if status == "completed"
+            else None
+        ),
+    }
+    if error_message is not None:
+        summary["error_message"] = error_message
+    return summary
+
+
+def submit_steps(
+    ordered: List[Mapping[str, Any]],
+    submit: Callable[[Mapping[str, Any], List[str], List[Any]], Tuple[Any, Any]],
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Submit every step of a pipeline up front, each waiting on its upstream.
+
+    Args:
+        ordered: Steps in execution order
+        submit: Called with (step, steps read from, upstream refs), the
+            outputs of the steps read from followed by the summaries of steps
+            only waited for; returns the step's (output ref, summary ref)
+
+    Returns:
+        Tuple of (step name -> output ref, step name -> summary ref)
+    """
+    outputs: Dict[str, Any] = {}
+    summaries: Dict[str, Any] = {}
+    for step in ordered:
+        read_from = read_steps(step)
+        waits_for = [name for name in step_dependencies(step) if name not in read_from]
+        outputs[step["name"]], summaries[step["name"]] = submit(
+            step,
+            read_from,
+            [
+                *[outputs[name] for name in read_from],
+                *[summaries[name] for name in waits_for],
+            ],
+        )
+    return outputs, summaries
+
+
+def collect_steps(
+    ordered: List[Mapping[str, Any]],
+    summary_refs: Mapping[str, Any],
+    wait: Callable[[List[Any]], Sequence[Any]],
+    get: Callable[[Any], Any],
+    cancel: Callable[[Any], None],
+    on_completed: Callable[[Mapping[str, Any], int], None],
+) -> List[Dict[str, Any]]:
+    """
+    Wait for every pipeline step to finish.
+
+    Once a step fails, the steps still pending are cancelled.
+
+    Args:
+        ordered: Steps in execution order
+        summary_refs: Step name -> its summary ref
+        wait: Returns the refs out of those pending that are ready, possibly
+            none
+        get: Returns a ready summary, raising the step's error if it failed
+        cancel: Cancels a pending step
+        on_completed: Called with each completed step and the number of steps
+            done so far
+
+    Returns:
+        Step summaries in execution order; steps that did not run because
+        another step failed are "skipped"
+    """
+    pending = {summary_refs[step["name"]]: step for step in ordered}
+    results: Dict[str, Dict[str, Any]] = {}
+    failed = False
+    while pending:
+        for ref in wait(list(pending)):
+            step = pending.pop(ref)
+            try:
+                summary = get(ref)
+            except PipelineStepFailed as e:
+                # Dependents of a failed step raise its own failure
+                cause = getattr(e, "cause", e)
+                if cause.step == step["name"]:
+                    summary = step_summary(step, "failed", error_message=cause.message)
+                else:
+                    summary = step_summary(step, "skipped")
+            except Exception as e:
+                # Cancelled after another step failed, or lost
+                summary = step_summary(
+                    step,
+                    "skipped" if failed else "failed",
+                    error_message=None if failed else str(e),
+                )
+            results[step["name"]] = summary
+
+            if summary["status"] == "failed" and not failed:
+                failed = True
+                for other in pending:
+                    cancel(other)
+            elif summary["status"] == "completed":
+                on_completed(step, len(results))
+
+    return [results[step["name"]] for step in ordered]
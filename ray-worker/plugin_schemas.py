@@ -0,0 +1,130 @@
+"""
+Plugin schema validators for the worker
+Fetches plugin schemas from the Plugin Registry and compiles each once per
+plugin version, so jobs can be checked before a container is launched
+"""
+
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+
+import httpx
+from jsonschema import SchemaError
+from jsonschema.validators import validator_for
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PluginValidators:
+    """Compiled validators for one plugin version (None if no schema)"""
+
+    input: Any = None
+    output: Any = None
+
+
+def compile_schema(schema: Optional[dict]):
+    """
+    Build a validator for a JSON Schema.
+
+    Args:
+        schema: JSON Schema document, or None
+
+    Returns:
+        Validator instance, or None if there is no valid schema
+    """
+    if not schema:
+        return None
+    validator_cls = validator_for(schema)
+    try:
+        validator_cls.check_schema(schema)
+    except SchemaError as e:
+        logger.error(f"Ignoring invalid plugin schema: {e.message}")
+        return None
+    return validator_cls(schema)
+
+
+def describe_errors(validator, instance: Any) -> List[str]:
+    """
+    Describe every validation error with its path.
+
+    Args:
+        validator: Compiled validator
+        instance: Value to validate
+
+    Returns:
+        Messages like "features.0: 'x' is not of type 'number'"
+    """
+    errors = sorted(validator.iter_errors(instance), key=lambda e: list(e.path))
+    return [
+        f"{'.'.join(str(p) for p in error.absolute_path) or '<root>'}: {error.message}"
+        for error in errors
+    ]
+
+
+class PluginSchemaCache:
+    """Compiled plugin validators keyed by (name, version)"""
+
+    def __init__(
+        self,
+        registry_url: str,
+        max_size: int = 256,
+        client: Optional[httpx.Client] = None,
+    ):
+        """
+        Initialize PluginSchemaCache.
+
+        Args:
+            registry_url: Plugin Registry base URL
+            max_size: Maximum number of plugin versions kept
+            client: HTTP client (a pooled client with a 5s timeout by default)
+        """
+        self.registry_url = registry_url.rstrip("/")
+        self.max_size = max_size
+        self.client = client or httpx.Client(timeout=5.0)
+        self._entries: OrderedDict[Tuple[str, str], PluginValidators] = OrderedDict()
+
+    def get(self, name: str, version: Optional[str]) -> Optional[PluginValidators]:
+        """
+        Get validators for a plugin version, fetching its schemas if needed.
+
+        Args:
+            name: Plugin name
+            version: Plugin version the job was submitted against
+
+        Returns:
+            Validators, or None if they could not be determined
+        """
+        if not version:
+            return None
+
+        key = (name, version)
+        validators = self._entries.get(key)
+        if validators is not None:
+            self._entries.move_to_end(key)
+            return validators
+
+        plugin = self._fetch(name, version)
+        if plugin is None:
+            return None
+
+        validators = PluginValidators(
+            input=compile_schema(plugin.get("input_schema")),
+            output=compile_schema(plugin.get("output_schema")),
+        )
+        self._entries[key] = validators
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return validators
+
+    def _fetch(self, name: str, version: str) -> Optional[dict]:
+        # Plugin versions are immutable, so the schema never goes stale
+        url = f"{self.registry_url}/api/v1/plugins/{name}/versions/{version}"
+        try:
+            response = self.client.get(url)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.warning(f"Could not fetch schemas for plugin {name} {version}: {e}")
+            return None
+        return response.json()
@@ -0,0 +1,154 @@
+"""
+Plugin progress reporting
+
+Plugins report progress by writing framed lines to stderr:
+
+    ##progress {"percent": 40, "message": "step 2/5", "partial": {...}}
+
+stdout stays reserved for the final JSON result. The actor tails stderr,
+parses frames and forwards them, throttled, as `progress` events.
+"""
+
+import json
+import logging
+import time
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_FRAME_PREFIX = "##progress "
+
+
+def parse_progress_line(line: str) -> Optional[dict]:
+    """
+    Parse a progress frame written by a plugin.
+
+    Args:
+        line: A single stderr line
+
+    Returns:
+        Progress dict with 'percent', 'message' and 'partial' keys, or None if
+        the line is not a well-formed progress frame
+    """
+    if not line.startswith(PROGRESS_FRAME_PREFIX):
+        return None
+
+    try:
+        frame = json.loads(line[len(PROGRESS_FRAME_PREFIX) :])
+    except json.JSONDecodeError:
+        logger.warning(f"Ignoring malformed progress frame: {line!r}")
+        return None
+    if not isinstance(frame, dict):
+        return None
+
+    percent = frame.get("percent")
+    if isinstance(percent, (int, float)):
+        percent = min(100.0, max(0.0, float(percent)))
+    else:
+        percent = None
+
+    message = frame.get("message")
+    return {
+        "percent": percent,
+        "message": str(message) if message is not None else None,
+        "partial": frame.get("partial"),
+    }
+
+
+def strip_progress_frames(logs: str) -> str:
+    """
+    Remove progress frames from combined container logs.
+
+    Args:
+        logs: Container log text
+
+    Returns:
+        Log text without progress frame lines
+    """
+    return "\n".join(
+        line for line in logs.splitlines() if not line.startswith(PROGRESS_FRAME_PREFIX)
+    )
+
+
+class ProgressThrottle:
+    """
+    Limits progress events to one per job per interval.
+
+    Events arriving faster than the interval replace each other; the latest
+    one is published once the interval has elapsed (see `flush_due`).
+    """
+
+    def __init__(
+        self,
+        publish: Callable[[dict], None],
+        min_interval_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize ProgressThrottle.
+
+        Args:
+            publish: Function that sends a progress message to status_queue
+            min_interval_seconds: Minimum time between events for one job
+            clock: Monotonic clock, overridable for tests
+        """
+        self.publish = publish
+        self.min_interval_seconds = min_interval_seconds
+        self.clock = clock
+        self.last_sent: Dict[int, float] = {}
+        self.pending: Dict[int, dict] = {}
+
+    def submit(self, message: dict) -> None:
+        """
+        Publish a progress message now, or hold it until the interval elapses.
+
+        Args:
+            message: Progress message with at least `job_id`
+        """
+        job_id = message["job_id"]
+        last_sent = self.last_sent.get(job_id)
+        if last_sent is None or self.clock() - last_sent >= self.min_interval_seconds:
+            self.pending.pop(job_id, None)
+            self._send(message)
+        else:
+            self.pending[job_id] = message
+
+    def time_until_flush(self) -> Optional[float]:
+        """
+        Seconds until the earliest held event may be published.
+
+        Returns:
+            Remaining seconds (never negative), or None if nothing is held
+        """
+        if not self.pending:
+            return None
+        now = self.clock()
+        return max(
+            0.0,
+            min(
+                self.last_sent[job_id] + self.min_interval_seconds - now
+                for job_id in self.pending
+            ),
+        )
+
+    def flush_due(self) -> None:
+        """Publish every held event whose interval has elapsed"""
+        now = self.clock()
+        for job_id, message in list(self.pending.items()):
+            if now - self.last_sent[job_id] >= self.min_interval_seconds:
+                del self.pending[job_id]
+                self._send(message)
+
+    def discard(self, job_id: int) -> None:
+        """
+        Forget a job, dropping any held event (e.g. once it has finished).
+
+        Args:
+            job_id: Job ID
+        """
+        self.pending.pop(job_id, None)
+        self.last_sent.pop(job_id, None)
+
+    def _send(self, message: dict) -> None:
+        self.last_sent[message["job_id"]] = self.clock()
+        self.publish(message)
@@ -0,0 +1,91 @@
+"""
+Status update coalescing for the worker-side status path
+
+Short jobs emit `processing` and a terminal status a few milliseconds apart.
+Holding transitional updates for a small window lets a terminal update that
+arrives in time replace them, halving status_queue traffic and DB writes.
+"""
+
+import logging
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TRANSITIONAL_STATUSES = frozenset({"processing"})
+
+
+class StatusCoalescer:
+    """
+    Holds transitional status updates and drops those superseded in time.
+
+    Terminal updates are always published immediately. A held transitional
+    update is published once its window elapses (see `flush_due`), unless a
+    newer update for the same job replaces it first.
+    """
+
+    def __init__(
+        self,
+        publish: Callable[[dict], None],
+        window_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize StatusCoalescer.
+
+        Args:
+            publish: Function that sends a status message to status_queue
+            window_seconds: How long to hold transitional updates (0 disables)
+            clock: Monotonic clock, overridable for tests
+        """
+        self.publish = publish
+        self.window_seconds = window_seconds
+        self.clock = clock
+        self.pending: Dict[int, Tuple[float, dict]] = {}
+
+    def submit(self, message: dict) -> None:
+        """
+        Publish or hold a status message.
+
+        Args:
+            message: Status message with at least `job_id` and `status`
+        """
+        job_id = message["job_id"]
+
+        if message["status"] in TRANSITIONAL_STATUSES and self.window_seconds > 0:
+            self.pending[job_id] = (self.clock() + self.window_seconds, message)
+            return
+
+        superseded = self.pending.pop(job_id, None)
+        if superseded is not None:
+            logger.info(
+                f"Dropped '{superseded[1]['status']}' for job {job_id}, "
+                f"superseded by '{message['status']}'"
+            )
+        self.publish(message)
+
+    def time_until_flush(self) -> Optional[float]:
+        """
+        Seconds until the earliest held update is due.
+
+        Returns:
+            Remaining seconds (never negative), or None if nothing is held
+        """
+        if not self.pending:
+            return None
+        earliest = min(deadline for deadline, _ in self.pending.values())
+        return max(0.0, earliest - self.clock())
+
+    def flush_due(self) -> None:
+        """Publish every held update whose window has elapsed"""
+        now = self.clock()
+        for job_id, (deadline, message) in list(self.pending.items()):
+            if deadline <= now:
+                del self.pending[job_id]
+                self.publish(message)
+
+    def flush(self) -> None:
+        """Publish every held update regardless of its window"""
+        pending, self.pending = self.pending, {}
+        for _, message in pending.values():
+            self.publish(message)
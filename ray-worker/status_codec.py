@@ -0,0 +1,51 @@
+"""
+Wire encoding for status_queue messages
+
+Status messages are msgpack-encoded by default, which is considerably
+smaller than JSON for numeric results, and zstd-compressed above a size
+threshold when the optional `zstandard` package is installed.
+"""
+
+import json
+from typing import Optional, Tuple
+
+import msgpack
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+JSON_CONTENT_TYPE = "application/json"
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+ZSTD_CONTENT_ENCODING = "zstd"
+
+
+def encode_status_message(
+    message: dict, encoding: str = "msgpack", compress_min_bytes: int = 0
+) -> Tuple[bytes, str, Optional[str]]:
+    """
+    Encode a status message for publishing.
+
+    Args:
+        message: Status message
+        encoding: "msgpack" or "json"
+        compress_min_bytes: Compress bodies at least this large with zstd
+            (0 disables compression)
+
+    Returns:
+        (body, content_type, content_encoding) for the AMQP message
+    """
+    if encoding == "json":
+        body = json.dumps(message).encode("utf-8")
+        content_type = JSON_CONTENT_TYPE
+    else:
+        body = msgpack.packb(message, use_bin_type=True)
+        content_type = MSGPACK_CONTENT_TYPE
+
+    content_encoding = None
+    if zstandard is not None and compress_min_bytes and len(body) >= compress_min_bytes:
+        body = zstandard.ZstdCompressor().compress(body)
+        content_encoding = ZSTD_CONTENT_ENCODING
+
+    return body, content_type, content_encoding
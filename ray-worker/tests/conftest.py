@@ -0,0 +1,26 @@
+"""
+Shared fixtures for worker tests
+"""
+
+import pytest
+
+
+class FakeClock:
+    """Monotonic clock the test advances by hand"""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def published():
+    """Messages handed to a publish callback"""
+    return []
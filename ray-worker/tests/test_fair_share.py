@@ -0,0 +1,91 @@
+"""
+Tests for per-owner fair-share scheduling
+"""
+
+import pytest
+
+from fair_share import FairShareScheduler
+
+
+def test_round_robin_across_owners():
+    """Test a bulk owner cannot starve an owner who submitted later"""
+    scheduler = FairShareScheduler()
+    for i in range(100):
+        scheduler.push(1, f"bulk-{i}")
+    scheduler.push(2, "small-0")
+    scheduler.push(2, "small-1")
+
+    owners = [scheduler.pop()[0] for _ in range(4)]
+
+    assert owners == [1, 2, 1, 2]
+
+
+def test_weights_share_dispatches():
+    """Test an owner with weight 2 gets twice the dispatches per round"""
+    scheduler = FairShareScheduler(weights={1: 2.0})
+    for i in range(10):
+        scheduler.push(1, i)
+        scheduler.push(2, i)
+
+    owners = [scheduler.pop()[0] for _ in range(6)]
+
+    assert owners.count(1) == 4
+    assert owners.count(2) == 2
+
+
+def test_fractional_weight():
+    """Test weights below 1 still get served, less often"""
+    scheduler = FairShareScheduler(weights={1: 0.5})
+    for i in range(10):
+        scheduler.push(1, i)
+        scheduler.push(2, i)
+
+    owners = [scheduler.pop()[0] for _ in range(6)]
+
+    assert owners.count(1) == 2
+    assert owners.count(2) == 4
+
+
+def test_concurrency_cap():
+    """Test capped owners wait for a running job to finish"""
+    scheduler = FairShareScheduler(max_concurrency={1: 1})
+    scheduler.push(1, "a")
+    scheduler.push(1, "b")
+
+    assert scheduler.pop() == (1, "a")
+    assert scheduler.pop() is None
+
+    scheduler.release(1)
+
+    assert scheduler.pop() == (1, "b")
+
+
+def test_priority_within_owner():
+    """Test an owner's higher priority jobs go first"""
+    scheduler = FairShareScheduler()
+    scheduler.push(1, "batch", priority=0)
+    scheduler.push(1, "interactive", priority=9)
+
+    assert scheduler.pop() == (1, "interactive")
+    assert scheduler.pop() == (1, "batch")
+    assert scheduler.pop() is None
+    assert len(scheduler) == 0
+
+
+def test_non_positive_weight_rejected():
+    """Test zero weights are rejected instead of never being served"""
+    with pytest.raises(ValueError):
+        FairShareScheduler(weights={1: 0})
+
+
+def test_dispatchable_excludes_capped_owners():
+    """Test jobs of owners at their cap are buffered but not dispatchable"""
+    scheduler = FairShareScheduler(max_concurrency={1: 1})
+    scheduler.push(1, "a")
+    scheduler.push(1, "b")
+    scheduler.push(2, "c")
+    scheduler.pop()
+
+    assert scheduler.buffered(1) == 1
+    assert len(scheduler) == 2
+    assert scheduler.dispatchable() == 1
@@ -0,0 +1,81 @@
+"""
+Tests for pre-pulling images of new plugin versions
+"""
+
+import threading
+
+from image_prepuller import ImagePrepuller, image_reference
+
+DIGEST = "sha256:" + "a" * 64
+
+
+def test_image_reference_pins_digest():
+    """Test images are pulled by digest when the registry knows it"""
+    assert (
+        image_reference("reg:5000/team/a:1.0.0", DIGEST) == f"reg:5000/team/a@{DIGEST}"
+    )
+    assert image_reference("reg:5000/team/a", DIGEST) == f"reg:5000/team/a@{DIGEST}"
+    assert image_reference("a:1.0.0", None) == "a:1.0.0"
+
+
+def test_prepull_event_pulls_image():
+    """Test prepull events are pulled in the background"""
+    pulled = []
+    prepuller = ImagePrepuller("amqp://unused", pull=pulled.append)
+
+    future = prepuller.handle(prepull_event("a:1.0.0"))
+    future.result(timeout=5)
+
+    assert pulled == ["a:1.0.0"]
+
+
+def test_other_events_are_ignored():
+    """Test only prepull events trigger pulls"""
+    pulled = []
+    prepuller = ImagePrepuller("amqp://unused", pull=pulled.append)
+
+    assert (
+        prepuller.handle({"event": "created", "name": "a", "version": "1.0.0"}) is None
+    )
+    assert pulled == []
+
+
+def test_duplicate_pull_is_skipped_while_pending():
+    """Test an image already being pulled is not pulled again concurrently"""
+    release = threading.Event()
+    pulled = []
+
+    def pull(image):
+        release.wait(timeout=5)
+        pulled.append(image)
+
+    prepuller = ImagePrepuller("amqp://unused", pull=pull)
+    first = prepuller.handle(prepull_event("a:1.0.0"))
+    second = prepuller.handle(prepull_event("a:1.0.0"))
+    release.set()
+    first.result(timeout=5)
+
+    assert second is None
+    assert pulled == ["a:1.0.0"]
+
+
+def test_failed_pull_does_not_raise():
+    """Test pull errors are logged and the image can be retried"""
+
+    def pull(image):
+        raise RuntimeError("registry unreachable")
+
+    prepuller = ImagePrepuller("amqp://unused", pull=pull)
+    prepuller.handle(prepull_event("a:1.0.0")).result(timeout=5)
+
+    assert prepuller.handle(prepull_event("a:1.0.0")) is not None
+
+
+def prepull_event(image):
+    return {
+        "event": "prepull",
+        "name": "a",
+        "version": "1.0.0",
+        "docker_image_url": image,
+        "image_digest": None,
+    }
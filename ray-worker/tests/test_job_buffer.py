@@ -0,0 +1,223 @@
+"""
+Tests for fetching job messages into the fair-share scheduler
+"""
+
+import json
+from collections import deque
+from types import SimpleNamespace
+
+from fair_share import FairShareScheduler
+from job_buffer import JobBuffer
+
+
+def test_capped_owner_does_not_idle_actors():
+    """Test a capped owner filling the buffer cannot hide other owners' jobs"""
+    channel = FakeChannel()
+    for i in range(30):
+        channel.enqueue("job_queue", job(i, owner_id=1))
+    channel.enqueue("job_queue", job(100, owner_id=2))
+    scheduler = FairShareScheduler(max_concurrency={1: 2})
+    buffer = JobBuffer(
+        scheduler, ["job_queue"], lookahead=20, owner_lookahead=20, defer_batch=20
+    )
+
+    # Five idle actors, each asking for a job as the consumer does
+    dispatched = []
+    for _ in range(5):
+        buffer.fill(channel)
+        next_job = scheduler.pop()
+        if next_job is not None:
+            dispatched.append(next_job[0])
+
+    assert dispatched.count(1) == 2
+    assert dispatched.count(2) == 1
+
+
+def test_small_owner_behind_backlog_is_reached(clock):
+    """Test an owner's job behind another owner's backlog is buffered early"""
+    channel = FakeChannel()
+    for i in range(1000):
+        channel.enqueue("job_queue", job(i, owner_id=1))
+    channel.enqueue("job_queue", job(5000, owner_id=2))
+    scheduler = FairShareScheduler()
+    buffer = JobBuffer(
+        scheduler,
+        ["job_queue"],
+        lookahead=1000,
+        owner_lookahead=10,
+        defer_batch=100,
+        clock=clock,
+    )
+
+    owners = []
+    for _ in range(12):
+        buffer.fill(channel)
+        owners.append(scheduler.pop()[0])
+        clock.now += 1.0
+
+    assert 2 in owners
+    # Owner 1 never had more than its share buffered
+    assert scheduler.buffered(1) <= 10
+    # Deferred messages went to the back of the queue, none were lost
+    assert len(channel.queues["job_queue"]) + len(scheduler) + 12 == 1001
+
+
+def test_owner_over_share_stops_fetch_without_deferral():
+    """Test messages beyond an owner's share are requeued when deferral is off"""
+    channel = FakeChannel()
+    for i in range(5):
+        channel.enqueue("job_queue", job(i, owner_id=1))
+    scheduler = FairShareScheduler()
+    buffer = JobBuffer(
+        scheduler, ["job_queue"], lookahead=10, owner_lookahead=2, defer_batch=0
+    )
+
+    buffer.fill(channel)
+
+    assert scheduler.buffered(1) == 2
+    assert len(channel.queues["job_queue"]) == 3
+    assert channel.requeued == 1
+
+
+def test_deferral_rate_limited_across_fills(clock):
+    """Test repeated polls share one deferral budget per interval"""
+    channel = FakeChannel()
+    for i in range(50):
+        channel.enqueue("job_queue", job(i, owner_id=1))
+    scheduler = FairShareScheduler(max_concurrency={1: 1})
+    buffer = JobBuffer(
+        scheduler,
+        ["job_queue"],
+        lookahead=10,
+        owner_lookahead=2,
+        defer_batch=5,
+        defer_interval=1.0,
+        clock=clock,
+    )
+
+    for _ in range(10):
+        buffer.fill(channel)
+    assert channel.published == 5
+
+    clock.now += 1.0
+    buffer.fill(channel)
+    assert channel.published == 10
+    assert len(channel.queues["job_queue"]) + len(scheduler) == 50
+
+
+def test_deferral_acks_only_confirmed_copies(clock):
+    """Test a message whose copy the broker rejects is requeued, not lost"""
+    channel = FakeChannel()
+    channel.confirm = False
+    for i in range(3):
+        channel.enqueue("job_queue", job(i, owner_id=1))
+    scheduler = FairShareScheduler()
+    buffer = JobBuffer(
+        scheduler,
+        ["job_queue"],
+        lookahead=10,
+        owner_lookahead=1,
+        defer_batch=10,
+        clock=clock,
+    )
+
+    buffer.fill(channel)
+
+    assert scheduler.buffered(1) == 1
+    assert channel.requeued == 1
+    assert [body for body, _ in channel.queues["job_queue"]] == [
+        job(1, owner_id=1),
+        job(2, owner_id=1),
+    ]
+    assert len(channel.unacked) == 1
+
+
+def test_deferred_message_keeps_queue_ttl(clock):
+    """Test a deferred copy expires when the original would have"""
+    channel = FakeChannel()
+    channel.enqueue("job_queue", job(0, owner_id=1))
+    channel.enqueue("job_queue", job(1, owner_id=1), timestamp=90)
+    channel.enqueue("job_queue", job(2, owner_id=1), timestamp=10)
+    channel.enqueue("job_queue", job(3, owner_id=1))
+    scheduler = FairShareScheduler()
+    buffer = JobBuffer(
+        scheduler,
+        ["job_queue"],
+        lookahead=10,
+        owner_lookahead=1,
+        defer_batch=3,
+        message_ttl_ms=60_000,
+        clock=clock,
+    )
+
+    buffer.fill(channel)
+
+    # Enqueued 10s before now, expired 30s before now, not timestamped
+    (_, first), (_, last) = channel.queues["job_queue"]
+    assert (first.timestamp, first.expiration) == (90, "50000")
+    assert (last.timestamp, last.expiration) == (100, "60000")
+    assert channel.dead_lettered == 1
+
+
+def test_malformed_message_dead_lettered():
+    """Test unparseable messages are rejected without requeueing"""
+    channel = FakeChannel()
+    channel.enqueue("job_queue", b"not json")
+    channel.enqueue("job_queue", json.dumps({"owner_id": 1}).encode())
+    scheduler = FairShareScheduler()
+    buffer = JobBuffer(
+        scheduler, ["job_queue"], lookahead=10, owner_lookahead=10, defer_batch=10
+    )
+
+    buffer.fill(channel)
+
+    assert len(scheduler) == 0
+    assert channel.dead_lettered == 2
+
+
+def job(job_id, owner_id):
+    return json.dumps({"job_id": job_id, "owner_id": owner_id}).encode()
+
+
+class FakeChannel:
+    """In-memory stand-in for the RabbitMQ calls JobBuffer makes"""
+
+    def __init__(self):
+        self.queues = {}
+        self.unacked = {}
+        self.requeued = 0
+        self.dead_lettered = 0
+        self.published = 0
+        # Whether the broker confirms published messages
+        self.confirm = True
+        self._tags = 0
+
+    def enqueue(self, queue, body, timestamp=None):
+        properties = SimpleNamespace(timestamp=timestamp, expiration=None)
+        self.queues.setdefault(queue, deque()).append((body, properties))
+
+    def basic_get(self, queue):
+        if not self.queues.get(queue):
+            return None, None, None
+        body, properties = self.queues[queue].popleft()
+        self._tags += 1
+        self.unacked[self._tags] = (queue, body, properties)
+        return SimpleNamespace(delivery_tag=self._tags), properties, body
+
+    def basic_publish(self, exchange, routing_key, body, properties, mandatory):
+        if not self.confirm:
+            raise RuntimeError("Message was rejected by broker")
+        self.published += 1
+        copy = SimpleNamespace(**vars(properties))
+        self.queues.setdefault(routing_key, deque()).append((body, copy))
+
+    def basic_ack(self, delivery_tag):
+        del self.unacked[delivery_tag]
+
+    def basic_nack(self, delivery_tag, requeue):
+        queue, body, properties = self.unacked.pop(delivery_tag)
+        if requeue:
+            self.queues[queue].appendleft((body, properties))
+            self.requeued += 1
+        else:
+            self.dead_lettered += 1
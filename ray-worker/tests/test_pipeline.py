@@ -0,0 +1,321 @@
+"""
+Tests for pipeline job ordering and step input assembly
+"""
+
+from datetime import datetime
+
+import pytest
+
+from pipeline import (
+    PipelineError,
+    PipelineStepFailed,
+    build_step_input,
+    collect_steps,
+    final_step,
+    pipeline_order,
+    read_steps,
+    step_dependencies,
+    step_summary,
+    submit_steps,
+)
+
+
+def test_dependencies_from_inputs_and_depends_on():
+    """Test steps read from are listed first, order-only steps after"""
+    step = step_def(
+        "classify",
+        inputs={"features": "extract.features", "scale": "normalize.factor"},
+        depends_on=["warmup", "extract"],
+    )
+
+    assert read_steps(step) == ["extract", "normalize"]
+    assert step_dependencies(step) == ["extract", "normalize", "warmup"]
+
+
+def test_pipeline_order_diamond():
+    """Test a diamond runs its branches after the fork and before the join"""
+    steps = [
+        step_def("join", inputs={"a": "left", "b": "right"}),
+        step_def("left", inputs={"x": "fork"}),
+        step_def("right", inputs={"x": "fork"}),
+        step_def("fork"),
+    ]
+
+    order = [step["name"] for step in pipeline_order(steps)]
+
+    assert order == ["fork", "left", "right", "join"]
+    assert final_step(steps)["name"] == "join"
+
+
+def test_pipeline_order_rejects_cycle():
+    """Test cyclic pipelines are rejected"""
+    steps = [step_def("a", depends_on=["b"]), step_def("b", inputs={"x": "a"})]
+
+    with pytest.raises(PipelineError, match="cycle"):
+        pipeline_order(steps)
+
+
+def test_pipeline_order_rejects_unknown_and_duplicate_steps():
+    """Test unknown dependencies and repeated names are rejected"""
+    with pytest.raises(PipelineError, match="missing"):
+        pipeline_order([step_def("a", inputs={"x": "missing.y"})])
+    with pytest.raises(PipelineError, match="unique"):
+        pipeline_order([step_def("a"), step_def("a")])
+
+
+def test_final_step_must_be_unique():
+    """Test a pipeline with two loose ends has no single result"""
+    with pytest.raises(PipelineError):
+        final_step([step_def("a"), step_def("b")])
+
+
+def test_build_step_input():
+    """Test referenced output fields are merged into the static input"""
+    step = step_def(
+        "classify",
+        input_data={"model_params": {"threshold": 0.5}, "features": None},
+        inputs={"features": "extract.features", "first": "extract.rows.0.id"},
+    )
+    outputs = {"extract": {"features": [1.0, 2.0], "rows": [{"id": 7}]}}
+
+    assert build_step_input(step, outputs) == {
+        "model_params": {"threshold": 0.5},
+        "features": [1.0, 2.0],
+        "first": 7,
+    }
+    # The step definition is not modified
+    assert step["input_data"]["features"] is None
+
+
+def test_build_step_input_whole_output():
+    """Test a reference without a path passes the whole output"""
+    step = step_def("classify", inputs={"upstream": "extract"})
+
+    assert build_step_input(step, {"extract": {"features": [1]}}) == {
+        "upstream": {"features": [1]}
+    }
+
+
+def test_build_step_input_missing_field():
+    """Test a reference to a field the output lacks names the reference"""
+    step = step_def("classify", inputs={"features": "extract.rows.3"})
+
+    with pytest.raises(PipelineError, match="extract.rows.3"):
+        build_step_input(step, {"extract": {"rows": [1, 2]}})
+
+
+def test_step_summary():
+    """Test summaries carry timing and output size but not the output"""
+    summary = step_summary(
+        step_def("extract"),
+        "completed",
+        started_at=datetime(2024, 1, 1, 0, 0, 0),
+        completed_at=datetime(2024, 1, 1, 0, 0, 2),
+        output={"features": [1, 2]},
+    )
+
+    assert summary["status"] == "completed"
+    assert summary["duration_seconds"] == 2.0
+    assert summary["output_bytes"] == len('{"features":[1,2]}')
+    assert "features" not in summary
+    assert "error_message" not in summary
+
+
+def test_step_failure_names_step():
+    """Test step failures survive pickling, as Ray does between processes"""
+    import pickle
+
+    error = pickle.loads(pickle.dumps(PipelineStepFailed("extract", "exit 1")))
+
+    assert error.step == "extract"
+    assert error.message == "exit 1"
+    assert str(error) == "Step 'extract' failed: exit 1"
+
+
+def test_run_pipeline_passes_outputs_between_steps():
+    """Test steps run after their upstream, reading its output"""
+    executor = FakeExecutor()
+    ordered = pipeline_order(
+        [
+            step_def("double", inputs={"value": "extract.value"}),
+            step_def("extract", input_data={"value": 21}),
+        ]
+    )
+
+    outputs, summaries, results, completed = run_pipeline(executor, ordered)
+
+    assert [r["status"] for r in results] == ["completed", "completed"]
+    assert executor.get(outputs["double"]) == {"value": 84}
+    assert completed == [("extract", 1), ("double", 2)]
+    assert executor.ran == ["extract", "double"]
+
+
+def test_run_pipeline_failure_skips_dependents():
+    """Test a failed step is reported and the steps reading from it skipped"""
+    executor = FakeExecutor()
+    ordered = pipeline_order(
+        [
+            step_def("extract", input_data={"fail": "exit 1"}),
+            step_def("classify", inputs={"x": "extract"}),
+            step_def("report", inputs={"x": "classify"}),
+        ]
+    )
+
+    _, _, results, completed = run_pipeline(executor, ordered)
+
+    extract, classify, report = results
+    assert (extract["status"], extract["error_message"]) == ("failed", "exit 1")
+    assert classify["status"] == report["status"] == "skipped"
+    assert "error_message" not in classify
+    assert completed == []
+    assert executor.ran == ["extract"]
+
+
+def test_run_pipeline_failure_cancels_pending_steps():
+    """Test steps still pending when one fails are cancelled and skipped"""
+    executor = FakeExecutor()
+    ordered = pipeline_order(
+        [
+            step_def("fast", input_data={"fail": "exit 1"}),
+            step_def("slow"),
+            step_def("join", inputs={"a": "fast", "b": "slow"}),
+        ]
+    )
+
+    _, summaries, results, _ = run_pipeline(executor, ordered)
+
+    fast, slow, join = results
+    assert fast["status"] == "failed"
+    assert slow["status"] == join["status"] == "skipped"
+    assert "error_message" not in slow
+    assert summaries["slow"] in executor.cancelled
+    assert "slow" not in executor.ran
+
+
+def test_run_pipeline_lost_step_fails():
+    """Test a step lost without a step failure of its own is reported failed"""
+    executor = FakeExecutor()
+    ordered = pipeline_order([step_def("extract", input_data={"lose": True})])
+
+    _, _, results, _ = run_pipeline(executor, ordered)
+
+    assert results[0]["status"] == "failed"
+    assert results[0]["error_message"] == "worker died"
+
+
+def run_pipeline(executor, ordered):
+    """Submit and collect a pipeline the way PluginExecutorActor does"""
+    completed = []
+    outputs, summaries = submit_steps(
+        ordered,
+        lambda step, read_from, upstream: executor.submit(
+            fake_step, step, read_from, *upstream
+        ),
+    )
+    results = collect_steps(
+        ordered,
+        summaries,
+        executor.wait,
+        executor.get,
+        executor.cancel,
+        lambda step, done: completed.append((step["name"], done)),
+    )
+    return outputs, summaries, results, completed
+
+
+def fake_step(step, read_from, *upstream):
+    """Stand-in for run_pipeline_step: doubles its input's value"""
+    if step["input_data"].get("lose"):
+        raise RuntimeError("worker died")
+    if "fail" in step["input_data"]:
+        raise PipelineStepFailed(step["name"], step["input_data"]["fail"])
+    input_data = build_step_input(step, dict(zip(read_from, upstream, strict=False)))
+    output = {"value": input_data.get("value", 0) * 2}
+    return output, step_summary(step, "completed", output=output)
+
+
+class TaskCancelled(Exception):
+    """Raised getting a cancelled task, as Ray does"""
+
+
+class FakeRef:
+    def __init__(self, task, index):
+        self.task = task
+        self.index = index
+
+
+class FakeTask:
+    def __init__(self, func, args):
+        self.func = func
+        self.args = args
+        self.outcome = None  # ("ok", values) or ("error", exception)
+        self.cancelled = False
+
+
+class FakeExecutor:
+    """
+    Runs tasks in-process the way Ray would: a task runs once waited on,
+    in submission order, and a task whose upstream failed raises the same
+    error without running.
+    """
+
+    def __init__(self):
+        self.tasks = []
+        self.ran = []
+        self.cancelled = []
+
+    def submit(self, func, *args):
+        task = FakeTask(func, args)
+        self.tasks.append(task)
+        return FakeRef(task, 0), FakeRef(task, 1)
+
+    def wait(self, refs):
+        ref = min(refs, key=lambda r: self.tasks.index(r.task))
+        self._run(ref.task)
+        return [ref]
+
+    def get(self, ref):
+        self._run(ref.task)
+        kind, value = ref.task.outcome
+        if kind == "error":
+            raise value
+        return value[ref.index]
+
+    def cancel(self, ref):
+        self.cancelled.append(ref)
+        if ref.task.outcome is None:
+            ref.task.cancelled = True
+
+    def _run(self, task):
+        if task.outcome is not None:
+            return
+        if task.cancelled:
+            task.outcome = ("error", TaskCancelled())
+            return
+        args = []
+        for arg in task.args:
+            if isinstance(arg, FakeRef):
+                try:
+                    arg = self.get(arg)
+                except Exception as e:
+                    task.outcome = ("error", e)
+                    return
+            args.append(arg)
+        self.ran.append(args[0]["name"])
+        try:
+            task.outcome = ("ok", task.func(*args))
+        except Exception as e:
+            task.outcome = ("error", e)
+
+
+def step_def(name, input_data=None, inputs=None, depends_on=None):
+    """Build a step definition as it arrives in a job message"""
+    return {
+        "name": name,
+        "plugin_name": "example-processor",
+        "plugin_version": "1.0.0",
+        "docker_image_url": "registry.example.com/processor:1.0.0",
+        "input_data": input_data or {},
+        "inputs": inputs or {},
+        "depends_on": depends_on or [],
+    }
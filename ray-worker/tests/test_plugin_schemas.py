@@ -0,0 +1,83 @@
+"""
+Tests for worker-side plugin schema validation
+"""
+
+import httpx
+import pytest
+
+from plugin_schemas import PluginSchemaCache, describe_errors
+
+INPUT_SCHEMA = {
+    "type": "object",
+    "properties": {"features": {"type": "array", "items": {"type": "number"}}},
+    "required": ["features"],
+}
+
+
+def test_validators_fetched_once_per_version(registry):
+    """Test schemas are fetched and compiled once per plugin version"""
+    cache = PluginSchemaCache("http://registry", client=registry.client)
+
+    first = cache.get("example-classifier", "1.0.0")
+    second = cache.get("example-classifier", "1.0.0")
+
+    assert first is second
+    assert first.input is not None
+    assert first.output is None
+    assert registry.requests == 1
+
+
+def test_unknown_version_skips_validation(registry):
+    """Test a job is never validated against another version's schema"""
+    cache = PluginSchemaCache("http://registry", client=registry.client)
+
+    assert cache.get("example-classifier", "2.0.0") is None
+    assert registry.paths == ["/api/v1/plugins/example-classifier/versions/2.0.0"]
+
+
+def test_registry_unavailable_skips_validation():
+    """Test registry errors disable pre-flight instead of failing jobs"""
+    client = httpx.Client(transport=httpx.MockTransport(lambda r: httpx.Response(503)))
+    cache = PluginSchemaCache("http://registry", client=client)
+
+    assert cache.get("example-classifier", "1.0.0") is None
+
+
+def test_describe_errors_reports_paths(registry):
+    """Test validation errors point at the offending field"""
+    cache = PluginSchemaCache("http://registry", client=registry.client)
+    validator = cache.get("example-classifier", "1.0.0").input
+
+    assert describe_errors(validator, {"features": [1, "x"]}) == [
+        "features.1: 'x' is not of type 'number'"
+    ]
+    assert describe_errors(validator, {}) == [
+        "<root>: 'features' is a required property"
+    ]
+
+
+class FakeRegistry:
+    def __init__(self):
+        self.requests = 0
+        self.paths = []
+        self.client = httpx.Client(transport=httpx.MockTransport(self.handle))
+
+    def handle(self, request):
+        self.requests += 1
+        self.paths.append(request.url.path)
+        if request.url.path != "/api/v1/plugins/example-classifier/versions/1.0.0":
+            return httpx.Response(404, json={"detail": "Plugin not found"})
+        return httpx.Response(
+            200,
+            json={
+                "name": "example-classifier",
+                "version": "1.0.0",
+                "input_schema": INPUT_SCHEMA,
+                "output_schema": None,
+            },
+        )
+
+
+@pytest.fixture
+def registry():
+    return FakeRegistry()
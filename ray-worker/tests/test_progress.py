@@ -0,0 +1,59 @@
+"""
+Tests for plugin progress frame parsing and throttling
+"""
+
+import pytest
+
+from progress import ProgressThrottle, parse_progress_line, strip_progress_frames
+
+
+def test_parse_progress_line():
+    """Test a well-formed frame is parsed and percent is clamped"""
+    progress = parse_progress_line(
+        '##progress {"percent": 140, "message": "almost", "partial": {"n": 1}}'
+    )
+
+    assert progress == {"percent": 100.0, "message": "almost", "partial": {"n": 1}}
+
+
+def test_parse_progress_line_ignores_other_lines():
+    """Test plain log lines and malformed frames are not progress"""
+    assert parse_progress_line("INFO:root:working") is None
+    assert parse_progress_line("##progress not-json") is None
+    assert parse_progress_line("##progress [1, 2]") is None
+
+
+def test_strip_progress_frames():
+    """Test progress frames are removed from error logs"""
+    logs = 'starting\n##progress {"percent": 10}\nboom'
+
+    assert strip_progress_frames(logs) == "starting\nboom"
+
+
+def test_throttle_holds_latest_event_within_interval(published, clock):
+    """Test events within the interval collapse into the latest one"""
+    throttle = ProgressThrottle(published.append, min_interval_seconds=1, clock=clock)
+
+    throttle.submit({"job_id": 1, "progress": {"percent": 10}})
+    throttle.submit({"job_id": 1, "progress": {"percent": 20}})
+    throttle.submit({"job_id": 1, "progress": {"percent": 30}})
+    assert throttle.time_until_flush() == pytest.approx(1)
+
+    clock.now += 1
+    throttle.flush_due()
+
+    assert [m["progress"]["percent"] for m in published] == [10, 30]
+
+
+def test_throttle_discard_drops_held_event(published, clock):
+    """Test finished jobs drop any held progress event"""
+    throttle = ProgressThrottle(published.append, min_interval_seconds=1, clock=clock)
+
+    throttle.submit({"job_id": 1, "progress": {"percent": 10}})
+    throttle.submit({"job_id": 1, "progress": {"percent": 90}})
+    throttle.discard(1)
+    clock.now += 1
+    throttle.flush_due()
+
+    assert len(published) == 1
+    assert throttle.time_until_flush() is None
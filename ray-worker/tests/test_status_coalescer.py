@@ -0,0 +1,63 @@
+"""
+Tests for worker-side status update coalescing
+"""
+
+import pytest
+
+from status_coalescer import StatusCoalescer
+
+
+def test_terminal_update_supersedes_held_processing(coalescer, published):
+    """Test a terminal update within the window drops the held 'processing'"""
+    coalescer.submit({"job_id": 1, "status": "processing"})
+    coalescer.submit({"job_id": 1, "status": "completed"})
+
+    assert [m["status"] for m in published] == ["completed"]
+    assert coalescer.time_until_flush() is None
+
+
+def test_processing_published_after_window(coalescer, published, clock):
+    """Test a held 'processing' is published once its window elapses"""
+    coalescer.submit({"job_id": 1, "status": "processing"})
+    coalescer.flush_due()
+    assert published == []
+
+    clock.now += 0.25
+    coalescer.flush_due()
+    coalescer.submit({"job_id": 1, "status": "completed"})
+
+    assert [m["status"] for m in published] == ["processing", "completed"]
+
+
+def test_time_until_flush(coalescer, clock):
+    """Test remaining hold time tracks the earliest pending update"""
+    assert coalescer.time_until_flush() is None
+
+    coalescer.submit({"job_id": 1, "status": "processing"})
+    clock.now += 0.1
+
+    assert coalescer.time_until_flush() == pytest.approx(0.15)
+
+
+def test_zero_window_publishes_immediately(published):
+    """Test coalescing is disabled with a zero window"""
+    coalescer = StatusCoalescer(publish=published.append, window_seconds=0)
+
+    coalescer.submit({"job_id": 1, "status": "processing"})
+
+    assert [m["status"] for m in published] == ["processing"]
+
+
+def test_flush_publishes_all_held(coalescer, published):
+    """Test flush publishes held updates regardless of their window"""
+    coalescer.submit({"job_id": 1, "status": "processing"})
+    coalescer.submit({"job_id": 2, "status": "processing"})
+
+    coalescer.flush()
+
+    assert sorted(m["job_id"] for m in published) == [1, 2]
+
+
+@pytest.fixture
+def coalescer(published, clock):
+    return StatusCoalescer(publish=published.append, window_seconds=0.25, clock=clock)
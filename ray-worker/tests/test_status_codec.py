@@ -0,0 +1,61 @@
+"""
+Tests for status message wire encoding
+"""
+
+import json
+
+import msgpack
+import zstandard
+
+from status_codec import (
+    JSON_CONTENT_TYPE,
+    MSGPACK_CONTENT_TYPE,
+    ZSTD_CONTENT_ENCODING,
+    encode_status_message,
+)
+
+
+def test_encodes_msgpack_by_default():
+    """Test status messages are msgpack-encoded and uncompressed by default"""
+    message = {"job_id": 1, "status": "completed", "result": {"score": 0.5}}
+
+    body, content_type, content_encoding = encode_status_message(message)
+
+    assert content_type == MSGPACK_CONTENT_TYPE
+    assert content_encoding is None
+    assert msgpack.unpackb(body, raw=False) == message
+
+
+def test_encodes_json_when_requested():
+    """Test the JSON encoding stays available for older consumers"""
+    message = {"job_id": 1, "status": "processing"}
+
+    body, content_type, content_encoding = encode_status_message(message, "json")
+
+    assert content_type == JSON_CONTENT_TYPE
+    assert content_encoding is None
+    assert json.loads(body) == message
+
+
+def test_compresses_large_messages():
+    """Test bodies over the threshold are zstd-compressed"""
+    message = {"job_id": 1, "status": "completed", "result": {"values": [0] * 5000}}
+
+    body, content_type, content_encoding = encode_status_message(
+        message, compress_min_bytes=1024
+    )
+
+    assert content_type == MSGPACK_CONTENT_TYPE
+    assert content_encoding == ZSTD_CONTENT_ENCODING
+    raw = zstandard.ZstdDecompressor().decompress(body)
+    assert len(body) < len(raw)
+    assert msgpack.unpackb(raw, raw=False) == message
+
+
+def test_small_messages_are_not_compressed():
+    """Test bodies under the threshold are sent as-is"""
+    message = {"job_id": 1, "status": "processing"}
+
+    _, _, content_encoding = encode_status_message(message, compress_min_bytes=1024)
+
+    assert content_encoding is None